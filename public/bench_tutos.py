@@ -0,0 +1,17 @@
+# bench_tutos.py
+# Benchmark de los tutoriales: tiempo, frames por segundo, memoria y bytes
+# por salida, con el tiempo dividido en dibujo, composición, cuantización y
+# codificación. Compara con tutogen/bench_baseline.json y sale con error si
+# algo empeoró más que el umbral. No usa la red (emojis de public/emoji).
+# pip install pillow numpy
+#
+# Uso (desde la raíz del repo):
+#   python public/bench_tutos.py                 # todo, compara con la línea base
+#   python public/bench_tutos.py matriz -n 5
+#   python public/bench_tutos.py --save          # guarda la línea base
+#   python public/bench_tutos.py --threshold wall=1.5 --threshold rss_mb=1.3
+
+from tutogen.bench import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# build_emoji_atlas.py
+# Empaqueta los emojis de Twemoji que usan los juegos y los tutoriales en
+# pocas hojas (public/emoji/atlas) con un índice JSON de coordenadas.
+# pip install pillow
+#
+# Uso (desde la raíz del repo):
+#   python public/build_emoji_atlas.py                  # todos los subconjuntos
+#   python public/build_emoji_atlas.py recuerda safari  # solo esos
+#   python public/build_emoji_atlas.py --size 1024      # hojas más chicas
+#   python public/build_emoji_atlas.py list
+
+from tutogen.atlas import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+# build_images.py
+# Variantes redimensionadas (AVIF/WebP, varios anchos) de las portadas, las
+# presentaciones y el arte de personajes, con su índice para srcset en
+# public/img/images.json. Solo reprocesa lo que cambió.
+# pip install pillow
+#
+# Uso (desde la raíz del repo):
+#   python public/build_images.py                          # todo lo que cambió
+#   python public/build_images.py public/Portada/AFin.png  # solo esa
+#   python public/build_images.py --force -j 4
+#   python public/build_images.py --widths 320,640 --formats webp
+
+from tutogen.responsive import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# build_tutos.py
+# Regenera todos los tutoriales registrados en un solo proceso, junto con
+# los atlas de emojis y las variantes de portadas (tutogen/assets.py).
+# pip install pillow requests
+#
+# Las salidas van siempre a public/ (tutogen/paths.py), sin importar desde
+# dónde se corra.
+#
+# Uso:
+#   python public/build_tutos.py                 # todo
+#   python public/build_tutos.py build matriz    # solo un juego
+#   python public/build_tutos.py --formats webp,avif   # variantes junto a cada GIF
+#   python public/build_tutos.py --formats ""          # solo GIF
+#   python public/build_tutos.py --offline --emoji-mirror twemoji.tar.gz   # sin red
+#   python public/build_tutos.py --root /tmp/prueba/public   # generar en otra carpeta
+#   python public/build_tutos.py watch matriz    # regenera al guardar (Vite recarga solo)
+#   python public/build_tutos.py list
+#   python public/build_tutos.py --shard 2/4     # una parte del build (CI); después:
+#   python public/build_tutos.py merge           # junta los manifiestos de los shards
+
+from tutogen.build import main
+
+if __name__ == "__main__":
+    main()
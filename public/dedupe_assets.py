@@ -0,0 +1,13 @@
+# dedupe_assets.py
+# Informa (o enlaza con hardlinks) los archivos repetidos por contenido en
+# public/ o en el bundle ya armado.
+#
+# Uso:
+#   python public/dedupe_assets.py                # informe sobre public/
+#   python public/dedupe_assets.py dist --link    # hardlinks en el bundle
+#   python public/dedupe_assets.py --check        # error si hay copias (CI)
+
+from tutogen.dedupe import main
+
+if __name__ == "__main__":
+    main()
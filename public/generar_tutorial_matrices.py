@@ -1,4 +1,6 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from tutogen import lazy_font, save_gif, tutorial, asset_path
+from tutogen.scene import Node, SceneRenderer
 
 # -------------------------
 # Configuración general
@@ -14,16 +16,16 @@ CELL = 70
 GRID_X = 75
 GRID_Y = 60
 
-try:
-    font = ImageFont.truetype("arial.ttf", 18)
-except:
-    font = ImageFont.load_default()
+FONT = lazy_font(18, ["arial.ttf"])
+
+# Antes se escribían en el directorio actual; ahora junto a los demás tutoriales.
+OUT_DIR = asset_path("tutos", "matrices")
 
 
 def base_frame(text):
     img = Image.new("RGB", (W, H), BG)
     d = ImageDraw.Draw(img)
-    d.text((W // 2 - 160, 15), text, fill=TEXT, font=font)
+    d.text((W // 2 - 160, 15), text, fill=TEXT, font=FONT())
     return img, d
 
 
@@ -51,64 +53,59 @@ def draw_shapes(d):
 # -------------------------
 # GIF 1 — Observar filas/columnas
 # -------------------------
-frames = []
-for step in range(6):
-    img, d = base_frame("Paso 1: Observa filas y columnas")
+@tutorial("matrices/tutorial_paso_1.gif", f"{OUT_DIR}/tutorial_paso_1.gif")
+def make_gif1(path=f"{OUT_DIR}/tutorial_paso_1.gif"):
+    # Título, grilla y figuras no cambian: solo se repinta el resaltado.
+    bg, d = base_frame("Paso 1: Observa filas y columnas")
     draw_grid(d)
     draw_shapes(d)
 
-    if step < 3:
-        r = step
-        y = GRID_Y + r * CELL
-        d.rectangle([GRID_X, y, GRID_X + 3 * CELL, y + CELL],
-                    outline=HIGHLIGHT, width=4)
-    else:
-        c = step - 3
-        x = GRID_X + c * CELL
-        d.rectangle([x, GRID_Y, x + CELL, GRID_Y + 3 * CELL],
-                    outline=HIGHLIGHT, width=4)
-
-    frames.append(img)
-
-frames[0].save(
-    "tutorial_paso_1.gif",
-    save_all=True,
-    append_images=frames[1:],
-    duration=500,
-    loop=0
-)
+    def highlight(step):
+        if step < 3:
+            y = GRID_Y + step * CELL
+            rect = [GRID_X, y, GRID_X + 3 * CELL, y + CELL]
+        else:
+            x = GRID_X + (step - 3) * CELL
+            rect = [x, GRID_Y, x + CELL, GRID_Y + 3 * CELL]
+        draw = lambda im, d: d.rectangle(rect, outline=HIGHLIGHT, width=4)
+        return Node("resaltado", (rect[0], rect[1], rect[2] + 1, rect[3] + 1), step, draw)
+
+    def frames():
+        scene = SceneRenderer(bg)
+        for step in range(6):
+            yield scene.render([highlight(step)])
+
+    save_gif(frames(), path, duration=500)
+
 
 # -------------------------
 # GIF 2 — Identificar la regla
 # -------------------------
-frames = []
-for step in range(4):
-    img, d = base_frame("Paso 2: Identifica la regla")
-    draw_grid(d)
+@tutorial("matrices/tutorial_paso_2.gif", f"{OUT_DIR}/tutorial_paso_2.gif")
+def make_gif2(path=f"{OUT_DIR}/tutorial_paso_2.gif"):
+    def frames():
+        for step in range(4):
+            img, d = base_frame("Paso 2: Identifica la regla")
+            draw_grid(d)
 
-    for r in range(3):
-        for c in range(3):
-            x = GRID_X + c * CELL + CELL // 2
-            y = GRID_Y + r * CELL + CELL // 2
-            size = 8 + step * 4
-            d.ellipse([x - size, y - size, x + size, y + size], fill=SHAPE)
+            for r in range(3):
+                for c in range(3):
+                    x = GRID_X + c * CELL + CELL // 2
+                    y = GRID_Y + r * CELL + CELL // 2
+                    size = 8 + step * 4
+                    d.ellipse([x - size, y - size, x + size, y + size], fill=SHAPE)
 
-    frames.append(img)
+            yield img
+
+    save_gif(frames(), path, duration=500)
 
-frames[0].save(
-    "tutorial_paso_2.gif",
-    save_all=True,
-    append_images=frames[1:],
-    duration=500,
-    loop=0
-)
 
 # -------------------------
 # GIF 3 — Completar matriz
 # -------------------------
-frames = []
-for step in range(5):
-    img, d = base_frame("Paso 3: Completa la matriz")
+@tutorial("matrices/tutorial_paso_3.gif", f"{OUT_DIR}/tutorial_paso_3.gif")
+def make_gif3(path=f"{OUT_DIR}/tutorial_paso_3.gif"):
+    bg, d = base_frame("Paso 3: Completa la matriz")
     draw_grid(d)
 
     # Dibujar todas menos la última
@@ -120,19 +117,21 @@ for step in range(5):
             y = GRID_Y + r * CELL + CELL // 2
             d.ellipse([x - 12, y - 12, x + 12, y + 12], fill=SHAPE)
 
-    # Opción moviéndose
-    ox = 160
-    oy = 260 - step * 30
-    d.ellipse([ox - 12, oy - 12, ox + 12, oy + 12], fill=SHAPE)
+    def option(ox, oy):
+        draw = lambda im, d: d.ellipse([ox - 12, oy - 12, ox + 12, oy + 12], fill=SHAPE)
+        return Node("opcion", (ox - 12, oy - 12, ox + 13, oy + 13), (ox, oy), draw)
+
+    def frames():
+        # Solo se repinta la opción que se mueve (dónde estaba y dónde está).
+        scene = SceneRenderer(bg)
+        for step in range(5):
+            yield scene.render([option(160, 260 - step * 30)])
 
-    frames.append(img)
+    save_gif(frames(), path, duration=500)
 
-frames[0].save(
-    "tutorial_paso_3.gif",
-    save_all=True,
-    append_images=frames[1:],
-    duration=500,
-    loop=0
-)
 
-print("GIFs generados correctamente.")
+if __name__ == "__main__":
+    make_gif1()
+    make_gif2()
+    make_gif3()
+    print("GIFs generados correctamente.")
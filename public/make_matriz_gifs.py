@@ -1,5 +1,10 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os, math, random
+from tutogen import lazy_font, rounded_rect, save_gif, save_png, tutorial, render_frames, static_layer, asset_path
+from tutogen.sprites import rounded_halo, ellipse_stack, composite_at, composite_centered
+from tutogen.instrument import probe
+from tutogen.timeline import Timeline
+from tutogen.text import text_bbox, text_size, layout
 
 # =========================
 # Parámetros globales
@@ -10,8 +15,7 @@ CELL = 44                       # tamaño de cada casilla
 GAP = 12                        # espacio entre casillas
 RADIUS = 10                     # borde redondeado de la casilla
 FPS = 30                        # cuadros por segundo
-OUTDIR = "public/tutos/matriz"
-os.makedirs(OUTDIR, exist_ok=True)
+OUTDIR = asset_path("tutos", "matriz")
 
 # Colores (RGBA)
 BASE = (43, 60, 77, 255)        # casilla apagada (azul-gris exacto aprox)
@@ -27,20 +31,7 @@ OX = (W - GRID_W)//2
 OY = (H - GRID_H)//2
 
 # Intentar cargar una fuente bonita (si falla, usa la por defecto)
-def load_font(size=20):
-    try:
-        return ImageFont.truetype("arial.ttf", size)
-    except:
-        try:
-            return ImageFont.truetype("DejaVuSans.ttf", size)
-        except:
-            return ImageFont.load_default()
-
-FONT = load_font(22)
-
-def rounded_rect(draw, xy, radius, fill):
-    x1,y1,x2,y2 = xy
-    draw.rounded_rectangle([x1, y1, x2, y2], radius=radius, fill=fill)
+FONT = lazy_font(22, ("arial.ttf", "DejaVuSans.ttf"))
 
 def cell_xy(r, c):
     x = OX + c*(CELL+GAP)
@@ -53,17 +44,14 @@ def draw_grid_base(draw):
         for c in range(GRID):
             rounded_rect(draw, cell_xy(r,c), RADIUS, BASE)
 
+@probe("glow_layer", area=lambda im, r, c, color=NEON, max_expand=12, *a, **k: (CELL + 2 * max_expand) ** 2)
 def glow_layer(im, r, c, color=NEON, max_expand=12, steps=6, alpha=NEON_HALO_ALPHA):
-    """ Dibuja un halo suave alrededor de una casilla (capas concéntricas). """
+    """ Dibuja un halo suave alrededor de una casilla (capas concéntricas).
+    El halo se precalcula una vez por (color, tamaño, pasos, alpha) y solo se
+    compone en su recuadro, no sobre todo el lienzo. """
     x1,y1,x2,y2 = cell_xy(r,c)
-    overlay = Image.new("RGBA", im.size, (0,0,0,0))
-    d = ImageDraw.Draw(overlay, "RGBA")
-
-    for i in range(steps):
-        expand = int(max_expand * (i+1)/steps)
-        a = int(alpha * (1 - i/steps))
-        rounded_rect(d, [x1-expand, y1-expand, x2+expand, y2+expand], RADIUS+expand, (color[0], color[1], color[2], a))
-    im.alpha_composite(overlay)
+    halo = rounded_halo(CELL, CELL, RADIUS, tuple(color[:3]), max_expand, steps, alpha)
+    composite_at(im, halo, x1-max_expand, y1-max_expand)
 
 def draw_cell_on(im, r, c, color=NEON):
     d = ImageDraw.Draw(im, "RGBA")
@@ -76,25 +64,19 @@ def draw_finger(im, r, c, t=0.0):
     cy = (y1 + y2) // 2 + CELL // 3  # baja un poco para simular toque
 
     scale = 1.0 + 0.08 * math.sin(t * math.pi)
-    overlay = Image.new("RGBA", im.size, (0, 0, 0, 0))
-    d = ImageDraw.Draw(overlay, "RGBA")
 
     # Resplandor verde
+    rings = []
     for i in range(6):
         radius = int(22 * (1 + i * 0.15) * scale)
         alpha = max(0, 120 - i * 18)
-        d.ellipse([cx - radius, cy - radius, cx + radius, cy + radius],
-                  fill=(88, 255, 210, alpha))
+        rings.append((radius, (88, 255, 210, alpha)))
 
     # Palma y punta
-    R1 = int(14 * scale)
-    d.ellipse([cx - R1, cy - R1, cx + R1, cy + R1],
-              fill=(245, 250, 255, 240))
-    R2 = int(6 * scale)
-    d.ellipse([cx - R2, cy - R2, cx + R2, cy + R2],
-              fill=(230, 240, 255, 255))
+    rings.append((int(14 * scale), (245, 250, 255, 240)))
+    rings.append((int(6 * scale), (230, 240, 255, 255)))
 
-    im.alpha_composite(overlay)
+    composite_centered(im, ellipse_stack(tuple(rings)), cx, cy)
 
 
 
@@ -102,6 +84,9 @@ def blank_canvas():
     # Transparente total
     return Image.new("RGBA", (W,H), (0,0,0,0))
 
+# La grilla apagada es igual en todos los frames: se dibuja una vez y
+# base_frame() devuelve una copia para pintar encima.
+@static_layer
 def base_frame():
     im = blank_canvas()
     d = ImageDraw.Draw(im, "RGBA")
@@ -111,10 +96,10 @@ def base_frame():
 def add_title(im, text, y_offset=-4):
     """Texto centrado arriba sin recortarse."""
     d = ImageDraw.Draw(im, "RGBA")
-    bbox = d.textbbox((0, 0), text, font=FONT)
+    bbox = text_bbox(text, FONT())
     tw = bbox[2] - bbox[0]
     th = bbox[3] - bbox[1]
-    d.text(((W - tw) // 2, y_offset), text, font=FONT, fill=TEXT)
+    d.text(((W - tw) // 2, y_offset), text, font=FONT(), fill=TEXT)
     return im
 
 
@@ -123,44 +108,48 @@ def add_title(im, text, y_offset=-4):
 # =========================
 # STEP 1: Secuencia de iluminación
 # =========================
+# La línea de tiempo da el estado de cada frame como una tupla (spec) que
+# dibuja step1_frame; así render_frames puede repartir rangos de frames
+# entre procesos. Los frames quietos (mismo spec) se dibujan una sola vez.
+def step1_frame(spec):
+    kind, r, c, alpha = spec
+    f = base_frame()
+    if kind == "on":
+        # Encendido con halo
+        glow_layer(f, r, c, color=NEON, max_expand=14, steps=6, alpha=alpha)
+        draw_cell_on(f, r, c, NEON)
+    elif kind == "fade":
+        glow_layer(f, r, c, color=NEON, max_expand=12, steps=5, alpha=alpha)
+    return f
+
+@tutorial("matriz/step1.gif", os.path.join(OUTDIR, "step1.gif"))
 def make_step1(path):
     # Secuencia fija (diagonal + centro)
     seq = [(0,0), (1,1), (2,2), (3,3), (1,2)]
     dur_per_cell = 10          # frames por celda encendida
     fade_frames = 6            # desvanecimiento
-    frames = []
 
     # Frame inicial (base)
-    frames.append(base_frame())
+    tl = Timeline(kind="base", cell=(0, 0), alpha=0).hold(1)
 
-    for (r,c) in seq:
+    for cell in seq:
         # Encendido con halo
-        for k in range(dur_per_cell):
-            f = base_frame()
-            glow_layer(f, r, c, color=NEON, max_expand=14, steps=6, alpha=NEON_HALO_ALPHA)
-            draw_cell_on(f, r, c, NEON)
-            frames.append(f)
-
+        tl.hold(dur_per_cell, kind="on", cell=cell, alpha=NEON_HALO_ALPHA)
         # Fade out sutil (opcional) — mantiene casilla base
-        for k in range(fade_frames):
-            f = base_frame()
-            alpha = int(NEON_HALO_ALPHA * (1 - (k+1)/fade_frames))
-            glow_layer(f, r, c, color=NEON, max_expand=12, steps=5, alpha=alpha)
-            frames.append(f)
+        tl.hold(0, kind="fade")
+        tl.tween(fade_frames, alpha=(None, 0))
 
     # Suaviza un cierre
-    for _ in range(5):
-        frames.append(base_frame())
+    tl.hold(5, kind="base", cell=(0, 0), alpha=0)
 
-    frames[0].save(path, save_all=True, append_images=frames[1:], duration=int(1000/FPS), loop=0, disposal=2)
-    print("OK:", path)
+    specs = [(s["kind"], *s["cell"], int(s["alpha"])) for s in tl.states()]
+    frames = render_frames(step1_frame, specs)
+    save_gif(frames, path, duration=int(1000/FPS), disposal=2)
 
 # =========================
 # STEP 2: “Recuerda el patrón” (pulso sutil)
 # =========================
-def make_step2(path):
-    total = FPS * 2  # ~2s
-    frames = []
+def step2_frames(total):
     for i in range(total):
         f = base_frame()
         # pulso sutil en toda la grilla (halo muy suave)
@@ -170,54 +159,54 @@ def make_step2(path):
         glow_layer(f, 1, 2, color=NEON, max_expand=10, steps=5, alpha=alpha)
         # texto
         add_title(f, "Recuerda el patrón", y_offset=-4)
-        frames.append(f)
+        yield f
 
-    frames[0].save(path, save_all=True, append_images=frames[1:], duration=int(1000/FPS), loop=0, disposal=2)
-    print("OK:", path)
+@tutorial("matriz/step2.gif", os.path.join(OUTDIR, "step2.gif"))
+def make_step2(path):
+    total = FPS * 2  # ~2s
+    save_gif(step2_frames(total), path, duration=int(1000/FPS), disposal=2)
 
 # =========================
 # STEP 3: Reproducir con dedo que toca
 # =========================
+def step3_frame(spec):
+    touch, r, c, t = spec
+    f = base_frame()
+    if touch:
+        # brillo al tocar
+        glow_layer(f, r, c, color=NEON, max_expand=16, steps=7, alpha=NEON_HALO_ALPHA)
+        draw_cell_on(f, r, c, NEON)
+        # dedo con pequeño pulso
+        draw_finger(f, r, c, t=t)
+    return f
+
+@tutorial("matriz/step3.gif", os.path.join(OUTDIR, "step3.gif"))
 def make_step3(path):
     seq = [(0,0), (1,1), (2,2), (3,3), (1,2)]
     touch_frames = int(FPS * 0.35)   # duración del toque por casilla
     between = int(FPS * 0.08)        # pausa entre toques
-    frames = []
 
     # frame base de arranque
-    frames.append(base_frame())
+    tl = Timeline(touch=False, cell=(0, 0), t=0.0).hold(1)
 
-    t_global = 0
-    for (r,c) in seq:
+    for cell in seq:
         # acercamiento & tocar (con pulso del dedo)
-        for k in range(touch_frames):
-            f = base_frame()
-            # brillo al tocar
-            glow_layer(f, r, c, color=NEON, max_expand=16, steps=7, alpha=NEON_HALO_ALPHA)
-            draw_cell_on(f, r, c, NEON)
-            # dedo con pequeño pulso
-            t = k / max(1, touch_frames-1)
-            draw_finger(f, r, c, t=t)
-            frames.append(f)
-            t_global += 1
-
+        tl.hold(0, touch=True, cell=cell)
+        tl.tween(touch_frames, t=(0.0, 1.0))
         # micro pausa
-        for k in range(between):
-            f = base_frame()
-            frames.append(f)
-            t_global += 1
+        tl.hold(between, touch=False, cell=(0, 0), t=0.0)
 
     # cierre corto
-    for _ in range(6):
-        frames.append(base_frame())
+    tl.hold(6)
 
-    frames[0].save(path, save_all=True, append_images=frames[1:], duration=int(1000/FPS), loop=0, disposal=2)
-    print("OK:", path)
+    specs = [(s["touch"], *s["cell"], s["t"]) for s in tl.states()]
+    frames = render_frames(step3_frame, specs)
+    save_gif(frames, path, duration=int(1000/FPS), disposal=2)
 
-def make_chunking_png():
+@tutorial("matriz/chunking.png", os.path.join(OUTDIR, "chunking.png"))
+def make_chunking_png(path=os.path.join(OUTDIR, "chunking.png")):
     """chunking.png: texto blanco arriba + grilla que se AUTOSCALEA para que NUNCA se recorte."""
     from PIL import Image, ImageDraw
-    import os, math
 
     # Lienzo
     W, H = 480, 270
@@ -226,9 +215,6 @@ def make_chunking_png():
     GRID = 4
     CELL0, GAP0, RADIUS0 = 44, 12, 10
 
-    # Salida
-    OUT = "public/tutos/matriz/chunking.png"
-
     # Colores
     BASE = (43, 60, 77, 255)
     NEON = (88, 255, 210, 255)
@@ -253,31 +239,13 @@ def make_chunking_png():
     EDGE_PAD = 4
     HALO_EXTRA = HALO_PAD + EDGE_PAD + HALO_W  # "barriga" extra alrededor de los bloques
 
-    # --- helpers ---
-    def text_size(draw, txt, font):
-        bbox = draw.textbbox((0, 0), txt, font=FONT)
-        return bbox[2]-bbox[0], bbox[3]-bbox[1]
-
-    def wrap(draw, txt, font, max_w):
-        words = txt.split()
-        line, lines = "", []
-        for w in words:
-            test = (line + " " + w).strip()
-            tw, _ = text_size(draw, test, font)
-            if tw <= max_w or not line:
-                line = test
-            else:
-                lines.append(line); line = w
-        if line: lines.append(line)
-        return lines
-
     # ==== 1) Medimos bloque de texto ====
     im = Image.new("RGBA", (W, H), (0,0,0,0))
     d  = ImageDraw.Draw(im, "RGBA")
 
-    title_w, title_h = text_size(d, TITLE, FONT)
-    body_lines = wrap(d, BODY, FONT, max_w=MAX_TEXT_W)
-    body_h = sum(text_size(d, ln, FONT)[1] for ln in body_lines)
+    title_w, title_h = text_size(TITLE, FONT())
+    body = layout(BODY, FONT(), max_width=MAX_TEXT_W)
+    body_h = body.height
 
     text_top = TOP_TITLE_Y
     text_h   = title_h + BODY_LINE_GAP + body_h
@@ -324,11 +292,10 @@ def make_chunking_png():
 
     # ==== 3) Dibujo ====
     # Texto
-    d.text(((W-title_w)//2, TOP_TITLE_Y), TITLE, font=FONT, fill=TITLE_COLOR)
+    d.text(((W-title_w)//2, TOP_TITLE_Y), TITLE, font=FONT(), fill=TITLE_COLOR)
     y = TOP_TITLE_Y + title_h + BODY_LINE_GAP
-    for line in body_lines:
-        lw, lh = text_size(d, line, FONT)
-        d.text(((W-lw)//2, y), line, font=FONT, fill=BODY_COLOR)
+    for line, (lw, lh) in zip(body.lines, body.sizes):
+        d.text(((W-lw)//2, y), line, font=FONT(), fill=BODY_COLOR)
         y += lh
 
     # Grilla base
@@ -350,9 +317,7 @@ def make_chunking_png():
     chunk_rect(0, 0, 1, 1)
     chunk_rect(2, 2, 3, 3)
 
-    os.makedirs(os.path.dirname(OUT), exist_ok=True)
-    im.save(OUT, "PNG")
-    print("OK ->", OUT)
+    save_png(im, path)
 
 
 
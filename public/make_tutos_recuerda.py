@@ -1,8 +1,13 @@
 # make_tutos_recuerda_twemoji.py
-# pip install pillow requests
+# pip install pillow requests numpy
 
-import os, math, requests, random
-from PIL import Image, ImageDraw, ImageFont
+import os, random
+from PIL import Image, ImageDraw
+from tutogen import lazy_font, draw_center_text, rounded_card, save_gif, tutorial, static_layer, asset_path
+from tutogen.raster import scale_alpha
+from tutogen.emoji import EmojiProvider
+from tutogen.instrument import probe
+from tutogen.timeline import Timeline, Layer, render_timeline, ease
 
 # ===== Config general =====
 W, H = 640, 360
@@ -13,87 +18,49 @@ INK_SOFT = (100, 116, 139)
 BORD_SOFT = (232, 236, 244)
 RADIUS = 18
 FPS = 12   # base para el paso 1
-OUT_DIR = "public/tutos/recuerda"
-EMOJI_DIR = "public/emoji"
-os.makedirs(OUT_DIR, exist_ok=True)
-os.makedirs(EMOJI_DIR, exist_ok=True)
-
-# CDN Twemoji
-TWEMOJI_BASE = "https://cdn.jsdelivr.net/gh/twitter/twemoji@14.0.2/assets/72x72/"
+OUT_DIR = asset_path("tutos", "recuerda")
+EMOJI_DIR = asset_path("emoji")
 
 EMOJIS = ['🍎','🍊','🍌','🍉','🍇','🍓','🍒','🍑','🍍','🥥','🥝','🍆','🥑','🥦','🥬','🥒','🌶️','🌽','🥕','🧄']
 
+# Cuadrícula compacta de los pasos 2 y 3 (celdas de 100x60 para que quepan 3 filas)
+GRID_COLS, GRID_ROWS = 4, 3
+CELL_W, CELL_H = 100, 60
+GRID_GAP = 12
+GRID_Y = 130                   # 130 + 3*60 + 2*12 = 334 < 360 (¡cabe!)
+GRID_X = (W - GRID_COLS*CELL_W - (GRID_COLS-1)*GRID_GAP)//2
+HILITE = (255,122,121)         # resaltado / puntero
+SELECTED = (46,204,113)        # borde de las ya elegidas
+
 # ===== Utilidades =====
-def load_font(size):
-    for p in [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-    ]:
-        if os.path.exists(p):
-            try:
-                return ImageFont.truetype(p, size=size)
-            except:
-                pass
-    return ImageFont.load_default()
-
-FONT_H1 = load_font(28)
-FONT_BODY = load_font(20)
-
-def ease(t): return 0.5 - 0.5 * math.cos(math.pi * t)
-
-def draw_center_text(d, txt, font, cx, cy, fill=INK):
-    bbox = d.textbbox((0,0), txt, font=font)
-    w,h = bbox[2]-bbox[0], bbox[3]-bbox[1]
-    d.text((cx-w//2, cy-h//2), txt, font=font, fill=fill)
-
-def rounded_card(im_rgb, box, radius, fill_rgb):
-    x0,y0,x1,y1 = box
-    w,h = x1-x0, y1-y0
-    card = Image.new("RGB",(w,h),fill_rgb)
-    mask = Image.new("L",(w,h),0)
-    ImageDraw.Draw(mask).rounded_rectangle((0,0,w,h), radius, fill=255)
-    im_rgb.paste(card,(x0,y0),mask)
-
-def emoji_to_twemoji_filename(emoji:str)->str:
-    cps=[f"{ord(ch):x}" for ch in emoji]
-    return "-".join(cps)+".png"
-
-def download_twemoji_png(emoji:str,dest:str)->str|None:
-    fname=emoji_to_twemoji_filename(emoji)
-    local=os.path.join(dest,fname)
-    if os.path.exists(local): return local
-    def try_get(name):
-        try:
-            r=requests.get(TWEMOJI_BASE+name,timeout=10)
-            return r.status_code==200,r.content
-        except: return False,None
-    ok,data=try_get(fname)
-    if not ok and "-fe0f" in fname:
-        alt=fname.replace("-fe0f","")
-        ok,data=try_get(alt)
-        if ok: fname,local=alt,os.path.join(dest,alt)
-    if ok and data:
-        with open(local,"wb") as f: f.write(data)
-        return local
-    return None
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+]
+FONT_H1 = lazy_font(28, FONT_PATHS)
+FONT_BODY = lazy_font(20, FONT_PATHS)
+
+# Twemoji: si está el atlas "tutos" (python public/build_emoji_atlas.py tutos)
+# los sprites salen de su hoja; si no, de la caché en EMOJI_DIR, y lo que
+# falte del espejo local o de la CDN (ver tutogen/emoji.py). Cada paso pide
+# todo el juego de una vez.
+EMOJI = EmojiProvider(EMOJI_DIR, atlas=os.path.join(EMOJI_DIR, "atlas", "tutos.json"))
 
 def load_emoji_image(emoji:str,target_size:int=160)->Image.Image|None:
-    path=download_twemoji_png(emoji,EMOJI_DIR)
-    if not path or not os.path.exists(path): return None
-    im=Image.open(path).convert("RGBA")
-    im.thumbnail((target_size,target_size),Image.LANCZOS)
-    return im
+    return EMOJI.image(emoji, target_size)
 
-def paste_rgba_over_rgb(base,rgba,xy):
-    layer=Image.new("RGBA",base.size,(0,0,0,0))
-    layer.paste(rgba,xy,rgba)
-    return Image.alpha_composite(base.convert("RGBA"),layer).convert("RGB")
+def emoji_inputs():
+    """Índice y hojas del atlas "tutos" y PNGs de EMOJIS en EMOJI_DIR
+    (entradas para el manifiesto del build)."""
+    return [*EMOJI.atlas.files(), *(EMOJI.cached(e) for e in EMOJIS)]
 
 # ===== Paso 1 =====
 # SOLO círculo + emoji, fondo transparente
+@tutorial("recuerda/step1.gif", os.path.join(OUT_DIR, "step1.gif"), inputs=emoji_inputs, center_y=250)
 def make_step1(center_y: int | None = None,
                *, 
+               path: str = os.path.join(OUT_DIR, "step1.gif"),
                w: int | None = None,           # ancho del GIF (si no, usa W global)
                h: int | None = None,           # alto del GIF (si no, usa H global)
                circle_rel: float = 0.55,       # diámetro del círculo respecto al lado menor (0–1)
@@ -107,202 +74,150 @@ def make_step1(center_y: int | None = None,
     ► emoji_min/emoji_max controlan el tamaño del emoji dentro del círculo.
     ► w/h te permiten generar un lienzo más grande para que el modal lo muestre más “lleno”.
     """
+    EMOJI.prefetch(EMOJIS)
     Wloc = w or W
     Hloc = h or H
     if center_y is None:
         center_y = int(Hloc * 0.58)  # un poquito abajo para verse centrado visualmente
 
-    frames = []
     per_item = int(FPS * per_item_secs)
     hold     = int(FPS * hold_secs)
 
-    for sym in EMOJIS[:8]:
-        # tamaño base del emoji: proporcional al círculo que usaremos
-        base_r = int(min(Wloc, Hloc) * circle_rel * 0.5)
-        png = load_emoji_image(sym, int(base_r*2))  # base grande para no pixelar
+    ts = [ease(f / max(1, per_item - 1)) for f in range(per_item)]  # 0→1
+    scales = [emoji_min + (emoji_max - emoji_min) * t for t in ts]
 
-        for f in range(per_item):
-            t = ease(f / max(1, per_item - 1))  # 0→1
-            im = Image.new("RGBA", (Wloc, Hloc), (0, 0, 0, 0))  # transparente
-            d = ImageDraw.Draw(im, "RGBA")
+    def frames():
+        for sym in EMOJIS[:8]:
+            # tamaño base del emoji: proporcional al círculo que usaremos
+            base_r = int(min(Wloc, Hloc) * circle_rel * 0.5)
+            png = load_emoji_image(sym, int(base_r*2))  # base grande para no pixelar
+            if png:
+                # Escalera de tamaños del zoom: cada uno se remuestrea una vez
+                sizes = [(int(png.width * sc), int(png.height * sc)) for sc in scales]
+                zoom = EMOJI.ladder(sym, int(base_r*2), sizes)
 
-            cx, cy = Wloc // 2, center_y
+            for f, t in enumerate(ts):
+                im = Image.new("RGBA", (Wloc, Hloc), (0, 0, 0, 0))  # transparente
+                d = ImageDraw.Draw(im, "RGBA")
 
-            # Círculo con un “pop” suave (aumenta ~10%)
-            r = int(base_r * (1.0 + 0.10 * t))
-            d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(255, 255, 255, 255))
+                cx, cy = Wloc // 2, center_y
 
-            # Emoji escalado grande dentro del círculo
-            if png:
-                sc = emoji_min + (emoji_max - emoji_min) * t
-                w_e, h_e = int(png.width * sc), int(png.height * sc)
-                sp = png.resize((w_e, h_e), Image.LANCZOS)
+                # Círculo con un “pop” suave (aumenta ~10%)
+                r = int(base_r * (1.0 + 0.10 * t))
+                d.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(255, 255, 255, 255))
 
-                # Fade-in sutil
-                r_, g_, b_, a_ = sp.split()
-                a_ = a_.point(lambda v: int(v * (0.15 + 0.85 * t)))
-                sp.putalpha(a_)
+                # Emoji escalado grande dentro del círculo
+                if png:
+                    sp = zoom[f]
+                    w_e, h_e = sp.size
 
-                im.alpha_composite(sp, (cx - w_e // 2, cy - h_e // 2))
+                    # Fade-in sutil
+                    sp = scale_alpha(sp, 0.15 + 0.85 * t)
 
-            frames.append(im.copy())
+                    im.alpha_composite(sp, (cx - w_e // 2, cy - h_e // 2))
 
-        for _ in range(hold):
-            frames.append(frames[-1].copy())
+                yield im
 
-    out = os.path.join(OUT_DIR, "step1.gif")
-    frames[0].save(out, save_all=True, append_images=frames[1:],
-                   duration=int(1000 / FPS), loop=0, disposal=2, transparency=0)
-    print("OK:", out)
+            for _ in range(hold):
+                yield im
 
+    # Cada frame con su paleta: el zoom del emoji recorre muchos colores y con
+    # una sola paleta global el GIF sale ~25% más pesado (71.9 KB vs 57.7 KB).
+    save_gif(frames(), path, duration=int(1000 / FPS), disposal=2, transparency=0,
+             global_palette=False)
 
-# ===== Paso 2 (GRID ESTÁTICA; solo resaltado secuencial) =====
-def make_step2():
-    frames = []
 
-    # ⬇️  Celda más compacta para que quepan 3 filas
-    cols, rows = 4, 3
-    cell_w, cell_h = 100, 60    # antes 110x90
-    gap = 12                    # antes 16
+# ===== Tablero de los pasos 2 y 3 =====
+def cell_origin(c, r):
+    return GRID_X + c*(CELL_W+GRID_GAP), GRID_Y + r*(CELL_H+GRID_GAP)
 
-    # Medidas derivadas
-    total_grid_h = rows*cell_h + (rows-1)*gap        # 3*60 + 2*12 = 204
-    start_y = 130                                    # 130 + 204 = 334 < 360 (¡cabe!)
-    start_x = (W - cols*cell_w - (cols-1)*gap)//2
-
-    targets = [(0,0), (2,1), (3,2)]
+@static_layer
+@probe("board_layer", area=lambda *a, **k: W * H)
+def board_layer(title, subtitle, selected=frozenset()):
+    """Tarjeta + textos + cuadrícula con emojis. Es estática: se dibuja una vez
+    por combinación de textos/selección y cada frame usa una copia."""
     sprites = [load_emoji_image(e, 56) for e in EMOJIS]  # ⬅️ sprites acordes a 60px de alto
+    im = Image.new("RGB", (W, H), BG)
+    d  = ImageDraw.Draw(im)
+    rounded_card(im, (40,40, W-40, H-40), RADIUS, CARD)
+    draw_center_text(d, title, FONT_H1(), W//2, 70, INK)
+    draw_center_text(d, subtitle, FONT_BODY(), W//2, 110, INK_SOFT)
+
     si = 0
+    for r in range(GRID_ROWS):
+        for c in range(GRID_COLS):
+            x, y = cell_origin(c, r)
+            outline = SELECTED if (c,r) in selected else BORD_SOFT
+            d.rounded_rectangle((x,y,x+CELL_W,y+CELL_H), radius=12,
+                                fill=(255,255,255), outline=outline, width=2)
+            sp = sprites[si % len(sprites)]; si += 1
+            if sp:
+                im.paste(sp, (x + CELL_W//2 - sp.width//2,
+                              y + CELL_H//2 - sp.height//2), sp)
+    return im
+
+def draw_highlight(d, c, r):
+    x, y = cell_origin(c, r)
+    d.rounded_rectangle((x-2,y-2,x+CELL_W+2,y+CELL_H+2), radius=14,
+                        outline=HILITE, width=3)
+
+# Capas de los pasos 2 y 3 (pistas: target, pointer)
+def highlight_layer(im, target):
+    if target:
+        draw_highlight(ImageDraw.Draw(im), *target)
+
+def pointer_layer(im, pointer):
+    if pointer:
+        px, py = int(pointer[0]), int(pointer[1])
+        ImageDraw.Draw(im).ellipse((px-12, py-12, px+12, py+12), fill=HILITE)
+
+
+# ===== Paso 2 (GRID ESTÁTICA; solo resaltado secuencial) =====
+@tutorial("recuerda/step2.gif", os.path.join(OUT_DIR, "step2.gif"), inputs=emoji_inputs)
+def make_step2(path=os.path.join(OUT_DIR, "step2.gif")):
+    EMOJI.prefetch(EMOJIS)
+    targets = [(0,0), (2,1), (3,2)]
 
     fade_in_frames  = int(FPS * 0.35)
     hold_frames     = int(FPS * 0.40)
     fade_out_frames = int(FPS * 0.30)
 
-    def draw_grid_base():
-        im = Image.new("RGB", (W, H), BG)
-        d  = ImageDraw.Draw(im)
-        rounded_card(im, (40,40, W-40, H-40), RADIUS, CARD)
-        draw_center_text(d, "2. Busca", FONT_H1, W//2, 70, INK)
-        draw_center_text(d, "Aparece una cuadrícula con distractores. Ignóralos.",
-                         FONT_BODY, W//2, 110, INK_SOFT)
-
-        nonlocal si; si = 0
-        for r in range(rows):
-            for c in range(cols):
-                x = start_x + c*(cell_w+gap)
-                y = start_y + r*(cell_h+gap)
-                d.rounded_rectangle((x,y,x+cell_w,y+cell_h), radius=12,
-                                    fill=(255,255,255), outline=BORD_SOFT, width=2)
-                sp = sprites[si % len(sprites)]; si += 1
-                if sp:
-                    im.paste(sp, (x + cell_w//2 - sp.width//2,
-                                  y + cell_h//2 - sp.height//2), sp)
-        return im
-
-    base = draw_grid_base()
-    for _ in range(int(FPS*0.4)):
-        frames.append(base.quantize(colors=256, method=Image.MEDIANCUT))
-
-    for c, r in targets:
-        x = start_x + c*(cell_w+gap)
-        y = start_y + r*(cell_h+gap)
-
-        for f in range(fade_in_frames):
-            im = base.copy()
-            d  = ImageDraw.Draw(im)
-            d.rounded_rectangle((x-2,y-2,x+cell_w+2,y+cell_h+2), radius=14,
-                                outline=(255,122,121), width=3)
-            frames.append(im.quantize(colors=256, method=Image.MEDIANCUT))
-
-        for _ in range(hold_frames):
-            im = base.copy()
-            d  = ImageDraw.Draw(im)
-            d.rounded_rectangle((x-2,y-2,x+cell_w+2,y+cell_h+2), radius=14,
-                                outline=(255,122,121), width=3)
-            frames.append(im.quantize(colors=256, method=Image.MEDIANCUT))
-
-        for _ in range(fade_out_frames):
-            frames.append(base.quantize(colors=256, method=Image.MEDIANCUT))
-
-    out = os.path.join(OUT_DIR, "step2.gif")
-    frames[0].save(out, save_all=True, append_images=frames[1:], duration=170,
-                   loop=0, disposal=2, optimize=True)
-    print("OK:", out)
-
+    tl = Timeline(title="2. Busca", subtitle="Aparece una cuadrícula con distractores. Ignóralos.")
+    tl.hold(int(FPS*0.4), target=None)
+    for target in targets:
+        tl.hold(fade_in_frames + hold_frames, target=target)
+        tl.hold(fade_out_frames, target=None)
 
-# ===== Paso 3 (EMOJIS ESTÁTICOS + selección en orden) =====
-def make_step3():
-    frames = []
+    # save_gif arma una sola paleta para toda la animación
+    frames = render_timeline(tl, Layer(board_layer, ("title", "subtitle")),
+                             Layer(highlight_layer, ("target",)))
+    save_gif(frames, path, duration=170, disposal=2, optimize=True)
 
-    # ⬇️  Mismas medidas compactas que Step 2
-    cols, rows = 4, 3
-    cell_w, cell_h = 100, 60
-    gap = 12
-    total_grid_h = rows*cell_h + (rows-1)*gap      # 204
-    start_y = 130                                  # 130 + 204 = 334
-    start_x = (W - cols*cell_w - (cols-1)*gap)//2
 
+# ===== Paso 3 (EMOJIS ESTÁTICOS + selección en orden) =====
+@tutorial("recuerda/step3.gif", os.path.join(OUT_DIR, "step3.gif"), inputs=emoji_inputs)
+def make_step3(path=os.path.join(OUT_DIR, "step3.gif")):
+    EMOJI.prefetch(EMOJIS)
     order = [(0,0), (1,1), (3,2), (2,0)]
-    sprites = [load_emoji_image(e, 56) for e in EMOJIS]  # ⬅️ acorde a 60px
-    si = 0
     per_click = int(FPS * 1.0)
     hold      = int(FPS * 0.55)
-    selected  = set()
-
-    def draw_board(im, highlight=None):
-        nonlocal si
-        d = ImageDraw.Draw(im)
-        rounded_card(im, (40,40, W-40, H-40), RADIUS, CARD)
-        draw_center_text(d, "3. Repite", FONT_H1, W//2, 70, INK)
-        draw_center_text(d, "Haz clic en el mismo orden en que aparecieron.",
-                         FONT_BODY, W//2, 110, INK_SOFT)
-
-        si = 0
-        for r in range(rows):
-            for c in range(cols):
-                x = start_x + c*(cell_w+gap)
-                y = start_y + r*(cell_h+gap)
-                outline = (46,204,113) if (c,r) in selected else BORD_SOFT
-                d.rounded_rectangle((x,y,x+cell_w,y+cell_h), radius=12,
-                                    fill=(255,255,255), outline=outline, width=2)
-                sp = sprites[si % len(sprites)]; si += 1
-                if sp:
-                    im.paste(sp, (x + cell_w//2 - sp.width//2,
-                                  y + cell_h//2 - sp.height//2), sp)
-
-        if highlight:
-            c,r = highlight
-            x = start_x + c*(cell_w+gap)
-            y = start_y + r*(cell_h+gap)
-            d.rounded_rectangle((x-2,y-2,x+cell_w+2,y+cell_h+2), radius=14,
-                                outline=(255,122,121), width=3)
+    start = (70, 90)               # de dónde sale el puntero en cada clic
 
+    tl = Timeline(title="3. Repite", subtitle="Haz clic en el mismo orden en que aparecieron.",
+                  selected=frozenset())
+    selected = frozenset()
     for target in order:
-        for f in range(per_click):
-            t = ease(f / max(1, per_click-1))
-            im = Image.new("RGB", (W, H), BG)
-            draw_board(im, highlight=target)
-            # puntero
-            ox, oy = 70, 90
-            tc, tr = target
-            tx = start_x + tc*(cell_w+gap) + cell_w//2
-            ty = start_y + tr*(cell_h+gap) + cell_h//2
-            px = int(ox + (tx - ox) * t)
-            py = int(oy + (ty - oy) * t)
-            d = ImageDraw.Draw(im)
-            d.ellipse((px-12, py-12, px+12, py+12), fill=(255,122,121))
-            frames.append(im.quantize(colors=256, method=Image.MEDIANCUT))
-
-        selected.add(target)
-        for _ in range(hold):
-            im = Image.new("RGB", (W, H), BG)
-            draw_board(im)
-            frames.append(im.quantize(colors=256, method=Image.MEDIANCUT))
-
-    out = os.path.join(OUT_DIR, "step3.gif")
-    frames[0].save(out, save_all=True, append_images=frames[1:], duration=160,
-                   loop=0, disposal=2, optimize=True)
-    print("OK:", out)
+        x, y = cell_origin(*target)
+        tl.hold(0, target=target)
+        tl.tween(per_click, ease=ease, pointer=(start, (x + CELL_W//2, y + CELL_H//2)))
+        selected = selected | {target}
+        tl.hold(hold, selected=selected, target=None, pointer=None)
+
+    frames = render_timeline(tl, Layer(board_layer, ("title", "subtitle", "selected")),
+                             Layer(highlight_layer, ("target",)), Layer(pointer_layer, ("pointer",)))
+    # Muchos frames casi iguales: el WebP sin pérdida guarda solo lo que cambia.
+    save_gif(frames, path, duration=160, disposal=2, optimize=True,
+             variant_options={"webp": {"lossless": True}})
 
 
 
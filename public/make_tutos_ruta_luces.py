@@ -1,6 +1,6 @@
-import os
 import re
 from PIL import Image, ImageDraw
+from tutogen import save_gif, tutorial, asset_path
 
 # --- CONFIGURACIÓN DE ESTILO ---
 WIDTH, HEIGHT = 640, 360
@@ -14,33 +14,38 @@ def slugify(text):
     """Crea un nombre de carpeta válido."""
     return re.sub(r'[\W_]+', '_', text.lower())
 
+GAME_NAME = "Ruta de Luces"
+OUT_DIR = asset_path(slugify(GAME_NAME))
+
 def create_base_frame():
     """Crea el lienzo base para todos los frames."""
     img = Image.new("RGB", (WIDTH, HEIGHT), COLOR_BG)
     draw = ImageDraw.Draw(img)
     return img, draw
 
-def make_gif1(folder):
+@tutorial("ruta_luces/tuto1.gif", f"{OUT_DIR}/tuto1.gif")
+def make_gif1(path=f"{OUT_DIR}/tuto1.gif"):
     """STEP 1: Presentación secuencial de luces."""
-    frames = []
     positions = [(160, 180), (320, 180), (480, 180)]
-    
-    for i in range(len(positions) + 1):
-        img, draw = create_base_frame()
-        # Dibujar los 3 círculos base
-        for idx, pos in enumerate(positions):
-            color = COLOR_HIGHLIGHT if idx < i else COLOR_CARD
-            border = COLOR_BORDER if idx < i else COLOR_TEXT
-            draw.ellipse([pos[0]-40, pos[1]-40, pos[0]+40, pos[1]+40], 
-                         fill=color, outline=border, width=3)
+
+    def frames():
+        for i in range(len(positions) + 1):
+            img, draw = create_base_frame()
+            # Dibujar los 3 círculos base
+            for idx, pos in enumerate(positions):
+                color = COLOR_HIGHLIGHT if idx < i else COLOR_CARD
+                border = COLOR_BORDER if idx < i else COLOR_TEXT
+                draw.ellipse([pos[0]-40, pos[1]-40, pos[0]+40, pos[1]+40], 
+                             fill=color, outline=border, width=3)
         
-        # Repetir frames para dar sensación de tiempo
-        for _ in range(10):
-            frames.append(img)
+            # Repetir frames para dar sensación de tiempo
+            for _ in range(10):
+                yield img
 
-    frames[0].save(f"{folder}/tuto1.gif", save_all=True, append_images=frames[1:], optimize=False, duration=100, loop=0)
+    save_gif(frames(), path, optimize=False, duration=100)
 
-def make_gif2(folder):
+@tutorial("ruta_luces/tuto2.gif", f"{OUT_DIR}/tuto2.gif")
+def make_gif2(path=f"{OUT_DIR}/tuto2.gif"):
     """STEP 2: Disposición del tablero de juego."""
     frames = []
     img, draw = create_base_frame()
@@ -53,15 +58,14 @@ def make_gif2(folder):
     # Simular un ligero parpadeo de "espera"
     for _ in range(15): frames.append(img)
     
-    frames[0].save(f"{folder}/tuto2.gif", save_all=True, append_images=frames[1:], duration=100, loop=0)
+    save_gif(frames, path, duration=100)
 
-def make_gif3(folder):
+@tutorial("ruta_luces/tuto3.gif", f"{OUT_DIR}/tuto3.gif")
+def make_gif3(path=f"{OUT_DIR}/tuto3.gif"):
     """STEP 3: Simulación de interacción con efecto pulso."""
-    frames = []
     center_pos = (320, 180)
-    
-    # Ciclo de pulso (crece y cambia de color)
-    for size_offset in range(0, 15, 2):
+
+    def pulse_frame(size_offset):
         img, draw = create_base_frame()
         # Círculo base
         draw.ellipse([center_pos[0]-40, center_pos[1]-40, center_pos[0]+40, center_pos[1]+40], 
@@ -71,23 +75,18 @@ def make_gif3(folder):
         p_off = 40 + size_offset
         draw.ellipse([center_pos[0]-p_off, center_pos[1]-p_off, center_pos[0]+p_off, center_pos[1]+p_off], 
                      outline=COLOR_BORDER, width=2)
-        
-        frames.append(img)
+        return img
 
-    # Añadir frames de regreso al estado normal
-    frames += frames[::-1]
+    # Ciclo de pulso (crece y cambia de color) y regreso al estado normal:
+    # los frames de vuelta se redibujan en vez de guardar los de ida.
+    offsets = list(range(0, 15, 2))
+    frames = (pulse_frame(o) for o in offsets + offsets[::-1])
     
-    frames[0].save(f"{folder}/tuto3.gif", save_all=True, append_images=frames[1:], duration=60, loop=0)
+    save_gif(frames, path, duration=60)
 
 if __name__ == "__main__":
-    game_name = "Ruta de Luces"
-    output_dir = slugify(game_name)
-    
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    print(f"Generando tutoriales para: {game_name}...")
-    make_gif1(output_dir)
-    make_gif2(output_dir)
-    make_gif3(output_dir)
-    print(f"¡Hecho! Los archivos están en la carpeta: {output_dir}")
\ No newline at end of file
+    print(f"Generando tutoriales para: {GAME_NAME}...")
+    make_gif1()
+    make_gif2()
+    make_gif3()
+    print(f"¡Hecho! Los archivos están en la carpeta: {OUT_DIR}")
\ No newline at end of file
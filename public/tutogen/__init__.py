@@ -0,0 +1,16 @@
+# tutogen: motor compartido para los tutoriales animados de los juegos.
+# pip install pillow numpy
+#
+# Los scripts make_*.py / generar_*.py registran aquí sus salidas y
+# usan las mismas primitivas (fuentes, rectángulos, guardado de GIF).
+
+from .fonts import load_font, lazy_font
+from .draw import (rounded_rect, get_text_size, draw_center_text,
+                   rounded_card, paste_rgba_over_rgb)
+from .layers import static_layer
+from .output import save_gif, save_png
+from .registry import tutorial, register, outputs, get_output, load_generators
+from .parallel import render_frames
+from .build import build
+from .paths import asset_path
+from .timeline import Timeline, Layer, render_timeline
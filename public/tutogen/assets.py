@@ -0,0 +1,46 @@
+# assets.py
+# Salidas del build que no son tutoriales: los atlas de emojis (atlas.py)
+# y las variantes de portadas y presentaciones (responsive.py). Registradas
+# como cualquier salida, el build completo y --shard (shard.py) las
+# reparten y las saltan con el mismo manifiesto.
+#
+# Las variantes de portadas son una sola salida: todas comparten el índice
+# img/images.json, y build_images ya es incremental por imagen.
+
+import glob
+import os
+
+from . import parallel
+from .atlas import SUBSETS, atlas_path, build_atlas, emoji_provider, is_strict, subset_emojis
+from .paths import asset_path, repo_path
+from .registry import force_requested, register
+from .responsive import INDEX_PATH, build_images, source_paths
+
+
+def _subset_inputs(subset):
+    def inputs():
+        files = {p for pattern, _ in SUBSETS[subset]
+                 for p in glob.glob(repo_path(pattern), recursive=True)}
+        # Solo la ruta en la caché (sin traer nada): si falta, su hash es
+        # "missing" y cambia cuando aparece.
+        provider = emoji_provider()
+        files |= {provider.cached(e) for e in subset_emojis(SUBSETS[subset])}
+        return sorted(files)
+    return inputs
+
+
+def make_atlas(path, subset):
+    build_atlas(subset, subset_emojis(SUBSETS[subset]), out_dir=os.path.dirname(path),
+                strict=is_strict(SUBSETS[subset]))
+
+
+def make_images(path):
+    # Dentro de un worker del build no se abre otro pool.
+    build_images(force=force_requested(), jobs=1 if parallel._in_worker else None, index_path=path)
+
+
+for _subset in SUBSETS:
+    register(f"atlas/{_subset}", atlas_path(_subset), make_atlas,
+             inputs=_subset_inputs(_subset), subset=_subset)
+
+register("img/images.json", asset_path(INDEX_PATH), make_images, inputs=source_paths)
@@ -0,0 +1,322 @@
+# atlas.py
+# Atlas de emojis: los PNG de Twemoji que se usan (public/emoji, uno por
+# archivo) empaquetados en pocas hojas grandes más un índice JSON con las
+# coordenadas de cada emoji. El frontend baja una hoja en vez de cientos de
+# PNG sueltos y los generadores recortan los sprites de la hoja ya
+# decodificada (ver EmojiProvider).
+#
+# Uso (desde la raíz del repo):
+#   python public/build_emoji_atlas.py                 # todos los subconjuntos
+#   python public/build_emoji_atlas.py recuerda safari
+#   python public/build_emoji_atlas.py list
+#
+# Índice (emoji/atlas/<nombre>.json en la raíz de assets, ver paths.py):
+#   { "cell": 72, "sheets": [{ "src", "webp", "width", "height" }],
+#     "sprites": { "🍎": [hoja, x, y, ancho, alto], ... } }
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import threading
+
+from PIL import Image
+
+from .emoji import EmojiProvider
+from .paths import asset_path, public_url, repo_path
+
+# Relativos a la raíz de assets.
+EMOJI_DIR = "emoji"
+ATLAS_DIR = "emoji/atlas"
+SHEET_SIZE = 2048      # lado máximo de cada hoja
+PADDING = 2            # separación entre sprites (evita "sangrado" al escalar)
+
+# Subconjuntos con nombre: (archivo o glob, variable) o (glob, None) para
+# tomar todos los emojis que aparecen en los archivos. Relativos al repo.
+# En los que nombran variables todos los emojis tienen que tener PNG; al
+# recorrer archivos enteros aparecen símbolos de texto (★, →) que Twemoji
+# no dibuja y solo se avisa.
+SUBSETS = {
+    "tutos": [("public/make_tutos_recuerda.py", "EMOJIS")],
+    # RecuerdaLosObjetos, CazadorDeBurbujas
+    "recuerda": [("src/data/objects.js", "OBJECT_BANK_GENERAL")],
+    "safari": [("src/data/objects.js", "SAFARI_TARGETS"),
+               ("src/data/objects.js", "SAFARI_DISTRACTORS")],
+    # Todo lo que aparece en el frontend
+    "juegos": [("src/**/*.js", None), ("src/**/*.jsx", None)],
+}
+
+_MOD = "(?:\uFE0F|[\U0001F3FB-\U0001F3FF])*"
+_BASE = "[\u00A9\u00AE\u203C-\u3299\U0001F000-\U0001FAFF]"
+# Un emoji: bandera, keycap, o base con modificadores y secuencias ZWJ.
+_EMOJI_RE = re.compile(
+    "[\U0001F1E6-\U0001F1FF]{2}"
+    "|[#*0-9]\uFE0F?\u20E3"
+    f"|{_BASE}{_MOD}(?:\u200D{_BASE}{_MOD})*"
+)
+
+
+# ---------- emojis usados ----------
+
+# Cadenas de JS (se conservan) o comentarios (se quitan): un emoji citado
+# en un comentario no es un emoji que el juego muestre.
+_JS_TOKEN_RE = re.compile(
+    r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)"""
+    r"|//[^\n]*|/\*.*?\*/",
+    re.S,
+)
+
+
+def strip_js_comments(text):
+    return _JS_TOKEN_RE.sub(lambda m: m.group(1) or "", text)
+
+
+def find_emojis(text):
+    """Emojis de `text` en orden de aparición, sin repetir."""
+    return list(dict.fromkeys(_EMOJI_RE.findall(text)))
+
+
+def _block(text, name):
+    """Valor asignado a `name` (JS o Python): desde el `=` hasta que se
+    cierran los corchetes/llaves abiertos."""
+    m = re.search(rf"^(?:export\s+)?(?:const\s+|let\s+|var\s+)?{re.escape(name)}\s*=", text, re.M)
+    if not m:
+        raise KeyError(name)
+    depth, i = 0, m.end()
+    for i in range(m.end(), len(text)):
+        ch = text[i]
+        if ch in "[{(":
+            depth += 1
+        elif ch in "]})":
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 0 and ch in ";\n" and text[m.end():i].strip():
+            break
+    return text[m.end():i + 1]
+
+
+def subset_emojis(spec):
+    """Emojis de un subconjunto: lista de (archivo o glob, variable o None)."""
+    found = []
+    for pattern, name in spec:
+        paths = sorted(glob.glob(repo_path(pattern), recursive=True))
+        if not paths:
+            raise FileNotFoundError(pattern)
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if path.endswith((".js", ".jsx")):
+                text = strip_js_comments(text)
+            found += find_emojis(_block(text, name) if name else text)
+    return list(dict.fromkeys(found))
+
+
+def emoji_provider():
+    """Proveedor de la caché de la raíz de assets actual, sin atlas (el
+    atlas se arma con él): lo que falta sale del espejo o de la CDN."""
+    return EmojiProvider(asset_path(EMOJI_DIR))
+
+
+def emoji_file(emoji, provider=None):
+    """PNG de `emoji` en la caché local (trayéndolo de las fuentes del
+    proveedor si falta), o None si ninguna lo tiene."""
+    return (provider or emoji_provider()).path(emoji)
+
+
+def is_strict(spec):
+    """Todos los emojis del subconjunto tienen que tener PNG (ver SUBSETS)."""
+    return all(name for _, name in spec)
+
+
+# ---------- empaquetado ----------
+
+def pack(sizes, max_size=SHEET_SIZE, padding=PADDING):
+    """Empaqueta rectángulos (ancho, alto) en estantes: los más altos primero,
+    de izquierda a derecha, y una hoja nueva cuando no entran más filas.
+    Devuelve ([(hoja, x, y)] en el orden de `sizes`, [(ancho, alto)] por hoja)."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    places = [None] * len(sizes)
+    sheets = []
+    sheet, x, y, shelf_h, used_w = 0, 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i]
+        if w > max_size or h > max_size:
+            raise ValueError(f"sprite de {w}x{h} no entra en una hoja de {max_size}")
+        if x + w > max_size:                      # fila nueva
+            x, y, shelf_h = 0, y + shelf_h + padding, 0
+        if y + h > max_size:                      # hoja nueva
+            sheets.append((used_w, y))
+            sheet, x, y, shelf_h, used_w = sheet + 1, 0, 0, 0, 0
+        places[i] = (sheet, x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - padding)
+    if sizes:
+        sheets.append((used_w, y + shelf_h))
+    return places, sheets
+
+
+def _save_sheet(sheet, path, fmt, **opts):
+    """Escribe a un .tmp en el mismo directorio y lo mueve encima: nadie
+    lee nunca una hoja a medio escribir."""
+    tmp = path + ".tmp"
+    sheet.save(tmp, fmt, **opts)
+    os.replace(tmp, path)
+
+
+def build_atlas(name, emojis, out_dir=None, provider=None,
+                max_size=SHEET_SIZE, padding=PADDING, webp=True, strict=False):
+    """Arma las hojas de `emojis` y escribe <out_dir>/<name>.json.
+    Los PNG salen de `provider` (por defecto emoji_provider()). Los emojis
+    sin PNG se omiten con un aviso; con strict, o si no queda ninguno, es
+    un error (FileNotFoundError). Los que comparten archivo (con y sin
+    fe0f) comparten sprite. Devuelve la ruta del índice."""
+    out_dir = out_dir or asset_path(ATLAS_DIR)
+    provider = provider or emoji_provider()
+    provider.prefetch(emojis)
+    files, missing = {}, []
+    for e in emojis:
+        p = emoji_file(e, provider)
+        if p:
+            files.setdefault(p, []).append(e)
+        else:
+            missing.append(e)
+    if missing:
+        msg = f"{name}: {len(missing)} de {len(emojis)} emojis sin PNG: {' '.join(missing)}"
+        if strict or not files:
+            raise FileNotFoundError(msg + " (¿falta --emoji-mirror o la red?)")
+        print(f"⚠️  {msg}", file=sys.stderr)
+    paths = list(files)
+    images = []
+    for p in paths:
+        with Image.open(p) as im:
+            images.append(im.convert("RGBA"))
+    places, sizes = pack([im.size for im in images], max_size, padding)
+
+    os.makedirs(out_dir, exist_ok=True)
+    sheets = [Image.new("RGBA", wh, (0, 0, 0, 0)) for wh in sizes]
+    sprites = {}
+    for p, im, (s, x, y) in zip(paths, images, places):
+        sheets[s].paste(im, (x, y))
+        for e in files[p]:
+            sprites[e] = [s, x, y, im.width, im.height]
+
+    index = {"cell": max((im.height for im in images), default=0), "sheets": [], "sprites": sprites}
+    for i, sheet in enumerate(sheets):
+        png = os.path.join(out_dir, f"{name}-{i}.png")
+        _save_sheet(sheet, png, "PNG", optimize=True)
+        entry = {"src": public_url(png), "width": sheet.width, "height": sheet.height}
+        if webp:
+            path = os.path.join(out_dir, f"{name}-{i}.webp")
+            _save_sheet(sheet, path, "WEBP", lossless=True, method=6)
+            entry["webp"] = public_url(path)
+        index["sheets"].append(entry)
+
+    path = os.path.join(out_dir, f"{name}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    print(f"OK: {path} ({len(sprites)} emojis, {len(sheets)} hoja(s))")
+    return path
+
+
+# ---------- lectura ----------
+
+class Atlas:
+    """Sprites recortados de un atlas ya armado.
+
+    El índice se lee al primer uso y cada hoja se decodifica una sola vez;
+    si el índice no existe el atlas queda vacío (se usan los PNG sueltos)."""
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self._index = None
+        self._plain = {}             # claves sin fe0f -> rect
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    index = json.load(f)
+            except FileNotFoundError:
+                index = {"sheets": [], "sprites": {}}
+            self._plain = {k.replace("\uFE0F", ""): v for k, v in index["sprites"].items()}
+            self._index = index
+        return self._index
+
+    def files(self):
+        """Índice y hojas del atlas en disco (para las entradas del manifiesto).
+        Se lee el índice de nuevo: pudo haberse rearmado desde el primer uso."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                sheets = json.load(f)["sheets"]
+        except (OSError, ValueError, KeyError):
+            sheets = []
+        base = os.path.dirname(self.index_path)
+        return [self.index_path, *(os.path.join(base, os.path.basename(s["src"])) for s in sheets)]
+
+    def lookup(self, emoji):
+        """[hoja, x, y, ancho, alto] de `emoji` (con o sin fe0f), o None."""
+        rect = self._load()["sprites"].get(emoji)
+        return rect if rect is not None else self._plain.get(emoji.replace("\uFE0F", ""))
+
+    def __contains__(self, emoji):
+        return isinstance(emoji, str) and self.lookup(emoji) is not None
+
+    def sheet(self, i):
+        with self._lock:
+            if i not in self._sheets:
+                src = self._load()["sheets"][i]["src"]
+                path = os.path.join(os.path.dirname(self.index_path), os.path.basename(src))
+                with Image.open(path) as im:
+                    self._sheets[i] = im.convert("RGBA")
+            return self._sheets[i]
+
+    def sprite(self, emoji):
+        """Emoji en RGBA recortado de su hoja, o None si no está en el atlas."""
+        rect = self.lookup(emoji) if isinstance(emoji, str) else None
+        if rect is None:
+            return None
+        s, x, y, w, h = rect
+        return self.sheet(s).crop((x, y, x + w, y + h))
+
+
+def atlas_path(name, out_dir=None):
+    return os.path.join(out_dir or asset_path(ATLAS_DIR), f"{name}.json")
+
+
+# ---------- CLI ----------
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="build_emoji_atlas",
+                                 description="Empaqueta los emojis usados en hojas con índice JSON.")
+    ap.add_argument("names", nargs="*", help=f"subconjuntos (por defecto todos: {', '.join(SUBSETS)}) o 'list'")
+    ap.add_argument("--size", type=int, default=SHEET_SIZE, help="lado máximo de cada hoja en px")
+    ap.add_argument("--no-webp", action="store_true", help="solo hojas PNG")
+    args = ap.parse_args(argv)
+    if args.names == ["list"]:
+        provider = emoji_provider()
+        for name, spec in SUBSETS.items():
+            emojis = subset_emojis(spec)
+            have = sum(1 for e in emojis if os.path.exists(provider.cached(e)))
+            print(f"{name:12} {have:4} emojis ({len(emojis) - have} sin PNG en la caché)")
+        return
+    unknown = [n for n in args.names if n not in SUBSETS]
+    if unknown:
+        ap.error(f"subconjunto desconocido: {', '.join(unknown)}")
+    failed = False
+    for name in args.names or SUBSETS:
+        try:
+            build_atlas(name, subset_emojis(SUBSETS[name]), max_size=args.size,
+                        webp=not args.no_webp, strict=is_strict(SUBSETS[name]))
+        except FileNotFoundError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            failed = True
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,263 @@
+# bench.py
+# Benchmark de los tutoriales: genera cada salida registrada en un proceso
+# nuevo (sin red: los emojis salen de la caché de public/emoji) dentro de
+# una raíz de assets temporal, y mide tiempo total, frames por segundo,
+# memoria máxima (RSS), bytes escritos y el tiempo por fase (ver timing.py).
+#
+# Uso (desde la raíz del repo):
+#   python public/bench_tutos.py                  # compara con la línea base
+#   python public/bench_tutos.py matriz -n 5      # solo un juego, mediana de 5
+#   python public/bench_tutos.py --save           # guarda la línea base
+#   python public/bench_tutos.py --threshold wall=1.5
+#
+# Sale con código 1 si alguna métrica empeora más que su umbral respecto
+# de tutogen/bench_baseline.json. La línea base guarda también la máquina
+# donde se midió (host_info): en otra máquina los tiempos y la memoria no
+# son comparables y solo se revisan los bytes escritos.
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from .paths import DEFAULT_ROOT, ROOT_ENV, asset_path
+
+BASELINE_PATH = os.path.join(DEFAULT_ROOT, "tutogen", "bench_baseline.json")
+
+# métrica -> (umbral, sentido). "up": peor si sube (tolerado hasta base *
+# umbral); "down": peor si baja (tolerado hasta base * umbral).
+THRESHOLDS = {
+    "wall": (1.25, "up"),
+    "fps": (0.80, "down"),
+    "rss_mb": (1.15, "up"),
+    "bytes": (1.05, "up"),
+}
+# Métricas que dependen de la máquina: solo se comparan contra una línea
+# base medida en la misma (ver host_info).
+HOST_METRICS = ("wall", "fps", "rss_mb")
+# Los tiempos muy cortos varían mucho: por debajo de esto no se comparan.
+MIN_SECONDS = 0.02
+
+
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.partition(":")[2].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def host_info():
+    """Máquina, CPU y versiones con las que se mide: si cambia algo, los
+    tiempos de la línea base no sirven de referencia."""
+    import PIL
+    import numpy
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "numpy": numpy.__version__,
+    }
+
+
+def _output_bytes(o):
+    from .formats import variant_paths
+    return sum(os.path.getsize(p) for p in (o.path, *variant_paths(o.path)) if os.path.exists(p))
+
+
+def _run_one(name, root, conn):
+    """Proceso hijo: genera `name` en `root` y manda sus métricas."""
+    os.environ[ROOT_ENV] = root
+    os.environ["TUTOGEN_OFFLINE"] = "1"
+    from .registry import get_output, load_generators
+    from .timing import PhaseTimer
+    load_generators()
+    o = get_output(name)
+    t0 = time.perf_counter()
+    with PhaseTimer() as t:
+        o.run()
+    wall = time.perf_counter() - t0
+    # ru_maxrss está en KB en Linux y en bytes en macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+    conn.send({
+        "wall": wall,
+        "frames": t.counts.get("frames", 0),
+        "rss_mb": rss_mb,
+        "bytes": _output_bytes(o),
+        "phases": t.result(),
+    })
+    conn.close()
+
+
+def _fresh_root():
+    """Raíz de assets vacía, con la caché de emojis del repo enlazada."""
+    root = tempfile.mkdtemp(prefix="tutogen-bench-")
+    os.symlink(asset_path("emoji"), os.path.join(root, "emoji"))
+    return root
+
+
+def run_once(name):
+    ctx = multiprocessing.get_context("spawn")
+    root = _fresh_root()
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_one, args=(name, root, send))
+    try:
+        proc.start()
+        send.close()
+        try:
+            result = recv.recv()
+        except EOFError:
+            result = None
+        proc.join()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    if result is None or proc.exitcode:
+        raise RuntimeError(f"{name}: el proceso terminó con código {proc.exitcode}")
+    return result
+
+
+def _median(runs):
+    wall = statistics.median(r["wall"] for r in runs)
+    frames = runs[0]["frames"]
+    return {
+        "wall": round(wall, 4),
+        "fps": round(frames / wall, 2) if wall > 0 else 0.0,
+        "frames": frames,
+        "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+        "bytes": runs[0]["bytes"],
+        "phases": {p: round(statistics.median(r["phases"].get(p, 0.0) for r in runs), 4)
+                   for p in runs[0]["phases"]},
+    }
+
+
+def bench(names=None, repeat=3):
+    """{salida: métricas} con la mediana de `repeat` corridas de cada una."""
+    from .registry import load_generators, outputs
+    load_generators()
+    results = {}
+    for o in outputs(names):
+        results[o.name] = _median([run_once(o.name) for _ in range(repeat)])
+        report_line(o.name, results[o.name])
+    return results
+
+
+def report_line(name, m, out=sys.stdout):
+    phases = " ".join(f"{p[:4]} {v:6.2f}" for p, v in m["phases"].items())
+    print(f"{name:32} {m['wall']:7.2f}s {m['fps']:7.1f} fps {m['rss_mb']:7.1f} MB "
+          f"{m['bytes'] / 1024:8.1f} KB  {phases}", file=out)
+
+
+def regressions(results, baseline, thresholds=None, same_host=True):
+    """Mensajes de las métricas que empeoraron más que su umbral. Con
+    same_host=False no se comparan las métricas de HOST_METRICS."""
+    thresholds = {**THRESHOLDS, **(thresholds or {})}
+    if not same_host:
+        thresholds = {k: v for k, v in thresholds.items() if k not in HOST_METRICS}
+    found = []
+    for name, m in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, (limit, sense) in thresholds.items():
+            old, new = base.get(metric), m.get(metric)
+            if not old or new is None:
+                continue
+            if metric in ("wall", "fps") and abs(m["wall"] - base["wall"]) < MIN_SECONDS:
+                continue
+            worse = new > old * limit if sense == "up" else new < old * limit
+            if worse:
+                found.append(f"{name}: {metric} {old:g} -> {new:g} ({new / old:.2f}x, umbral {limit:g}x)")
+    return found
+
+
+def load_baseline(path=None):
+    """{"host": host_info(), "outputs": {salida: métricas}}, o None. Las
+    líneas base sin "host" (formato anterior) no coinciden con ninguna máquina."""
+    try:
+        with open(path or BASELINE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if "outputs" not in data:
+        data = {"host": None, "outputs": data}
+    return data
+
+
+def save_baseline(results, path=None):
+    path = path or BASELINE_PATH
+    host = host_info()
+    old = load_baseline(path)
+    # Se conservan las salidas que no se midieron esta vez, si son de esta máquina.
+    kept = old["outputs"] if old and old["host"] == host else {}
+    data = {"host": host, "outputs": {**kept, **results}}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def _describe(host):
+    if not host:
+        return "desconocida"
+    return f"{host['cpu']}, {host['cpus']} CPU, Python {host['python']}, Pillow {host['pillow']}"
+
+
+def _parse_threshold(text):
+    metric, _, value = text.partition("=")
+    if metric not in THRESHOLDS:
+        raise argparse.ArgumentTypeError(f"métrica desconocida: {metric} ({', '.join(THRESHOLDS)})")
+    try:
+        return metric, (float(value), THRESHOLDS[metric][1])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"umbral no válido: {text}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="bench_tutos",
+                                 description="Mide la generación de los tutoriales y la compara con la línea base.")
+    ap.add_argument("names", nargs="*", help="nombres o prefijos de salidas (por defecto, todas)")
+    ap.add_argument("-n", "--repeat", type=int, default=3, help="corridas por salida (se usa la mediana)")
+    ap.add_argument("--save", action="store_true", help="guarda los resultados como línea base")
+    ap.add_argument("--baseline", default=BASELINE_PATH, help="archivo JSON de la línea base")
+    ap.add_argument("--threshold", action="append", type=_parse_threshold, default=[],
+                    metavar="MÉTRICA=X", help="cambia un umbral, p. ej. wall=1.5 o fps=0.7")
+    args = ap.parse_args(argv)
+
+    results = bench(args.names, repeat=max(1, args.repeat))
+    if not results:
+        ap.error(f"ninguna salida coincide con: {' '.join(args.names)}")
+    if args.save:
+        print(f"💾 línea base: {save_baseline(results, args.baseline)}")
+        return
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"(sin línea base en {args.baseline}; usar --save para crearla)")
+        return
+    host = host_info()
+    same_host = baseline["host"] == host
+    if not same_host:
+        print(f"⚠️  la línea base es de otra máquina ({_describe(baseline['host'])}; "
+              f"esta: {_describe(host)}): solo se comparan los bytes. "
+              "Para comparar tiempos, grabar una con --save en esta máquina.")
+    found = regressions(results, baseline["outputs"], dict(args.threshold), same_host)
+    for msg in found:
+        print("❌", msg)
+    if found:
+        sys.exit(1)
+    print(f"✅ sin regresiones respecto de {args.baseline}")
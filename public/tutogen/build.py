@@ -0,0 +1,176 @@
+# build.py
+# Punto de entrada único: importa los generadores una vez y produce las salidas.
+
+import argparse
+import os
+import sys
+import time
+
+from . import framecache, instrument, pipeline
+from .formats import DEFAULT_FORMATS, available_formats, set_formats, variant_paths, save_media_index
+from .manifest import load_manifest, save_manifest, output_hash, is_fresh, make_entry
+from .parallel import default_jobs, run_outputs, set_frame_jobs
+from .paths import relative, set_asset_root
+from .registry import ASSETS, FORCE_ENV, GENERATORS, load_generators, outputs
+from .shard import merge, parse_shard, select, shard_manifest_path
+from .watch import POLL, watch
+
+
+def build(names=None, force=False, manifest_path=None, jobs=None, frames=False,
+          formats=DEFAULT_FORMATS, shard=None):
+    """Genera las salidas registradas (todas, o las que coincidan con `names`).
+    Las que tienen el mismo hash de entradas que en el manifiesto se saltan,
+    salvo con force=True.
+
+    jobs: procesos (por defecto, los núcleos disponibles).
+    frames: en vez de una salida por proceso, genera las salidas de a una y
+    reparte los frames de cada animación entre los procesos.
+    formats: variantes que acompañan a cada GIF ("webp", "avif", "webm",
+    "mp4"), en orden de preferencia; las que no se pueden generar en esta
+    máquina se omiten. Al final se actualiza tutos/media.json.
+    shard: (i, N) para generar solo la parte i de N (shard.py); el
+    manifiesto principal solo se lee y lo generado va al del shard, que
+    después junta `merge`.
+    Todo se escribe bajo la raíz de assets (paths.py), sin importar el
+    directorio actual."""
+    set_formats(formats)
+    load_generators(GENERATORS + ASSETS)
+    selected = outputs(names)
+    entries = load_manifest(manifest_path)
+    jobs = jobs or default_jobs()
+    t0 = time.perf_counter()
+    save_path = manifest_path
+    if shard:
+        selected, cost = select(selected, shard, entries)
+        save_path = shard_manifest_path(shard, manifest_path)
+        entries.update(load_manifest(save_path))
+        print(f"🧩 shard {shard[0]}/{shard[1]}: {len(selected)} salidas, ~{cost:.1f}s estimados")
+
+    digests = {o.name: output_hash(o) for o in selected}
+    stale = [o for o in selected
+             if force or not is_fresh(o, digests[o.name], entries, variant_paths(o.path))]
+
+    def done(o, seconds):
+        entries[o.name] = make_entry(o, digests[o.name], variant_paths(o.path), seconds)
+
+    instrument.begin()
+    if force:
+        os.environ[FORCE_ENV] = "1"
+    try:
+        if frames:
+            set_frame_jobs(jobs)
+            run_outputs(stale, jobs=1, on_done=done)
+        else:
+            run_outputs(stale, jobs=jobs, on_done=done)
+    finally:
+        set_frame_jobs(0)
+        os.environ.pop(FORCE_ENV, None)
+        if shard:
+            save_manifest({o.name: entries[o.name] for o in selected if o.name in entries}, save_path)
+        else:
+            save_manifest(entries, manifest_path)
+            save_media_index(entries)
+        instrument.finish()
+    print(f"✅ {len(stale)} generadas, {len(selected) - len(stale)} sin cambios "
+          f"en {time.perf_counter() - t0:.1f}s ({jobs} procesos)")
+    return selected
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="build_tutos",
+                                 description="Genera los tutoriales animados de los juegos.")
+    sub = ap.add_subparsers(dest="cmd")
+
+    # Opciones comunes a build y watch.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("names", nargs="*", help='nombres o prefijos, p. ej. "matriz" o "recuerda/step2.gif"')
+    common.add_argument("-j", "--jobs", type=int, default=None, help="procesos (por defecto, núcleos disponibles)")
+    common.add_argument("--formats", default=",".join(DEFAULT_FORMATS),
+                        help="variantes junto a cada GIF, en orden de preferencia "
+                             f"(disponibles: {','.join(available_formats())}; vacío = solo GIF)")
+    common.add_argument("--emoji-mirror", metavar="RUTA",
+                        help="directorio o tarball con los PNG de Twemoji (en vez de la CDN)")
+    common.add_argument("--offline", action="store_true", help="no usa la red (solo caché y espejo)")
+    common.add_argument("--root", metavar="DIR",
+                        help="raíz de assets donde escribir (por defecto, la carpeta public/ del repo)")
+    common.add_argument("--pipeline", dest="pipeline", action="store_const", const=True,
+                        help="solapa dibujo, cuantización y codificación en hilos (por defecto, si hay más de un núcleo)")
+    common.add_argument("--no-pipeline", dest="pipeline", action="store_const", const=False,
+                        help="cada salida en un solo hilo")
+    common.add_argument("--frame-cache", dest="frame_cache", action="store_const", const="on",
+                        help="guarda los frames dibujados y los reusa si no cambió el dibujo (ver tutogen/framecache.py)")
+    common.add_argument("--reencode", dest="frame_cache", action="store_const", const="reencode",
+                        help="reusa los frames guardados aunque haya cambiado el código: solo vuelve a codificar")
+    common.add_argument("--frame-cache-dir", metavar="DIR",
+                        help="dónde guardar los frames (por defecto, .cache/frames/)")
+
+    p_build = sub.add_parser("build", parents=[common], help="genera las salidas (por defecto)")
+    p_build.add_argument("--force", action="store_true", help="ignora el manifiesto y regenera todo")
+    p_build.add_argument("--shard", metavar="i/N",
+                         help="genera solo la parte i de N (misma carpeta, en paralelo; después `merge`)")
+    p_build.add_argument("--frames", action="store_true",
+                         help="reparte los frames de cada animación en vez de las salidas")
+    p_build.add_argument("--profile", metavar="MODOS",
+                         help=f"instrumenta las primitivas: {','.join(instrument.MODES)} (ver tutogen/instrument.py)")
+    p_build.add_argument("--profile-dir", metavar="DIR",
+                         help="dónde escribir stats.json, trace.json y build.prof (por defecto, profile/)")
+
+    p_watch = sub.add_parser("watch", parents=[common],
+                             help="regenera las salidas afectadas cada vez que cambia un archivo (ver tutogen/watch.py)")
+    p_watch.add_argument("--poll", type=float, default=POLL, help=f"segundos entre revisiones (por defecto {POLL})")
+
+    p_list = sub.add_parser("list", help="lista las salidas registradas")
+    p_list.add_argument("--shard", metavar="i/N", help="solo las de esa parte del reparto")
+
+    p_merge = sub.add_parser("merge", help="junta los manifiestos de los shards (ver tutogen/shard.py)")
+    p_merge.add_argument("--root", metavar="DIR", help="raíz de assets de los shards")
+
+    # "build" es el subcomando por defecto: `build_tutos.py -j 4 matriz`
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in sub.choices and argv[0] not in ("-h", "--help")):
+        argv = ["build", *argv]
+    args = ap.parse_args(argv)
+    if args.cmd == "list":
+        load_generators(GENERATORS + ASSETS)
+        selected = outputs()
+        if args.shard:
+            try:
+                selected, _ = select(selected, parse_shard(args.shard), load_manifest())
+            except ValueError as e:
+                ap.error(str(e))
+        for o in selected:
+            print(f"{o.name:32} {relative(o.path)}")
+        return
+    if args.cmd == "merge":
+        if args.root:
+            set_asset_root(args.root)
+        try:
+            merge()
+        except ValueError as e:
+            ap.error(str(e))
+        return
+    # Por entorno, para que los workers del pool también lo vean.
+    if args.root:
+        set_asset_root(args.root)
+    if args.emoji_mirror:
+        os.environ["TUTOGEN_EMOJI_MIRROR"] = args.emoji_mirror
+    if args.offline:
+        os.environ["TUTOGEN_OFFLINE"] = "1"
+    if args.pipeline is not None:
+        pipeline.set_pipeline(args.pipeline)
+    try:
+        formats = args.formats.split(",")
+        set_formats(formats)
+        if args.frame_cache or args.frame_cache_dir:
+            framecache.set_frame_cache(args.frame_cache or "on", args.frame_cache_dir)
+        if args.cmd == "build" and (args.profile or args.profile_dir):
+            instrument.set_profile(args.profile or "stats", args.profile_dir)
+            if args.pipeline and "cprofile" in instrument.profile_modes():
+                print("(--profile cprofile apaga el pipeline: cProfile solo ve un hilo)")
+        shard = parse_shard(args.shard) if args.cmd == "build" and args.shard else None
+    except ValueError as e:
+        ap.error(str(e))
+    if args.cmd == "watch":
+        watch(args.names, jobs=args.jobs, poll=args.poll)
+        return
+    build(args.names, force=args.force, jobs=args.jobs, frames=args.frames, formats=formats, shard=shard)
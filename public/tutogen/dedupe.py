@@ -0,0 +1,103 @@
+# dedupe.py
+# Archivos repetidos en los assets: se agrupan por contenido (tamaño y
+# después sha256) y se informan, o se reemplazan las copias por hardlinks
+# a una sola (el bundle desplegado no carga los mismos bytes dos veces).
+#
+# Uso (desde cualquier carpeta):
+#   python public/dedupe_assets.py                # informe sobre public/
+#   python public/dedupe_assets.py dist --link    # hardlinks en el bundle
+#   python public/dedupe_assets.py --check        # sale con error si hay copias (CI)
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+from .manifest import file_digest
+from .paths import asset_root
+
+# Carpetas que no son assets servidos.
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+
+def _walk(root):
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for f in sorted(files):
+            p = os.path.join(dirpath, f)
+            if not os.path.islink(p) and os.path.isfile(p):
+                yield p
+
+
+def _rank(path):
+    """La copia que se conserva: la menos anidada y, a igual nivel, la
+    primera en orden alfabético (public/tutos/x antes que public/public/tutos/x)."""
+    return (path.count(os.sep), path)
+
+
+def find_duplicates(root, min_size=1):
+    """Grupos de rutas con el mismo contenido (la que se conserva primero),
+    de mayor a menor espacio repetido. Los hardlinks ya existentes cuentan
+    como un solo archivo."""
+    by_size = defaultdict(list)
+    seen = set()
+    for p in _walk(root):
+        st = os.stat(p)
+        if st.st_size < min_size or (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        by_size[st.st_size].append(p)
+    groups = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        by_hash = defaultdict(list)
+        for p in paths:
+            by_hash[file_digest(p)].append(p)
+        groups += [sorted(g, key=_rank) for g in by_hash.values() if len(g) > 1]
+    groups.sort(key=lambda g: (-os.path.getsize(g[0]) * (len(g) - 1), g[0]))
+    return groups
+
+
+def wasted_bytes(groups):
+    return sum(os.path.getsize(g[0]) * (len(g) - 1) for g in groups)
+
+
+def hardlink(groups):
+    """Reemplaza cada copia por un hardlink a la primera del grupo (atómico:
+    link temporal + rename). Devuelve cuántos archivos se enlazaron."""
+    linked = 0
+    for keep, *copies in groups:
+        for p in copies:
+            tmp = f"{p}.{os.getpid()}.lnk"
+            os.link(keep, tmp)
+            os.replace(tmp, p)
+            linked += 1
+    return linked
+
+
+def report(groups, root, out=sys.stdout):
+    for keep, *copies in groups:
+        size = os.path.getsize(keep)
+        print(f"{size * len(copies) / 1024:9.1f} KB  {os.path.relpath(keep, root)}", file=out)
+        for p in copies:
+            print(f"{'':14}= {os.path.relpath(p, root)}", file=out)
+    n = sum(len(g) - 1 for g in groups)
+    print(f"{n} copias en {len(groups)} grupos: {wasted_bytes(groups) / 1e6:.1f} MB repetidos", file=out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="dedupe_assets",
+                                 description="Busca archivos repetidos por contenido en los assets.")
+    ap.add_argument("root", nargs="?", help="carpeta a revisar (por defecto, la raíz de assets: public/)")
+    ap.add_argument("--link", action="store_true", help="reemplaza las copias por hardlinks")
+    ap.add_argument("--check", action="store_true", help="sale con código 1 si hay copias")
+    ap.add_argument("--min-size", type=int, default=1024, help="ignora archivos más chicos (bytes)")
+    args = ap.parse_args(argv)
+    root = os.path.abspath(args.root or asset_root())
+    groups = find_duplicates(root, args.min_size)
+    report(groups, root)
+    if args.link and groups:
+        print(f"🔗 {hardlink(groups)} archivos enlazados")
+    if args.check and groups:
+        sys.exit(1)
@@ -0,0 +1,40 @@
+# draw.py
+# Primitivas de dibujo que antes estaban copiadas en cada script.
+
+from PIL import Image, ImageDraw
+
+from .instrument import probe
+from .text import text_size
+
+
+def rounded_rect(draw, xy, radius, fill=None, outline=None, width=1):
+    draw.rounded_rectangle(xy, radius=radius, fill=fill, outline=outline, width=width)
+
+
+def get_text_size(draw, text, font):
+    # Compatible Pillow >=10. Cacheado (text.py): los títulos que se
+    # repiten en cada frame se miden una vez.
+    return text_size(text, font, draw.fontmode)
+
+
+def draw_center_text(d, txt, font, cx, cy, fill):
+    w, h = get_text_size(d, txt, font)
+    d.text((cx - w // 2, cy - h // 2), txt, font=font, fill=fill)
+
+
+@probe("rounded_card", phase="composite",
+       area=lambda im, box, *a: (box[2] - box[0]) * (box[3] - box[1]))
+def rounded_card(im_rgb, box, radius, fill_rgb):
+    x0, y0, x1, y1 = box
+    w, h = x1 - x0, y1 - y0
+    card = Image.new("RGB", (w, h), fill_rgb)
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, w, h), radius, fill=255)
+    im_rgb.paste(card, (x0, y0), mask)
+
+
+@probe("paste_rgba_over_rgb", phase="composite", area=lambda base, *a: base.width * base.height)
+def paste_rgba_over_rgb(base, rgba, xy):
+    layer = Image.new("RGBA", base.size, (0, 0, 0, 0))
+    layer.paste(rgba, xy, rgba)
+    return Image.alpha_composite(base.convert("RGBA"), layer).convert("RGB")
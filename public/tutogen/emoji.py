@@ -0,0 +1,224 @@
+# emoji.py
+# PNGs de Twemoji para los generadores: se buscan en la caché local
+# (public/emoji) y lo que falta se trae de una cadena de fuentes:
+#   - un espejo local: directorio o tarball con los PNG (sin red),
+#   - la CDN, con una sesión HTTP compartida (conexiones reutilizadas).
+# prefetch() trae todo el juego de emojis de una vez, en paralelo.
+# Con un atlas (atlas.py), los emojis que tenga se recortan de su hoja y
+# no se busca su PNG.
+#
+# Configuración (también desde build_tutos.py):
+#   TUTOGEN_EMOJI_MIRROR=/ruta/a/72x72  o  /ruta/twemoji.tar.gz
+#   TUTOGEN_OFFLINE=1   -> nunca usa la red
+
+import os
+import sys
+import tarfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .spritestore import SpriteStore
+
+TWEMOJI_BASE = "https://cdn.jsdelivr.net/gh/twitter/twemoji@14.0.2/assets/72x72/"
+TIMEOUT = 10
+WORKERS = 8
+
+
+def twemoji_filename(emoji):
+    return "-".join(f"{ord(ch):x}" for ch in emoji) + ".png"
+
+
+def candidates(emoji):
+    """Nombres a probar: Twemoji no siempre incluye el selector fe0f."""
+    name = twemoji_filename(emoji)
+    return [name, name.replace("-fe0f", "")] if "-fe0f" in name else [name]
+
+
+# ---------- fuentes ----------
+
+class DirMirror:
+    """Espejo en un directorio: busca los PNG por nombre en todo el árbol
+    (sirve tanto 72x72/ suelto como un checkout de twemoji)."""
+
+    def __init__(self, root):
+        self.root = root
+        self._index = None
+
+    def _files(self):
+        if self._index is None:
+            index = {}
+            for dirpath, _, files in os.walk(self.root):
+                for f in files:
+                    if f.endswith(".png"):
+                        index.setdefault(f, os.path.join(dirpath, f))
+            self._index = index
+        return self._index
+
+    def fetch(self, name):
+        path = self._files().get(name)
+        if not path:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class TarMirror:
+    """Espejo en un tarball (.tar, .tar.gz...): índice de miembros por nombre.
+    El archivo se abre una vez por hilo (tarfile no admite lecturas en paralelo)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with tarfile.open(path) as tar:
+            self._index = {os.path.basename(m.name): m.name
+                           for m in tar.getmembers() if m.isfile() and m.name.endswith(".png")}
+
+    def fetch(self, name):
+        member = self._index.get(name)
+        if not member:
+            return None
+        tar = getattr(self._local, "tar", None)
+        if tar is None:
+            tar = self._local.tar = tarfile.open(self.path)
+        f = tar.extractfile(member)
+        return f.read() if f else None
+
+
+class HttpSource:
+    """CDN de Twemoji con una requests.Session compartida: el pool de
+    conexiones tiene lugar para todos los hilos de prefetch()."""
+
+    def __init__(self, base=TWEMOJI_BASE, timeout=TIMEOUT, pool=WORKERS):
+        self.base = base
+        self.timeout = timeout
+        self.pool = pool
+        self._session = None
+        self._lock = threading.Lock()
+
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool, max_retries=1)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                self._session = s
+            return self._session
+
+    def fetch(self, name):
+        """PNG `name` de la CDN, o None si no está (404) o falla la red. Los
+        errores de red y los HTTP distintos de 404 se avisan; sin `requests`
+        instalado es un error."""
+        import requests
+        session = self.session()
+        try:
+            r = session.get(self.base + name, timeout=self.timeout)
+            if r.status_code == 404:
+                return None
+            r.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠️  emoji {name[:-4]}: {e}", file=sys.stderr)
+            return None
+        return r.content or None
+
+
+def mirror(path):
+    """Fuente local según `path`: directorio o tarball."""
+    if os.path.isdir(path):
+        return DirMirror(path)
+    if tarfile.is_tarfile(path):
+        return TarMirror(path)
+    raise ValueError(f"espejo de emojis no válido: {path}")
+
+
+def default_sources(base=TWEMOJI_BASE):
+    """Fuentes según el entorno: espejo (si hay) y luego la CDN (salvo offline)."""
+    sources = []
+    if os.environ.get("TUTOGEN_EMOJI_MIRROR"):
+        sources.append(mirror(os.environ["TUTOGEN_EMOJI_MIRROR"]))
+    if os.environ.get("TUTOGEN_OFFLINE", "") in ("", "0"):
+        sources.append(HttpSource(base))
+    return sources
+
+
+# ---------- proveedor ----------
+
+class EmojiProvider:
+    """Emojis como PNG en `cache_dir` e imágenes listas para pegar.
+
+    path(e) devuelve el PNG local (lo trae de las fuentes si falta) o None.
+    Las fuentes se arman al primer uso, así importar un generador no toca
+    la red ni lee el espejo. `atlas` es la ruta de un índice de atlas;
+    si no existe todavía se usan los PNG sueltos."""
+
+    def __init__(self, cache_dir, sources=None, base=TWEMOJI_BASE, workers=WORKERS, atlas=None):
+        from .atlas import Atlas
+        self.cache_dir = cache_dir
+        self.base = base
+        self.workers = workers
+        self._sources = sources
+        self._missing = set()
+        self._lock = threading.Lock()
+        self.atlas = Atlas(atlas) if atlas else None
+        # Sprites decodificados por emoji (no por archivo): ver spritestore.py.
+        self.sprites = SpriteStore(self.path, atlas=self.atlas)
+
+    def sources(self):
+        with self._lock:
+            if self._sources is None:
+                self._sources = default_sources(self.base)
+            return self._sources
+
+    def cached(self, emoji):
+        """Ruta del PNG en la caché. Si todavía no está, la del nombre sin
+        fe0f (el que suele tener Twemoji)."""
+        paths = [os.path.join(self.cache_dir, n) for n in candidates(emoji)]
+        return next((p for p in paths if os.path.exists(p)), paths[-1])
+
+    def path(self, emoji):
+        p = self.cached(emoji)
+        if os.path.exists(p):
+            return p
+        if emoji in self._missing:
+            return None
+        for name in candidates(emoji):
+            for src in self.sources():
+                data = src.fetch(name)
+                if data:
+                    return self._store(name, data)
+        self._missing.add(emoji)
+        return None
+
+    def _store(self, name, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        p = os.path.join(self.cache_dir, name)
+        # Por proceso e hilo: los shards de un build comparten la caché.
+        tmp = f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)
+        return p
+
+    def prefetch(self, emojis):
+        """Trae en paralelo los emojis que falten en la caché (y en el atlas)."""
+        todo = [e for e in dict.fromkeys(emojis)
+                if not (self.atlas is not None and e in self.atlas)
+                and not os.path.exists(self.cached(e))]
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(todo))) as ex:
+            list(ex.map(self.path, todo))
+
+    def image(self, emoji, size):
+        """Emoji en RGBA reducido a `size` px (o None). En caché: no modificar."""
+        return self.sprites.thumb(emoji, size)
+
+    def scaled(self, emoji, size, wh):
+        """image(emoji, size) llevada a wh = (ancho, alto), remuestreada una vez."""
+        return self.sprites.scaled(emoji, size, wh)
+
+    def ladder(self, emoji, size, whs):
+        """Tamaños de un zoom animado, precalculados: ver SpriteStore.ladder."""
+        return self.sprites.ladder(emoji, size, whs)
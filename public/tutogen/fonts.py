@@ -0,0 +1,96 @@
+# fonts.py
+# Carga de fuentes con fallback, compartida por todos los generadores.
+# Ver text.py para las medidas de texto (también cacheadas).
+
+from dataclasses import dataclass
+from functools import lru_cache
+from PIL import ImageFont
+
+# Candidatos por defecto (Windows, Linux, macOS). Cada script puede pasar
+# su propia lista para conservar la fuente que ya usaba.
+SANS = (
+    "arial.ttf",
+    "SegoeUI.ttf",
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+SANS_BOLD = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+)
+
+
+# Familias con nombre: load_font(22, "sans-bold").
+FAMILIES = {
+    "sans": SANS,
+    "sans-bold": SANS_BOLD,
+}
+
+
+@lru_cache(maxsize=None)
+def font_file(candidate):
+    """Ruta real del archivo de fuente `candidate` (Pillow busca los nombres
+    sueltos como "arial.ttf" en las carpetas del sistema); None si no existe."""
+    try:
+        return ImageFont.truetype(candidate, 10).path
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def resolve_font(candidates):
+    """Archivo del primer candidato que existe (None si ninguno). Se resuelve
+    una vez por lista, no por cada tamaño: las rutas que no existen se
+    prueban una sola vez por proceso."""
+    return next((f for f in map(font_file, candidates) if f), None)
+
+
+@lru_cache(maxsize=None)
+def _load_font(size, candidates):
+    path = resolve_font(candidates)
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default()
+
+
+def clear_cache():
+    """Olvida las fuentes abiertas y resueltas (p. ej. si cambió un archivo)."""
+    for f in (font_file, resolve_font, _load_font):
+        f.cache_clear()
+
+
+def _candidates(candidates):
+    if isinstance(candidates, str):
+        return FAMILIES.get(candidates, (candidates,))
+    return tuple(candidates)
+
+
+def load_font(size=20, candidates=SANS):
+    """Primera fuente de `candidates` (lista de archivos o nombre de familia)
+    que se pueda abrir; si ninguna, la por defecto. Registro de todo el
+    proceso: cada (tamaño, lista) se abre una vez y siempre es el mismo objeto."""
+    return _load_font(size, _candidates(candidates))
+
+
+@dataclass(frozen=True)
+class LazyFont:
+    """Fuente que se abre recién al llamarla (ver lazy_font). El manifiesto
+    la hashea por tamaño, candidatos y contenido del archivo resuelto."""
+    size: int
+    candidates: tuple
+
+    def __call__(self):
+        return load_font(self.size, self.candidates)
+
+    @property
+    def path(self):
+        """Archivo que se usaría (None: la fuente por defecto de Pillow)."""
+        return resolve_font(self.candidates)
+
+
+def lazy_font(size=20, candidates=SANS):
+    """Como load_font, pero la fuente se abre recién al llamar al resultado:
+    los generadores la declaran a nivel de módulo sin abrir nada al importarse.
+        FONT = lazy_font(22)   ...   d.text(xy, txt, font=FONT())"""
+    return LazyFont(size, _candidates(candidates))
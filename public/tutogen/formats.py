@@ -0,0 +1,249 @@
+# formats.py
+# Formatos extra para las animaciones: además del GIF, save_gif() escribe
+# las variantes activas (WebP, AVIF, video) a partir de los mismos frames
+# RGB/RGBA, sin cuantizar. Cada variante va junto al GIF con otra
+# extensión: tutos/matriz/step1.gif -> tutos/matriz/step1.webp
+#
+# WebP y AVIF los escribe Pillow (si fue compilado con soporte); MP4/WebM
+# necesitan ffmpeg en el PATH. Los que no están disponibles se omiten.
+
+import json
+import math
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+
+from PIL import features
+
+from .paths import asset_path, public_url
+
+# Orden de preferencia para el navegador (el primero que soporte, gana).
+DEFAULT_FORMATS = ("webp",)
+
+# Índice de variantes para el frontend (Instrucciones.jsx lo lee de /tutos/media.json),
+# relativo a la raíz de assets (paths.py).
+MEDIA_PATH = "tutos/media.json"
+
+
+@dataclass(frozen=True)
+class Format:
+    ext: str                  # extensión sin punto, p. ej. "webp"
+    mime: str                 # tipo para <source type=...>
+    kind: str                 # "image" (<picture>) o "video" (<video>)
+    write: object             # write(frames, path, durations, loop, **opciones)
+    available: object         # callable -> bool
+    alpha: bool = True        # False: se omite en animaciones con transparencia
+
+
+_FORMATS = {}
+
+
+def animated_format(ext, mime, kind="image", available=lambda: True, alpha=True):
+    """Decorador: registra un escritor de animaciones para `ext`."""
+    def deco(write):
+        _FORMATS[ext] = Format(ext, mime, kind, write, available, alpha)
+        return write
+    return deco
+
+
+def get_format(ext):
+    return _FORMATS[ext]
+
+
+def available_formats():
+    return [ext for ext, f in _FORMATS.items() if f.available()]
+
+
+# Formatos activos en este proceso. Lo fija el build (--formats); los
+# workers del pool lo heredan al hacer fork.
+_enabled = DEFAULT_FORMATS
+
+
+def set_formats(exts):
+    """Activa los formatos `exts` (en orden de preferencia). Los desconocidos
+    son error; los no disponibles en esta máquina se omiten en silencio."""
+    global _enabled
+    exts = tuple(e.strip().lower().lstrip(".") for e in exts if e.strip())
+    unknown = [e for e in exts if e not in _FORMATS]
+    if unknown:
+        raise ValueError(f"formato desconocido: {', '.join(unknown)} "
+                         f"(hay: {', '.join(_FORMATS)})")
+    _enabled = exts
+
+
+def enabled_formats():
+    return [e for e in _enabled if _FORMATS[e].available()]
+
+
+def variant_path(path, ext):
+    return os.path.splitext(path)[0] + "." + ext
+
+
+def variant_paths(path):
+    """Variantes que acompañan a `path` con los formatos activos (solo GIF)."""
+    if not path.lower().endswith(".gif"):
+        return []
+    return [variant_path(path, e) for e in enabled_formats()]
+
+
+def _has_alpha(frames):
+    return any(im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info for im in frames)
+
+
+def _normalize(frames):
+    # RGBX (los frames del spool) ya sirve como opaco: no se copia.
+    if _has_alpha(frames):
+        return [im if im.mode == "RGBA" else im.convert("RGBA") for im in frames]
+    return [im if im.mode in ("RGB", "RGBX") else im.convert("RGB") for im in frames]
+
+
+def _tmp_path(out):
+    # Temporal con la misma extensión (ffmpeg elige el contenedor por ella).
+    root, dot_ext = os.path.splitext(out)
+    return root + ".tmp" + dot_ext
+
+
+def write_variants(frames, path, durations, loop=0, options=None):
+    """Escribe las variantes activas de la animación `path`.
+    `frames` en RGB/RGBX/RGBA (ya sin repetidos), `durations` en ms por frame.
+    `options` ({ext: {opción: valor}}) se pasa al escritor de cada formato."""
+    if not frames:
+        return []
+    frames = _normalize(frames)
+    alpha = frames[0].mode == "RGBA"
+    written = []
+    for ext in enabled_formats():
+        fmt = _FORMATS[ext]
+        out = variant_path(path, ext)
+        if alpha and not fmt.alpha:
+            print(f"-- {out}: {ext} no admite transparencia, se omite")
+            continue
+        tmp = _tmp_path(out)
+        try:
+            fmt.write(frames, tmp, durations, loop, **(options or {}).get(ext, {}))
+            os.replace(tmp, out)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        print("OK:", out)
+        written.append(out)
+    return written
+
+
+# Con colores planos y texto, sin pérdida sale mucho más chico (y sin
+# artefactos); con emojis o degradados suele ganar el modo con pérdida,
+# pero no siempre (recuerda/step3): ahí lo elige el generador con
+# save_gif(..., variant_options={"webp": {"lossless": True}}).
+# Hasta FLAT_COLORS colores por frame, sin pérdida.
+FLAT_COLORS = 1024
+
+
+def _is_flat(frames, max_colors=FLAT_COLORS):
+    return all(im.getcolors(max_colors) is not None for im in frames)
+
+
+@animated_format("webp", "image/webp", available=lambda: features.check("webp"))
+def write_webp(frames, path, durations, loop=0, lossless=None):
+    """`lossless` None: sin pérdida si los frames son de colores planos."""
+    if lossless is None:
+        lossless = _is_flat(frames)
+    frames[0].save(path, "WEBP", save_all=True, append_images=frames[1:],
+                   duration=durations, loop=loop, method=4, lossless=lossless, quality=80)
+
+
+@animated_format("avif", "image/avif", available=lambda: features.check("avif"))
+def write_avif(frames, path, durations, loop=0):
+    frames[0].save(path, "AVIF", save_all=True, append_images=frames[1:],
+                   duration=durations, loop=loop, quality=60, speed=8)
+
+
+# ---------- video (ffmpeg) ----------
+
+MAX_FPS = 50
+_RAW_PIX_FMT = {"RGBA": "rgba", "RGBX": "rgb0", "RGB": "rgb24"}
+
+
+def _constant_rate(durations):
+    """fps fijo y cuántas veces repetir cada frame para respetar las duraciones."""
+    step = 0
+    for d in durations:
+        step = math.gcd(step, int(d))
+    step = max(step, 1000 // MAX_FPS)
+    return 1000 / step, [max(1, round(d / step)) for d in durations]
+
+
+def _ffmpeg(frames, path, durations, codec_args, pix_fmt):
+    fps, repeats = _constant_rate(durations)
+    w, h = frames[0].size
+    cmd = ["ffmpeg", "-y", "-loglevel", "error",
+           "-f", "rawvideo", "-pix_fmt", _RAW_PIX_FMT[frames[0].mode],
+           "-s", f"{w}x{h}", "-r", f"{fps:g}", "-i", "-",
+           *codec_args, "-pix_fmt", pix_fmt, "-an", path]
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE) as proc:
+        for im, n in zip(frames, repeats):
+            data = im.tobytes()
+            for _ in range(n):
+                proc.stdin.write(data)
+        proc.stdin.close()
+        if proc.wait():
+            raise RuntimeError(f"ffmpeg falló al escribir {path}")
+
+
+def _has_ffmpeg():
+    return shutil.which("ffmpeg") is not None
+
+
+@animated_format("webm", "video/webm", kind="video", available=_has_ffmpeg)
+def write_webm(frames, path, durations, loop=0):
+    alpha = frames[0].mode == "RGBA"
+    _ffmpeg(frames, path, durations,
+            ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "32", "-row-mt", "1"],
+            "yuva420p" if alpha else "yuv420p")
+
+
+@animated_format("mp4", "video/mp4", kind="video", available=_has_ffmpeg, alpha=False)
+def write_mp4(frames, path, durations, loop=0):
+    # yuv420p necesita ancho y alto pares.
+    _ffmpeg(frames, path, durations,
+            ["-c:v", "libx264", "-crf", "23", "-preset", "slow", "-movflags", "+faststart",
+             "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"],
+            "yuv420p")
+
+
+# ---------- índice para el frontend ----------
+
+def media_index(entries):
+    """{url del GIF: [{src, type, kind}, ...]} con las variantes existentes,
+    en orden de preferencia. `entries` es el manifiesto del build (rutas
+    relativas a la raíz de assets).
+    Las variantes de imagen que pesan más que el propio GIF no se listan
+    (pasa con emojis cuantizados: ahí el GIF ya es lo más liviano)."""
+    index = {}
+    for e in entries.values():
+        path = asset_path(e["path"])
+        url = public_url(path) if e.get("variants") else None
+        if not url or not os.path.exists(path):
+            continue
+        sources = []
+        for v in map(asset_path, e["variants"]):
+            ext = os.path.splitext(v)[1][1:]
+            if ext not in _FORMATS or not os.path.exists(v):
+                continue
+            f = _FORMATS[ext]
+            if f.kind == "image" and os.path.getsize(v) >= os.path.getsize(path):
+                continue
+            sources.append({"src": public_url(v), "type": f.mime, "kind": f.kind})
+        if sources:
+            index[url] = sources
+    return index
+
+
+def save_media_index(entries, path=None):
+    path = path or asset_path(MEDIA_PATH)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(media_index(entries), f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
@@ -0,0 +1,135 @@
+# framecache.py
+# Caché opcional de frames ya dibujados: por animación, los frames RGBA
+# crudos tal como quedaron en el spool (un archivo .rgba, que se lee con
+# np.memmap sin copiarlo) y un .json con tamaño, cantidad, qué frame
+# guardado corresponde a cada frame recibido y el hash de lo que se dibuja
+# (manifest.draw_hash: generador, fuentes, archivos de entrada y kwargs,
+# sin save_gif(), palette.py ni formats.py). Con la caché al día, save_gif() no
+# consume el generador de frames (no se dibuja nada) y solo vuelve a
+# cuantizar y codificar: cambiar formatos, paleta, `duration` u opciones
+# del GIF para todo tutos/ lleva segundos.
+#
+#   build_tutos.py --frame-cache          guarda y reusa si no cambió nada del dibujo
+#   build_tutos.py --reencode             reusa aunque haya cambiado el código
+#
+# --reencode reusa los frames aunque haya cambiado el dibujo (p. ej. para
+# comparar codificaciones sin esperar). Las animaciones sin caché se
+# dibujan y se guardan en ella.
+# Por entorno (lo ven los workers): TUTOGEN_FRAME_CACHE=1|reencode y
+# TUTOGEN_FRAME_CACHE_DIR (por defecto .cache/frames en la raíz del repo).
+
+import json
+import os
+import re
+
+from .paths import relative, repo_path
+from .spool import FrameSpool
+
+FRAME_CACHE_ENV = "TUTOGEN_FRAME_CACHE"
+FRAME_CACHE_DIR_ENV = "TUTOGEN_FRAME_CACHE_DIR"
+MODES = ("off", "on", "reencode")
+DEFAULT_DIR = repo_path(".cache", "frames")
+
+
+def set_frame_cache(mode, cache_dir=None):
+    if mode not in MODES:
+        raise ValueError(f"modo de caché de frames desconocido: {mode} (disponibles: {', '.join(MODES)})")
+    os.environ[FRAME_CACHE_ENV] = mode
+    if cache_dir:
+        os.environ[FRAME_CACHE_DIR_ENV] = os.path.abspath(cache_dir)
+
+
+def cache_mode():
+    raw = os.environ.get(FRAME_CACHE_ENV, "").strip().lower()
+    if raw in ("1", "true", "yes", "on"):
+        return "on"
+    return raw if raw in MODES else "off"
+
+
+def cache_dir():
+    return os.environ.get(FRAME_CACHE_DIR_ENV) or DEFAULT_DIR
+
+
+def _files(path):
+    base = os.path.join(cache_dir(), re.sub(r"[^\w.-]+", "_", relative(path)))
+    return base + ".rgba", base + ".json"
+
+
+def render_key(path):
+    """Hash del dibujo de la salida registrada que escribe `path` (None si
+    no está en el registro, p. ej. al llamar a save_gif a mano)."""
+    from .manifest import draw_hash
+    from .registry import outputs
+    target = os.path.abspath(path)
+    for o in outputs():
+        if os.path.abspath(o.path) == target:
+            return draw_hash(o)
+    return None
+
+
+def _durations(index, duration):
+    """Duraciones de los frames guardados para las `duration` de los frames
+    recibidos (fija o una por frame), como las junta FrameSpool."""
+    if isinstance(duration, (list, tuple)):
+        if len(duration) != len(index):
+            return None
+    else:
+        duration = [duration] * len(index)
+    merged = [0] * (index[-1] + 1)
+    for i, d in zip(index, duration):
+        merged[i] += d
+    return merged
+
+
+def load(path, duration, dedupe=True):
+    """Spool de solo lectura con los frames guardados para `path`, o None si
+    la caché está apagada o no sirve."""
+    mode = cache_mode()
+    if mode == "off":
+        return None
+    raw, meta_path = _files(path)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        size = os.path.getsize(raw)
+    except (OSError, ValueError):
+        return None
+    (w, h), n = meta["size"], meta["frames"]
+    if meta["dedupe"] != dedupe or size != w * h * 4 * n or not meta["index"]:
+        return None
+    if mode == "on" and (meta["key"] is None or meta["key"] != render_key(path)):
+        return None
+    durations = _durations(meta["index"], duration)
+    if durations is None:
+        return None
+    print(f"♻️  {relative(path)}: {n} frames de la caché")
+    return FrameSpool.load(raw, (w, h), durations, alpha=meta["alpha"], transparent=meta["transparent"])
+
+
+def spool(path, dedupe=True, dir=None):
+    """Spool donde dibujar los frames de `path`: con la caché prendida, el
+    archivo queda en la caché (válido recién con store())."""
+    if cache_mode() == "off":
+        return FrameSpool(dir=dir, dedupe=dedupe)
+    raw, meta_path = _files(path)
+    os.makedirs(os.path.dirname(raw), exist_ok=True)
+    try:
+        os.remove(meta_path)
+    except FileNotFoundError:
+        pass
+    return FrameSpool(dedupe=dedupe, path=raw)
+
+
+def store(spool, path):
+    """Marca como válidos los frames recién escritos en el spool de `path`."""
+    if cache_mode() == "off":
+        return
+    raw, meta_path = _files(path)
+    spool.flush()
+    meta = {"key": render_key(path), "size": list(spool.size), "frames": len(spool),
+            "index": spool.index, "dedupe": spool.dedupe,
+            "alpha": spool.alpha, "transparent": spool.transparent}
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
@@ -0,0 +1,287 @@
+# instrument.py
+# Instrumentación de las primitivas caras (halos, círculos, tarjetas,
+# composiciones, guardado de GIF/PNG): por primitiva cuenta llamadas,
+# tiempo total y máximo y píxeles tocados, y marca cada frame, para ver qué
+# primitiva se comió el presupuesto de un frame. Apagada no hace nada
+# (un `if` por llamada).
+#
+# Se prende por entorno (también lo ven los workers del pool) o con
+# build_tutos.py --profile:
+#   TUTOGEN_PROFILE=stats python public/build_tutos.py matriz
+#   python public/build_tutos.py --force --profile stats,trace,cprofile
+#
+# Modos (se pueden combinar; "1" equivale a "stats"):
+#   stats     tabla al final del build y stats.json
+#   trace     trace.json para chrome://tracing o ui.perfetto.dev (un evento
+#             por llamada instrumentada y por frame)
+#   cprofile  build.prof (pstats/snakeviz) con todas las salidas juntas;
+#             apaga el pipeline (pipeline.py): cProfile solo ve el hilo que
+#             lo prende, y así el dibujo corre en ese hilo
+# Los archivos van a profile/ en la raíz del repo (o TUTOGEN_PROFILE_DIR).
+#
+# Los tiempos son inclusivos: una primitiva que llama a otra también
+# cuenta el tiempo de la de adentro. Con --frames solo se registra lo que
+# corre en el proceso principal.
+
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from .paths import repo_path
+from .timing import phase as _phase
+
+PROFILE_ENV = "TUTOGEN_PROFILE"
+PROFILE_DIR_ENV = "TUTOGEN_PROFILE_DIR"
+MODES = ("stats", "trace", "cprofile")
+DEFAULT_DIR = repo_path("profile")
+
+_active = None          # Recorder de la salida en curso (uno por proceso)
+_report = None          # Report del build (proceso principal)
+_NULL = nullcontext()
+
+
+# ---------- configuración ----------
+
+def set_profile(modes, out_dir=None):
+    """Activa los modos (lista o "stats,trace"); vacío = apagado."""
+    if isinstance(modes, str):
+        modes = modes.split(",")
+    modes = [m.strip() for m in modes if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"modo de perfilado desconocido: {', '.join(unknown)} (disponibles: {', '.join(MODES)})")
+    os.environ[PROFILE_ENV] = ",".join(modes)
+    if out_dir:
+        os.environ[PROFILE_DIR_ENV] = os.path.abspath(out_dir)
+
+
+def profile_modes():
+    raw = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if raw in ("1", "true", "yes", "on"):
+        return {"stats"}
+    return {m.strip() for m in raw.split(",") if m.strip() in MODES}
+
+
+def profile_dir():
+    return os.environ.get(PROFILE_DIR_ENV) or DEFAULT_DIR
+
+
+# ---------- registro (en cada proceso) ----------
+
+class Recorder:
+    """Lo registrado mientras se genera una salida."""
+
+    def __init__(self, output, trace=False):
+        self.output = output
+        self.stats = {}             # nombre -> [llamadas, total, máximo, píxeles]
+        self.events = [] if trace else None
+        self.frames = 0
+        self._frame_mark = time.perf_counter()
+        self._lock = threading.Lock()       # el pipeline registra desde varios hilos
+
+    def add(self, name, start, dur, pixels=0, **args):
+        with self._lock:
+            s = self.stats.get(name)
+            if s is None:
+                s = self.stats[name] = [0, 0.0, 0.0, 0]
+            s[0] += 1
+            s[1] += dur
+            s[2] = max(s[2], dur)
+            s[3] += pixels
+        if self.events is not None:
+            self.events.append({
+                "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_native_id(),
+                "ts": start * 1e6, "dur": dur * 1e6,
+                "args": {"output": self.output, "pixels": pixels, **args},
+            })
+
+    def frame(self):
+        """Cierra el frame en curso: su tiempo va desde la marca anterior."""
+        now = time.perf_counter()
+        self.add("frame", self._frame_mark, now - self._frame_mark, index=self.frames)
+        self._frame_mark = now
+        self.frames += 1
+
+    def export(self):
+        return {"output": self.output, "frames": self.frames,
+                "stats": self.stats, "events": self.events or []}
+
+
+@contextmanager
+def _span(rec, name, pixels):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        rec.add(name, t0, time.perf_counter() - t0, pixels)
+
+
+def span(name, pixels=0):
+    """Contexto que registra un bloque como una llamada a `name`."""
+    return _span(_active, name, pixels) if _active is not None else _NULL
+
+
+def frame():
+    """Marca el fin de un frame (lo llama el spool al recibir cada uno)."""
+    if _active is not None:
+        _active.frame()
+
+
+def probe(name, area=None, phase=None):
+    """Decorador para primitivas: registra cada llamada como `name`.
+    area(*args, **kwargs) -> píxeles que toca la llamada (mismos argumentos
+    que la función). Con `phase`, además cuenta en esa fase del benchmark
+    (ver timing.py)."""
+    def deco(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _phase(phase) if phase else _NULL:
+                if _active is None:
+                    return func(*args, **kwargs)
+                with _span(_active, name, area(*args, **kwargs) if area else 0):
+                    return func(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def _slug(name):
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+def run(o):
+    """Genera la salida `o`; con el perfilado activo devuelve lo registrado
+    (para juntarlo en el proceso principal con record()), si no None."""
+    global _active
+    modes = profile_modes()
+    if not modes:
+        o.run()
+        return None
+    rec = Recorder(o.name, trace="trace" in modes)
+    prof = cProfile.Profile() if "cprofile" in modes else None
+    _active = rec
+    t0 = time.perf_counter()
+    try:
+        if prof:
+            prof.enable()
+        o.run()
+    finally:
+        if prof:
+            prof.disable()
+        _active = None
+    rec.add("output", t0, time.perf_counter() - t0)
+    data = rec.export()
+    if prof:
+        path = os.path.join(profile_dir(), "outputs", _slug(o.name) + ".prof")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        prof.dump_stats(path)
+        data["profile"] = path
+    return data
+
+
+# ---------- informe del build (proceso principal) ----------
+
+class Report:
+    def __init__(self, modes):
+        self.modes = modes
+        self.outputs = []
+
+    def add(self, data):
+        self.outputs.append(data)
+
+    def totals(self):
+        totals = {}
+        for data in self.outputs:
+            for name, (calls, total, peak, pixels) in data["stats"].items():
+                t = totals.setdefault(name, [0, 0.0, 0.0, 0])
+                t[0] += calls
+                t[1] += total
+                t[2] = max(t[2], peak)
+                t[3] += pixels
+        return totals
+
+    def print_table(self, out=sys.stdout):
+        print(f"{'primitiva':24} {'llamadas':>9} {'total ms':>10} {'media ms':>9} {'máx ms':>8} {'Mpx':>8}", file=out)
+        for name, (calls, total, peak, pixels) in sorted(self.totals().items(), key=lambda kv: -kv[1][1]):
+            print(f"{name:24} {calls:9d} {total * 1e3:10.1f} {total * 1e3 / calls:9.2f} "
+                  f"{peak * 1e3:8.2f} {pixels / 1e6:8.1f}", file=out)
+        # Por salida: el peor frame y la primitiva de dibujo que más tiempo
+        # se llevó (el guardado no cuenta para el presupuesto de un frame).
+        for data in self.outputs:
+            stats = data["stats"]
+            worst = stats.get("frame", [0, 0.0, 0.0, 0])[2]
+            prims = [(v[1], k) for k, v in stats.items()
+                     if k not in ("frame", "output") and not k.startswith("save_")]
+            top = max(prims, default=(0.0, "-"))
+            print(f"  {data['output']:32} {data['frames']:4d} frames  peor {worst * 1e3:7.1f} ms  "
+                  f"más cara: {top[1]} ({top[0] * 1e3:.1f} ms)", file=out)
+
+    def write(self, out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+        written = []
+        if "stats" in self.modes:
+            path = os.path.join(out_dir, "stats.json")
+            keys = ("calls", "total", "max", "pixels")
+            data = {
+                "totals": {k: dict(zip(keys, v)) for k, v in self.totals().items()},
+                "outputs": {d["output"]: {"frames": d["frames"],
+                                          "stats": {k: dict(zip(keys, v)) for k, v in d["stats"].items()}}
+                            for d in self.outputs},
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            written.append(path)
+        if "trace" in self.modes:
+            path = os.path.join(out_dir, "trace.json")
+            events = [e for d in self.outputs for e in d["events"]]
+            t0 = min((e["ts"] for e in events), default=0.0)
+            for e in events:
+                e["ts"] = round(e["ts"] - t0, 1)
+                e["dur"] = round(e["dur"], 1)
+            names = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"tutogen {pid}"}}
+                     for pid in sorted({e["pid"] for e in events})]
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, f)
+            written.append(path)
+        profiles = [d["profile"] for d in self.outputs if d.get("profile")]
+        if profiles:
+            path = os.path.join(out_dir, "build.prof")
+            stats = pstats.Stats(profiles[0])
+            for p in profiles[1:]:
+                stats.add(p)
+            stats.dump_stats(path)
+            written.append(path)
+        return written
+
+
+def begin():
+    """Empieza el informe del build si el perfilado está activo."""
+    global _report
+    modes = profile_modes()
+    _report = Report(modes) if modes else None
+
+
+def record(data):
+    if _report is not None and data:
+        _report.add(data)
+
+
+def finish(out=sys.stdout):
+    """Imprime la tabla, escribe los archivos del informe y lo cierra.
+    Devuelve las rutas escritas."""
+    global _report
+    report, _report = _report, None
+    if report is None or not report.outputs:
+        return []
+    if "stats" in report.modes:
+        report.print_table(out)
+    written = report.write(profile_dir())
+    for path in written:
+        print(f"📈 {path}", file=out)
+    return written
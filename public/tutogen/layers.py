@@ -0,0 +1,21 @@
+# layers.py
+# Caché de capas estáticas: el fondo de un frame (grilla, tarjeta, textos,
+# emojis) se dibuja una sola vez y cada frame parte de una copia.
+
+from functools import lru_cache, wraps
+
+
+def static_layer(render):
+    """Decorador para funciones que dibujan un fondo y lo devuelven.
+
+    La imagen se genera una vez por combinación de argumentos (que deben ser
+    hashables) y queda guardada sin tocar; cada llamada devuelve una copia
+    nueva sobre la que se puede dibujar la parte dinámica del frame."""
+    cached = lru_cache(maxsize=None)(render)
+
+    @wraps(render)
+    def layer(*args, **kwargs):
+        return cached(*args, **kwargs).copy()
+
+    layer.cache_clear = cached.cache_clear
+    return layer
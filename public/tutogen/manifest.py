@@ -0,0 +1,270 @@
+# manifest.py
+# Build incremental: cada salida guarda un hash de sus entradas y se salta
+# si no cambió ninguna (código del generador y de las funciones y clases
+# que usa, constantes, fuentes, PNGs).
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import textwrap
+import types
+
+import PIL
+from PIL import ImageFont
+
+from .fonts import LazyFont, font_file
+from .paths import DEFAULT_ROOT, asset_path, asset_root, relative
+
+# Relativo a la raíz de assets (paths.py).
+MANIFEST_PATH = "tutogen/manifest.json"
+
+# Tipos que se consideran "constantes" (paleta, geometría, textos...). Las
+# listas y dicts solo cuentan como constantes si el nombre es de
+# configuración (MAYÚSCULAS): los demás pueden ser cachés que cambian
+# durante el build. Los nombres con "_" no se miran.
+_PLAIN = (int, float, str, bytes, bool, type(None))
+_FONT_EXT = (".ttf", ".otf", ".ttc")
+
+_file_cache = {}
+
+
+def file_digest(path):
+    """sha256 del archivo (cacheado por mtime/tamaño); 'missing' si no existe."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _file_cache:
+        with open(path, "rb") as f:
+            _file_cache[key] = hashlib.sha256(f.read()).hexdigest()
+    return _file_cache[key]
+
+
+def _is_plain(v, mutable=False):
+    """`v` es un valor constante: escalares, tuplas y frozensets de
+    constantes; con mutable=True también listas, sets y dicts."""
+    if isinstance(v, _PLAIN):
+        return True
+    if isinstance(v, (tuple, frozenset)) or (mutable and isinstance(v, (list, set))):
+        return all(_is_plain(x, mutable) for x in v)
+    if mutable and isinstance(v, dict):
+        return all(_is_plain(k, mutable) and _is_plain(x, mutable) for k, x in v.items())
+    return False
+
+
+def _is_constant(name, v):
+    if name.startswith("_"):
+        return False
+    return _is_plain(v, mutable=name.isupper())
+
+
+def _font_key(font):
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        return "font:default"
+    return f"font:{path}:{font.size}:{file_digest(path)}"
+
+
+def _lazy_font_key(font):
+    path = font.path
+    digest = file_digest(path) if path else "default"
+    return f"lazyfont:{font.size}:{font.candidates!r}:{digest}"
+
+
+def _font_files(v):
+    """Digests de los archivos de fuente nombrados en una constante."""
+    items = [v] if isinstance(v, str) else v if isinstance(v, (tuple, list)) else ()
+    return [f"{p}:{file_digest(font_file(p)) if font_file(p) else 'missing'}"
+            for p in items if isinstance(p, str) and p.lower().endswith(_FONT_EXT)]
+
+
+def _names(code):
+    """Nombres globales usados por `code` y sus funciones anidadas."""
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if isinstance(c, types.CodeType):
+            names |= _names(c)
+    return names
+
+
+# Solo se sigue el código de public/ (generadores y tutogen), no el de Pillow.
+_ROOT = DEFAULT_ROOT
+
+
+def _portable(text):
+    """Sin la raíz de assets: el hash no cambia según dónde esté el checkout."""
+    return text.replace(asset_root(), "<root>")
+
+
+def _is_ours(func):
+    try:
+        src = inspect.getsourcefile(inspect.unwrap(func))
+    except TypeError:
+        return False
+    return bool(src) and os.path.abspath(src).startswith(_ROOT + os.sep)
+
+
+# Guardado y codificación: no cambian los frames dibujados. draw_hash()
+# no los sigue, ni mira los argumentos de save_gif() salvo los frames.
+_SAVE_MODULES = ("tutogen.output", "tutogen.palette", "tutogen.formats",
+                 "tutogen.spool", "tutogen.framecache", "tutogen.pipeline")
+_SAVE_CALLS = ("save_gif",)
+
+
+def _call_name(node):
+    f = node.func
+    return f.id if isinstance(f, ast.Name) else f.attr if isinstance(f, ast.Attribute) else None
+
+
+def _draw_source(source):
+    """`source` sin los argumentos de save_gif() (duración, disposal, opciones
+    del GIF), y los nombres que usa lo que queda."""
+    tree = ast.parse(textwrap.dedent(source))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and _call_name(node) in _SAVE_CALLS:
+            node.args, node.keywords = node.args[:1], []
+    names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+    return ast.unparse(tree), names
+
+
+def _default_key(v):
+    """Valor por defecto de un argumento; las funciones por nombre (su repr
+    lleva la dirección en memoria, distinta en cada proceso)."""
+    if callable(v) and hasattr(v, "__qualname__"):
+        return f"{getattr(v, '__module__', '')}.{v.__qualname__}"
+    return v
+
+
+def _func_parts(func, parts, seen, draw=False, fonts=None):
+    func = inspect.unwrap(func)
+    if not isinstance(func, types.FunctionType) or func in seen:
+        return
+    if draw and func.__module__ in _SAVE_MODULES:
+        return
+    seen.add(func)
+    names = _names(func.__code__)
+    try:
+        source = inspect.getsource(func)
+        if draw:
+            source, names = _draw_source(source)
+        parts.append(source)
+    except (OSError, TypeError, SyntaxError):
+        parts.append(func.__qualname__)
+    defaults = (*(func.__defaults__ or ()), *(func.__kwdefaults__ or {}).values())
+    parts.append(_portable(repr([_default_key(v) for v in defaults])))
+    for v in defaults:
+        if callable(v) and _is_ours(v):
+            _func_parts(v, parts, seen, draw, fonts)
+
+    g = func.__globals__
+    for name in sorted(names):
+        if name not in g:
+            continue
+        v = g[name]
+        if isinstance(v, (ImageFont.ImageFont, ImageFont.FreeTypeFont)):
+            parts.append(f"{name}={_font_key(v)}")
+            font_paths = [getattr(v, "path", None)]
+        elif isinstance(v, LazyFont):
+            parts.append(f"{name}={_lazy_font_key(v)}")
+            font_paths = [v.path]
+        elif _is_constant(name, v):
+            parts.append(_portable(f"{name}={v!r}"))
+            parts.extend(_font_files(v))
+            items = [v] if isinstance(v, str) else v if isinstance(v, (tuple, list)) else ()
+            font_paths = [font_file(p) for p in items
+                          if isinstance(p, str) and p.lower().endswith(_FONT_EXT)]
+        else:
+            font_paths = []
+            if isinstance(v, type):
+                _class_parts(v, parts, seen, draw, fonts)
+            elif callable(v) and _is_ours(v):
+                _func_parts(v, parts, seen, draw, fonts)
+            else:
+                # Instancia (p. ej. EMOJI = EmojiProvider(...)): su clase.
+                _class_parts(type(v), parts, seen, draw, fonts)
+        if fonts is not None:
+            fonts.update(p for p in font_paths if isinstance(p, str))
+
+
+def _class_parts(cls, parts, seen, draw=False, fonts=None):
+    """Métodos y atributos constantes de `cls` y de sus bases de public/."""
+    for klass in cls.__mro__:
+        if klass in seen or not _is_ours(klass):
+            continue
+        if draw and klass.__module__ in _SAVE_MODULES:
+            continue
+        seen.add(klass)
+        parts.append(f"class {klass.__module__}.{klass.__qualname__}")
+        for name, attr in sorted(vars(klass).items()):
+            if isinstance(attr, (staticmethod, classmethod)):
+                attr = attr.__func__
+            funcs = ([attr.fget, attr.fset, attr.fdel] if isinstance(attr, property)
+                     else [attr] if isinstance(attr, types.FunctionType) else [])
+            for f in funcs:
+                if f is not None:
+                    _func_parts(f, parts, seen, draw, fonts)
+            if not funcs and not name.startswith("__") and _is_constant(name, attr):
+                parts.append(_portable(f"{klass.__qualname__}.{name}={attr!r}"))
+
+
+def output_hash(o, draw=False):
+    """Hash de todo lo que influye en la salida `o` del registro. Con
+    draw=True, solo de lo que influye en los frames dibujados (sin el
+    guardado ni la codificación): la clave de framecache.py."""
+    parts = [f"PIL={PIL.__version__}", relative(o.path), _portable(repr(sorted(o.kwargs.items())))]
+    _func_parts(o.func, parts, set(), draw)
+    for p in (o.inputs() if o.inputs else ()):
+        parts.append(f"{relative(p)}:{file_digest(p)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def draw_hash(o):
+    return output_hash(o, draw=True)
+
+
+def output_fonts(o):
+    """Archivos de fuente que usa la salida `o` (los mismos que entran en
+    su hash)."""
+    fonts = set()
+    _func_parts(o.func, [], set(), fonts=fonts)
+    return fonts
+
+
+def load_manifest(path=None):
+    try:
+        with open(path or asset_path(MANIFEST_PATH), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(entries, path=None):
+    path = path or asset_path(MANIFEST_PATH)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def make_entry(o, digest, variants=(), seconds=None):
+    """Entrada del manifiesto para la salida `o` recién generada. `seconds`
+    (lo que tardó) sirve para repartir el build en shards (shard.py)."""
+    entry = {"hash": digest, "path": relative(o.path), "variants": [relative(v) for v in variants]}
+    if seconds is not None:
+        entry["seconds"] = round(seconds, 2)
+    return entry
+
+
+def is_fresh(o, digest, entries, variants=()):
+    """La salida está al día: mismo hash, mismo archivo y las mismas
+    variantes (formats.variant_paths), todos presentes en disco. El
+    manifiesto guarda las rutas relativas a la raíz de assets."""
+    e = entries.get(o.name)
+    return (bool(e) and e.get("hash") == digest and e.get("path") == relative(o.path)
+            and e.get("variants", []) == [relative(v) for v in variants]
+            and all(os.path.exists(p) for p in (o.path, *variants)))
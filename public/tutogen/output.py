@@ -0,0 +1,116 @@
+# output.py
+# Guardado de GIF/PNG común a todos los generadores.
+# save_gif() también escribe las variantes WebP/AVIF/video activas (formats.py).
+#
+# Las animaciones no se juntan en memoria: los frames pasan de a uno a un
+# archivo temporal (spool.py) y el GIF se escribe frame a frame.
+# Con el pipeline (pipeline.py) el dibujo, la cuantización, el GIF y las
+# variantes corren solapados en hilos.
+# Todo se escribe en un .tmp y se renombra: quien mire la carpeta (Vite,
+# build_tutos.py watch) nunca ve un archivo a medio escribir.
+
+import os
+from contextlib import contextmanager
+
+from PIL import GifImagePlugin, Image
+
+from .formats import write_variants
+from .palette import encode_frames
+from . import framecache, instrument, pipeline
+from .timing import count, phase
+
+
+def ensure_parent(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+
+@contextmanager
+def _atomic(path):
+    """Da un .tmp junto a `path` y, si no hubo error, lo renombra encima.
+    Si falla, el .tmp se borra y `path` queda como estaba."""
+    tmp = path + ".tmp"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_gif_stream(path, size, info, frames, loop=0):
+    """Escribe un GIF con paleta global a partir de (frame "P", offset,
+    duración) que se van generando; no necesita tenerlos todos a la vez.
+    `info` son las opciones de palette.encode_frames."""
+    canvas = Image.new("P", size, 0)
+    canvas.putpalette(info["palette"])
+    header, _ = GifImagePlugin.getheader(
+        canvas, None, {"loop": loop, "transparency": info["transparency"], "optimize": False})
+    with _atomic(path) as tmp, open(tmp, "wb") as fp:
+        for chunk in header:
+            fp.write(chunk)
+        for im, offset, d in frames:
+            with phase("encode"):
+                for chunk in GifImagePlugin.getdata(im, offset, duration=d,
+                                                    disposal=info["disposal"],
+                                                    transparency=info["transparency"]):
+                    fp.write(chunk)
+        fp.write(b";")
+
+
+def save_gif(frames, path, duration, loop=0, dedupe=True, global_palette=True,
+             variant_options=None, **params):
+    """Guarda `frames` como GIF animado (mismos parámetros que Image.save).
+    `frames` puede ser una lista o un generador: se consume de a un frame.
+    Con dedupe, los frames repetidos seguidos se escriben una sola vez.
+    Con global_palette, toda la animación comparte una paleta y los frames
+    opacos se guardan como diferencias (ver palette.encode_frames); los
+    frames se pasan en RGB/RGBA, sin cuantizar.
+    Las variantes en otros formatos salen de los mismos frames, sin pasar
+    por la paleta del GIF; variant_options ({ext: {opción: valor}}) se pasa
+    a sus escritores (formats.py). Con la caché de frames activa, los frames
+    dibujados quedan guardados para volver a codificarlos sin dibujar."""
+    ensure_parent(path)
+    # Con la caché de frames al día (framecache.py) no se consume `frames`:
+    # no se dibuja nada, solo se vuelve a codificar.
+    cached = framecache.load(path, duration, dedupe)
+    with cached or framecache.spool(path, dedupe, dir=os.path.dirname(os.path.abspath(path))) as spool:
+        if cached is None:
+            # El generador dibuja en otro hilo mientras acá se guardan los frames.
+            spool.extend(pipeline.threaded(frames, phase_name="draw"), duration)
+            if not len(spool):
+                raise ValueError(f"{path}: la animación no tiene frames")
+            framecache.store(spool, path)
+        pixels = spool.size[0] * spool.size[1] * len(spool)
+
+        def variants():
+            with phase("encode"), instrument.span("save_variants", pixels):
+                write_variants(spool.images(), path, spool.durations, loop, variant_options)
+
+        def gif():
+            with instrument.span("save_gif", pixels):
+                if global_palette:
+                    # La paleta necesita todos los frames; el mapeo a la paleta
+                    # corre en un hilo y el LZW va escribiendo detrás.
+                    info, encoded = encode_frames(spool.arrays(), spool.durations,
+                                                  disposal=params.get("disposal", 0),
+                                                  has_alpha=spool.transparent)
+                    write_gif_stream(path, spool.size, info,
+                                     pipeline.threaded(encoded, phase_name="quantize"), loop)
+                else:
+                    # Pillow cuantiza cada frame y los junta todos antes de
+                    # escribir; RGBX (los opacos del spool) no lo sabe cuantizar.
+                    images = [im.convert("RGB") if im.mode == "RGBX" else im for im in spool.images()]
+                    with phase("encode"), _atomic(path) as tmp:
+                        images[0].save(tmp, "GIF", save_all=True, append_images=images[1:],
+                                       duration=spool.durations, loop=loop, **params)
+
+        pipeline.run_all(variants, gif)
+    print("OK:", path)
+
+
+def save_png(im, path, **params):
+    ensure_parent(path)
+    count("frames")
+    with phase("encode"), instrument.span("save_png", im.width * im.height), _atomic(path) as tmp:
+        im.save(tmp, "PNG", **params)
+    print("OK:", path)
@@ -0,0 +1,189 @@
+# palette.py
+# Paleta global por animación y codificación por diferencias para GIF.
+#
+# En vez de cuantizar cada frame por separado (lento y con paletas que
+# "parpadean"), se arma una sola paleta a partir de frames de muestra y
+# todos los frames se mapean a ella con NumPy. En animaciones opacas cada
+# frame solo lleva los píxeles que cambiaron, recortado a ese recuadro; el
+# resto va con el índice transparente.
+
+import numpy as np
+from PIL import Image
+
+from .timing import phase
+
+MAX_COLORS = 255            # colores reales; el índice siguiente es el transparente
+SAMPLES = 12                # frames de muestra para armar la paleta
+MONTAGE_PIXELS = 1 << 20    # tope de píxeles para MEDIANCUT
+
+
+def _pack(rgb):
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _unpack(packed):
+    return np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=-1).astype(np.uint8)
+
+
+def _histogram(arrays):
+    """Colores distintos (empaquetados) y cuántos píxeles tiene cada uno,
+    sumando frame por frame para no juntar todos los píxeles a la vez."""
+    colors = np.zeros(0, dtype=np.uint32)
+    counts = np.zeros(0, dtype=np.int64)
+    for a in arrays:
+        px = a[..., :3]
+        if a.shape[-1] == 4:
+            px = px[a[..., 3] > 0]
+        u, c = np.unique(_pack(px.reshape(-1, 3)), return_counts=True)
+        colors, inv = np.unique(np.concatenate([colors, u]), return_inverse=True)
+        counts = np.bincount(inv, weights=np.concatenate([counts, c]), minlength=len(colors)).astype(np.int64)
+    return colors, counts
+
+
+def build_palette(arrays, max_colors=MAX_COLORS, samples=SAMPLES):
+    """Paleta (n, 3) uint8 a partir de frames de muestra repartidos en la animación.
+    Si los colores distintos caben, la paleta es exacta; si no, MEDIANCUT
+    sobre el histograma de las muestras (reducido a MONTAGE_PIXELS)."""
+    step = max(1, len(arrays) // samples)
+    colors, counts = _histogram(arrays[::step][:samples])
+    if not len(colors):
+        return np.zeros((1, 3), np.uint8)
+    if len(colors) <= max_colors:
+        return _unpack(colors)
+
+    total = counts.sum()
+    if total > MONTAGE_PIXELS:
+        counts = np.maximum(1, counts * MONTAGE_PIXELS // total)
+    pixels = _unpack(np.repeat(colors, counts))
+    montage = Image.fromarray(np.ascontiguousarray(pixels[None, :, :]), "RGB")
+    q = montage.quantize(colors=max_colors, method=Image.MEDIANCUT)
+    pal = np.array(q.getpalette()[:3 * max_colors], dtype=np.uint8).reshape(-1, 3)
+    return np.unique(pal, axis=0)
+
+
+def _nearest(colors, pal, chunk=4096):
+    """Índice del color de `pal` más cercano a cada fila de `colors` (vectorizado)."""
+    pal = pal.astype(np.int32)
+    out = np.empty(len(colors), dtype=np.uint8)
+    for i in range(0, len(colors), chunk):
+        c = colors[i:i + chunk].astype(np.int32)
+        d = ((c[:, None, :] - pal[None, :, :]) ** 2).sum(-1)
+        out[i:i + chunk] = d.argmin(1)
+    return out
+
+
+class PaletteMapper:
+    """Mapea frames RGB(A) a índices de una paleta fija, recordando los
+    colores ya resueltos para no recalcular distancias en cada frame.
+    Los píxeles con alpha 0 van al índice `transparent` (= len(pal))."""
+
+    def __init__(self, pal):
+        self.pal = pal
+        self.transparent = len(pal)
+        self._known = np.zeros(0, dtype=np.uint32)
+        self._index = np.zeros(0, dtype=np.uint8)
+
+    def __call__(self, arr):
+        packed = _pack(arr[..., :3])
+        uniq, inv = np.unique(packed, return_inverse=True)
+        if len(self._known):
+            pos = np.searchsorted(self._known, uniq).clip(max=len(self._known) - 1)
+            hit = self._known[pos] == uniq
+        else:
+            pos = np.zeros(len(uniq), dtype=np.intp)
+            hit = np.zeros(len(uniq), dtype=bool)
+        idx = np.empty(len(uniq), dtype=np.uint8)
+        idx[hit] = self._index[pos[hit]]
+        if not hit.all():
+            new = uniq[~hit]
+            idx[~hit] = _nearest(_unpack(new), self.pal)
+            known = np.concatenate([self._known, new])
+            order = np.argsort(known, kind="stable")
+            self._known = known[order]
+            self._index = np.concatenate([self._index, idx[~hit]])[order]
+        out = idx[inv].reshape(packed.shape)
+        if arr.shape[-1] == 4:
+            out[arr[..., 3] == 0] = self.transparent
+        return out
+
+
+def palette_bytes(pal):
+    """Tabla de colores del GIF: los colores reales, luego el transparente y
+    relleno hasta la potencia de 2 siguiente (tablas chicas = códigos LZW más
+    cortos). El relleno usa colores distintos entre sí para que Pillow no
+    reordene índices al guardar."""
+    used = {tuple(c) for c in pal.tolist()}
+    entries = [tuple(c) for c in pal.tolist()]
+    size = 2
+    while size < len(entries) + 1:
+        size *= 2
+    k = 0
+    while len(entries) < size:
+        filler = (k % 256, (k // 256) % 256, 1 + k // 65536)
+        k += 1
+        if filler not in used:
+            used.add(filler)
+            entries.append(filler)
+    return bytes(v for c in entries for v in c)
+
+
+def _bbox(mask):
+    """Recuadro (x0, y0, x1, y1) de los True de `mask`; None si no hay."""
+    rows = np.flatnonzero(mask.any(1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(mask.any(0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def encode_frames(arrays, duration, delta=True, disposal=0, has_alpha=None):
+    """Frames RGB/RGBA (arrays alto x ancho x 3|4) -> (opciones del GIF,
+    generador de (frame "P" recortado, offset, duración)).
+
+    Todos los frames comparten la paleta. Si la animación es opaca y
+    delta=True, cada frame solo contiene los píxeles que cambian respecto
+    al anterior (el resto, índice transparente) recortado a ese recuadro.
+    Los frames se mapean de a uno mientras se consume el generador."""
+    if has_alpha is None:
+        has_alpha = any(a.shape[-1] == 4 and (a[..., 3] == 0).any() for a in arrays)
+    with phase("quantize"):
+        pal = build_palette(arrays)
+    mapper = PaletteMapper(pal)
+    transparent = mapper.transparent
+    use_delta = delta and not has_alpha
+    info = {"palette": palette_bytes(pal), "transparency": transparent,
+            "disposal": 1 if use_delta else disposal}
+
+    def frame(data, box, d):
+        x0, y0, x1, y1 = box or (0, 0, 1, 1)
+        return [Image.fromarray(np.ascontiguousarray(data[y0:y1, x0:x1]), "P"), (x0, y0), d]
+
+    def frames():
+        pending = None       # se entrega cuando se sabe que el siguiente es distinto
+        prev = None
+        for a, d in zip(arrays, duration):
+            with phase("quantize"):
+                idx = mapper(a)
+            if prev is not None and np.array_equal(idx, prev):
+                pending[2] += d
+                continue
+            if pending:
+                yield tuple(pending)
+            with phase("encode"):
+                full = (0, 0, idx.shape[1], idx.shape[0])
+                if prev is None:
+                    pending = frame(idx, full, d)
+                elif use_delta:
+                    changed = idx != prev
+                    pending = frame(np.where(changed, idx, transparent).astype(np.uint8), _bbox(changed), d)
+                elif disposal == 2:
+                    # El frame anterior se borra: alcanza con su parte no transparente.
+                    pending = frame(idx, _bbox(idx != transparent), d)
+                else:
+                    pending = frame(idx, full, d)
+            prev = idx
+        if pending:
+            yield tuple(pending)
+
+    return info, frames()
@@ -0,0 +1,107 @@
+# parallel.py
+# Reparte el trabajo del build en un ProcessPoolExecutor.
+#
+# Dos niveles:
+#   - run_outputs(): una tarea por salida (GIF/PNG) registrada.
+#   - render_frames(): una tarea por rango de frames de una animación larga.
+# Los resultados se recogen siempre en el orden de entrada, así el archivo
+# final es idéntico byte a byte al de un build secuencial.
+
+import os
+import time
+from collections import deque
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+
+from . import instrument
+
+# Procesos para repartir frames (0/1 = secuencial). Lo fija el build con --frames.
+_frame_jobs = 0
+_in_worker = False
+
+# Frames por tarea al repartir una animación: rangos chicos para que los
+# resultados en espera ocupen poca memoria.
+FRAME_CHUNK = 8
+
+
+def default_jobs():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def set_frame_jobs(jobs):
+    global _frame_jobs
+    _frame_jobs = jobs
+
+
+def _worker_init():
+    # Dentro de un worker no se abre otro pool.
+    global _in_worker
+    _in_worker = True
+
+
+def _run_output(name):
+    from .registry import ASSETS, GENERATORS, get_output, load_generators
+    load_generators(GENERATORS + ASSETS)
+    t0 = time.perf_counter()
+    data = instrument.run(get_output(name))
+    return data, time.perf_counter() - t0
+
+
+def run_outputs(outs, jobs=None, on_done=None):
+    """Genera `outs` en paralelo. `on_done(o, segundos)` se llama en el
+    orden de `outs`. Si el perfilado está activo, lo registrado en cada
+    salida (también en los workers) se junta en el informe del build
+    (instrument.py)."""
+    jobs = jobs or default_jobs()
+    if jobs <= 1 or len(outs) <= 1:
+        for o in outs:
+            t0 = time.perf_counter()
+            instrument.record(instrument.run(o))
+            if on_done:
+                on_done(o, time.perf_counter() - t0)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(outs)), initializer=_worker_init) as ex:
+        futures = [ex.submit(_run_output, o.name) for o in outs]
+        for o, fut in zip(outs, futures):
+            data, seconds = fut.result()
+            instrument.record(data)
+            if on_done:
+                on_done(o, seconds)
+
+
+def _render_range(render, specs):
+    return [render(s) for s in specs]
+
+
+def render_frames(render, specs, chunk=None):
+    """Genera render(s) para cada s de `specs`, en orden y de a uno, así
+    save_gif() los consume sin juntarlos en memoria. Los specs iguales
+    seguidos (un hold de la línea de tiempo) se dibujan una vez y se repite
+    el mismo frame: no se deben modificar. Si el build lo activó, los
+    rangos de frames se reparten entre procesos, con pocos rangos en vuelo
+    a la vez. `render` tiene que ser una función de módulo (picklable)."""
+    runs = [(s, len(list(g))) for s, g in groupby(specs)]
+    for im, (_, n) in zip(_render_unique(render, [s for s, _ in runs], chunk), runs):
+        for _ in range(n):
+            yield im
+
+
+def _render_unique(render, specs, chunk=None):
+    jobs = _frame_jobs
+    if _in_worker or jobs <= 1 or len(specs) < 2 * jobs:
+        for s in specs:
+            yield render(s)
+        return
+    chunk = chunk or max(1, min(FRAME_CHUNK, -(-len(specs) // jobs)))
+    ranges = [specs[i:i + chunk] for i in range(0, len(specs), chunk)]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges)), initializer=_worker_init) as ex:
+        pending = deque()
+        for r in ranges:
+            pending.append(ex.submit(_render_range, render, r))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,49 @@
+# paths.py
+# Raíz de los assets (la carpeta public/ servida por el frontend) fijada a
+# partir de la ubicación de este paquete, no del directorio actual: correr
+# un generador desde otra carpeta ya no arma árboles duplicados como
+# public/public/. Los generadores y tutogen arman sus rutas con asset_path().
+#
+# Para generar en otra carpeta (p. ej. comparar builds):
+#   TUTOGEN_ASSET_ROOT=/tmp/otro/public   o   build_tutos.py --root /tmp/otro/public
+# Va por entorno para que los workers del pool también lo vean.
+
+import os
+
+ROOT_ENV = "TUTOGEN_ASSET_ROOT"
+
+# public/ (donde está tutogen) y la raíz del repo (src/, etc.).
+DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(DEFAULT_ROOT)
+
+
+def asset_root():
+    return os.path.abspath(os.environ.get(ROOT_ENV) or DEFAULT_ROOT)
+
+
+def set_asset_root(root):
+    os.environ[ROOT_ENV] = os.path.abspath(root)
+
+
+def asset_path(*parts):
+    """Ruta absoluta dentro de la raíz de assets: asset_path("tutos", "matriz")."""
+    return os.path.join(asset_root(), *parts)
+
+
+def repo_path(*parts):
+    """Ruta absoluta dentro del repo (código del frontend, generadores)."""
+    return os.path.join(REPO_ROOT, *parts)
+
+
+def relative(path):
+    """Ruta relativa a la raíz de assets, con "/" (para manifiestos e
+    índices: no dependen de dónde está el checkout)."""
+    return os.path.relpath(os.path.abspath(path), asset_root()).replace(os.sep, "/")
+
+
+def public_url(path):
+    """Ruta del archivo -> URL servida desde la raíz (None si queda fuera)."""
+    rel = relative(path)
+    if rel.startswith(".."):
+        return None
+    return "/" + rel
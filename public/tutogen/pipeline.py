@@ -0,0 +1,128 @@
+# pipeline.py
+# Etapas del guardado encadenadas con colas acotadas, para que no esperen
+# una a la otra:
+#
+#   dibujo (generador del tutorial) -> spool        hilo propio, cola de QUEUE frames
+#   mapeo a la paleta (quantize)    -> LZW del GIF   hilo propio, cola de QUEUE frames
+#   GIF  ||  WebP/AVIF/video                          en paralelo, una vez completo el spool
+#
+# Son hilos: NumPy, hashlib, la escritura a disco y los codificadores de
+# Pillow (GIF, WebP, AVIF) sueltan el GIL mientras trabajan. El dibujo con
+# ImageDraw no lo suelta del todo; para repartirlo entre procesos está
+# render_frames() (parallel.py, build_tutos.py --frames).
+#
+# El orden de los frames no cambia: los archivos son idénticos con y sin
+# pipeline. Se controla con TUTOGEN_PIPELINE=1|0|auto (auto: solo si hay
+# más de un núcleo) o build_tutos.py --pipeline/--no-pipeline. Con
+# --profile cprofile queda siempre apagado: cProfile solo mide el hilo que
+# lo prende y el dibujo quedaría fuera de build.prof.
+
+import os
+import queue
+import threading
+from contextlib import nullcontext
+
+from . import instrument
+from .parallel import default_jobs
+from .timing import phase
+
+PIPELINE_ENV = "TUTOGEN_PIPELINE"
+QUEUE = 8                 # frames en espera entre dos etapas
+
+_DONE = object()
+
+
+def set_pipeline(mode):
+    """True/False o "auto". Por entorno: los workers del pool también lo ven."""
+    os.environ[PIPELINE_ENV] = {True: "1", False: "0"}.get(mode, str(mode))
+
+
+def enabled():
+    if "cprofile" in instrument.profile_modes():
+        return False
+    mode = os.environ.get(PIPELINE_ENV, "auto").strip().lower()
+    if mode == "auto":
+        return default_jobs() > 1
+    return mode not in ("0", "false", "no", "off", "")
+
+
+class _Error:
+    def __init__(self, exc):
+        self.exc = exc
+
+
+def threaded(iterable, maxsize=QUEUE, phase_name=None):
+    """Recorre `iterable` en un hilo aparte y entrega sus elementos en orden,
+    con hasta `maxsize` esperando: quien consume trabaja mientras el hilo ya
+    produce los siguientes. Las excepciones del productor se relanzan en el
+    consumidor; si el consumidor deja de iterar, el productor se detiene.
+    `phase_name`: fase del benchmark (timing.py) del trabajo del productor.
+    Con el pipeline apagado, o con una lista ya armada, se itera directo."""
+    if isinstance(iterable, (list, tuple)) or not enabled():
+        yield from iterable
+        return
+    q = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            with phase(phase_name) if phase_name else nullcontext():
+                for item in iterable:
+                    if not put(item):
+                        return
+        except BaseException as e:        # se relanza del lado del consumidor
+            put(_Error(e))
+            return
+        put(_DONE)
+
+    t = threading.Thread(target=produce, name="tutogen-pipeline", daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Error):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        t.join()
+
+
+def run_all(*tasks):
+    """Corre las funciones sin argumentos de `tasks` a la vez (la última en
+    el hilo actual) y devuelve sus resultados en orden. Con el pipeline
+    apagado, una tras otra. Si alguna falla, se relanza su excepción
+    después de esperar a las demás."""
+    if len(tasks) <= 1 or not enabled():
+        return [task() for task in tasks]
+    results = [None] * len(tasks)
+    errors = [None] * len(tasks)
+
+    def run(i):
+        try:
+            results[i] = tasks[i]()
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,), name="tutogen-pipeline", daemon=True)
+               for i in range(len(tasks) - 1)]
+    for t in threads:
+        t.start()
+    run(len(tasks) - 1)
+    for t in threads:
+        t.join()
+    for e in errors:
+        if e is not None:
+            raise e
+    return results
@@ -0,0 +1,38 @@
+# raster.py
+# Operaciones de píxeles vectorizadas con NumPy (degradados, alpha),
+# para reemplazar bucles de Python por fila o por píxel.
+# pip install numpy
+#
+# Convenciones: arrays uint8 de forma (alto, ancho, canales), contiguos en C.
+# to_image() copia el array: la imagen no comparte memoria con él.
+
+import numpy as np
+from PIL import Image
+
+def to_array(im):
+    """Imagen -> array (alto, ancho, canales) uint8."""
+    return np.asarray(im)
+
+
+def to_image(arr):
+    """Array uint8 (alto, ancho[, 3 o 4]) -> Imagen L/RGB/RGBA con su propia
+    copia de los píxeles: modificar uno no toca al otro."""
+    return Image.fromarray(np.array(arr, dtype=np.uint8))
+
+
+def vertical_gradient(w, h, top, bottom):
+    """Degradado vertical de `top` a `bottom` (mismos valores que interpolar
+    fila por fila con int(a + (b - a) * y / (h - 1)))."""
+    top = np.asarray(top, dtype=np.float64)
+    bottom = np.asarray(bottom, dtype=np.float64)
+    t = (np.arange(h, dtype=np.float64) / max(1, h - 1))[:, None]
+    rows = (top + (bottom - top) * t).astype(np.uint8)          # (h, canales)
+    return to_image(np.broadcast_to(rows[:, None, :], (h, w, rows.shape[1])))
+
+
+def scale_alpha(im, factor):
+    """Copia de `im` (RGBA) con el alpha multiplicado por `factor` (0..1)."""
+    arr = np.array(im)
+    arr[..., 3] = (arr[..., 3] * factor).astype(np.uint8)
+    return to_image(arr)
+
@@ -0,0 +1,79 @@
+# registry.py
+# Registro de tutoriales: cada salida (GIF/PNG) con la función que la genera.
+
+import importlib
+import os
+from dataclasses import dataclass, field
+
+# Módulos generadores (en public/). Se importan una sola vez por build.
+GENERATORS = (
+    "make_matriz_gifs",
+    "make_tutos_recuerda",
+    "generar_tutorial_sigue_secuencia",
+    "make_tutos_dejavu",
+    "make_tutos_caja_recuerdos",
+    "make_tutos_ruta_luces",
+    "generar_tutorial_matrices",
+)
+
+# Salidas que no son tutoriales (atlas de emojis, variantes de portadas):
+# las genera el build completo; el benchmark y watch miran solo GENERATORS.
+ASSETS = ("tutogen.assets",)
+
+
+# build --force, por entorno para que lo vean los workers del pool: las
+# salidas que además son incrementales por dentro (img/images.json) lo
+# consultan con force_requested().
+FORCE_ENV = "TUTOGEN_FORCE"
+
+
+def force_requested():
+    return os.environ.get(FORCE_ENV, "") not in ("", "0")
+
+
+@dataclass(frozen=True)
+class Output:
+    name: str                 # p. ej. "matriz/step1.gif"
+    path: str                 # archivo que produce
+    func: object              # generador: func(path=..., **kwargs)
+    kwargs: dict = field(default_factory=dict)
+    inputs: object = None     # callable -> archivos que lee (emoji, imágenes...)
+
+    def run(self):
+        return self.func(path=self.path, **self.kwargs)
+
+
+_OUTPUTS = {}
+
+
+def register(name, path, func, inputs=None, **kwargs):
+    # Re-registrar un nombre lo reemplaza (p. ej. al recargar un módulo).
+    _OUTPUTS[name] = Output(name, path, func, kwargs, inputs)
+    return func
+
+
+def tutorial(name, path, inputs=None, **kwargs):
+    """Decorador: registra la función como generadora de `path`.
+    Se puede apilar para una misma función con distintos kwargs.
+    `inputs` es un callable que devuelve los archivos que lee la función,
+    para que el manifiesto los tenga en cuenta."""
+    def deco(func):
+        return register(name, path, func, inputs, **kwargs)
+    return deco
+
+
+def load_generators(modules=GENERATORS):
+    for m in modules:
+        importlib.import_module(m)
+
+
+def get_output(name):
+    return _OUTPUTS[name]
+
+
+def outputs(names=None):
+    """Salidas registradas en orden de registro, filtradas por nombre o prefijo."""
+    if not names:
+        return list(_OUTPUTS.values())
+    return [o for o in _OUTPUTS.values()
+            if any(o.name == n or o.name.startswith(n.rstrip("/") + "/") for n in names)]
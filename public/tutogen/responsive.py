@@ -0,0 +1,227 @@
+# responsive.py
+# Imágenes grandes de la lista de juegos (portadas, presentaciones, arte de
+# personajes) en varios anchos y formatos modernos, para <img srcset>.
+# Cada variante lleva el hash de su contenido en el nombre (se puede
+# cachear para siempre) y el índice img/images.json las lista:
+#
+#   { "/Portada/AFin.png": { "width": 1024, "height": 1024, "hash": "...",
+#       "sources": [{ "type": "image/avif", "srcset": "/img/Portada/AFin-256.1a2b3c4d.avif 256w, ..." },
+#                   { "type": "image/webp", "srcset": "..." }] } }
+#
+# Incremental: una imagen se procesa de nuevo solo si cambió el PNG o los
+# ajustes (anchos, formatos, calidad). Las imágenes se reparten entre procesos.
+#
+# Uso (desde la raíz del repo):
+#   python public/build_images.py            # lo que cambió
+#   python public/build_images.py --force -j 4
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+from .manifest import file_digest
+from .parallel import default_jobs
+from .paths import asset_path, public_url, relative
+
+# Relativos a la raíz de assets (paths.py).
+SOURCES = (
+    "Portada/*.png",
+    "Presentacion/*.png",
+    "Astronauta*.png",
+    "memoria_glow*.png",
+)
+OUT_DIR = "img"
+INDEX_PATH = "img/images.json"
+
+# Anchos en px (los mayores que el original se omiten).
+WIDTHS = (256, 384, 512, 768, 1024, 1536)
+
+# ext -> (mime, opciones de Image.save). En orden de preferencia.
+FORMATS = {
+    "avif": ("image/avif", {"quality": 60, "speed": 8}),
+    "webp": ("image/webp", {"quality": 80, "method": 4}),
+}
+
+HASH_LEN = 8
+
+
+def available_formats():
+    return [ext for ext in FORMATS if features.check(ext)]
+
+
+def settings_key(widths, formats):
+    """Parte del hash de cada entrada: si cambian los ajustes, se regenera."""
+    opts = [(ext, FORMATS[ext]) for ext in formats]
+    return json.dumps([list(widths), opts], sort_keys=True)
+
+
+def source_paths(patterns=SOURCES):
+    return sorted({p for pat in patterns for p in glob.glob(asset_path(pat))})
+
+
+def variant_widths(width, widths=WIDTHS):
+    """Anchos a generar para un original de `width` px: nunca se agranda;
+    si el original es más chico que todos, se usa su ancho."""
+    ws = [w for w in widths if w <= width]
+    return ws or [width]
+
+
+def _out_base(path, out_dir):
+    return os.path.join(out_dir, os.path.splitext(relative(path))[0])
+
+
+def _encode(im, ext):
+    buf = io.BytesIO()
+    im.save(buf, ext.upper(), **FORMATS[ext][1])
+    return buf.getvalue()
+
+
+def process_image(path, widths=WIDTHS, formats=None, out_dir=None):
+    """Escribe las variantes de `path` y devuelve su entrada del índice
+    (sin "hash"). Se decodifica una vez y cada ancho sale del original.
+    Las rutas de "files" son relativas a la raíz de assets."""
+    formats = formats or available_formats()
+    base = _out_base(path, out_dir or asset_path(OUT_DIR))
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    with Image.open(path) as src:
+        src.load()
+        im = src if src.mode in ("RGB", "RGBA") else src.convert("RGBA")
+    # Las que no usan el canal alpha se guardan sin él (archivos más chicos).
+    if im.mode == "RGBA" and im.getchannel("A").getextrema()[0] == 255:
+        im = im.convert("RGB")
+    srcsets = {ext: [] for ext in formats}
+    files = []
+    for w in variant_widths(im.width, widths):
+        h = max(1, round(im.height * w / im.width))
+        resized = im if w == im.width else im.resize((w, h), Image.LANCZOS)
+        for ext in formats:
+            data = _encode(resized, ext)
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LEN]
+            out = f"{base}-{w}.{digest}.{ext}"
+            if not os.path.exists(out):
+                tmp = out + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, out)
+            files.append(relative(out))
+            srcsets[ext].append(f"{public_url(out)} {w}w")
+    return {
+        "width": im.width,
+        "height": im.height,
+        "sources": [{"type": FORMATS[ext][0], "srcset": ", ".join(srcsets[ext])} for ext in formats],
+        "files": files,
+    }
+
+
+def _process(args):
+    return process_image(*args)
+
+
+def load_index(path=None):
+    try:
+        with open(path or asset_path(INDEX_PATH), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_index(index, path=None):
+    path = path or asset_path(INDEX_PATH)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _is_fresh(entry, digest):
+    return (entry and entry.get("hash") == digest
+            and all(os.path.exists(asset_path(p)) for p in entry.get("files", ())))
+
+
+def _remove_stale(index, out_dir):
+    """Borra variantes que ya no figuran en el índice (anchos, hashes o
+    imágenes viejas)."""
+    keep = {os.path.normpath(asset_path(p)) for e in index.values() for p in e["files"]}
+    removed = 0
+    for dirpath, _, names in os.walk(out_dir):
+        for n in names:
+            p = os.path.normpath(os.path.join(dirpath, n))
+            if p not in keep and os.path.splitext(n)[1][1:] in FORMATS:
+                os.remove(p)
+                removed += 1
+    return removed
+
+
+def build_images(paths=None, force=False, jobs=None, widths=WIDTHS, formats=None,
+                 out_dir=None, index_path=None):
+    """Genera las variantes que falten y reescribe el índice. Con `paths`
+    solo se procesan esas imágenes; el resto del índice se conserva."""
+    t0 = time.perf_counter()
+    out_dir = out_dir or asset_path(OUT_DIR)
+    formats = list(formats or available_formats())
+    old = load_index(index_path)
+    if paths is None:
+        paths, index = source_paths(), {}
+    else:
+        paths, index = list(paths), dict(old)
+    settings = settings_key(widths, formats)
+    todo = []
+    for p in paths:
+        url = public_url(p)
+        digest = hashlib.sha256(f"{file_digest(p)}:{settings}".encode()).hexdigest()[:16]
+        if not force and _is_fresh(old.get(url), digest):
+            index[url] = old[url]
+        else:
+            todo.append((p, url, digest))
+
+    jobs = jobs or default_jobs()
+    tasks = [(p, widths, formats, out_dir) for p, _, _ in todo]
+    if jobs <= 1 or len(tasks) <= 1:
+        results = map(_process, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        results = pool.map(_process, tasks)
+    try:
+        for (p, url, digest), entry in zip(todo, results):
+            index[url] = {"hash": digest, **entry}
+            print("OK:", p)
+    finally:
+        if pool:
+            pool.shutdown()
+        save_index(index, index_path)
+    removed = _remove_stale(index, out_dir)
+    dt = time.perf_counter() - t0
+    print(f"✅ {len(todo)} procesadas, {len(paths) - len(todo)} sin cambios, "
+          f"{removed} variantes viejas borradas en {dt:.1f}s ({jobs} procesos)")
+    return index
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="build_images",
+                                 description="Variantes redimensionadas (AVIF/WebP) de portadas y presentaciones.")
+    ap.add_argument("paths", nargs="*", help=f"PNGs (por defecto: {' '.join(SOURCES)})")
+    ap.add_argument("--force", action="store_true", help="regenera aunque no haya cambios")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="procesos (por defecto, núcleos disponibles)")
+    ap.add_argument("--widths", default=",".join(map(str, WIDTHS)), help="anchos en px, separados por coma")
+    ap.add_argument("--formats", default=",".join(available_formats()),
+                    help=f"en orden de preferencia (disponibles: {','.join(available_formats())})")
+    args = ap.parse_args(argv)
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = [f for f in formats if f not in available_formats()]
+    if unknown or not formats:
+        ap.error(f"formato no disponible: {','.join(unknown) or '(ninguno)'}")
+    try:
+        widths = tuple(sorted({int(w) for w in args.widths.split(",") if w}))
+    except ValueError:
+        ap.error(f"anchos no válidos: {args.widths}")
+    build_images(args.paths or None, force=args.force, jobs=args.jobs, widths=widths, formats=formats)
@@ -0,0 +1,112 @@
+# scene.py
+# Escena por frame con regiones sucias: cada frame se describe como una
+# lista de nodos (clave, recuadro, estado, función de dibujo) y solo se
+# vuelven a rasterizar los recuadros de los nodos que cambiaron, aparecieron
+# o desaparecieron; el resto del bitmap sale del frame anterior. Con
+# tutoriales mayormente estáticos, el costo sigue al movimiento y no a la
+# duración.
+#
+#   scene = SceneRenderer(fondo)
+#   for step in range(5):
+#       yield scene.render([Node("opcion", box, (x, y), draw_opcion), *celdas])
+#
+# El recuadro de un nodo tiene que cubrir todo lo que dibuja (bordes,
+# texto, halos): fuera de él no se repinta.
+
+import math
+from dataclasses import dataclass
+
+from PIL import ImageDraw
+
+
+@dataclass(frozen=True)
+class Node:
+    key: object              # identidad del nodo entre frames
+    box: tuple               # (x0, y0, x1, y1) como en Image.crop: x1/y1 excluidos
+    state: object            # lo que determina el dibujo (comparable con ==)
+    draw: object             # draw(im, d): dibuja el nodo en coordenadas absolutas
+
+
+def pad(box, n):
+    x0, y0, x1, y1 = box
+    return (x0 - n, y0 - n, x1 + n, y1 + n)
+
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _merge(boxes):
+    """Junta los recuadros que se tocan (menos pegado de recortes)."""
+    merged = []
+    for box in boxes:
+        while True:
+            hit = next((m for m in merged if _overlaps(m, box)), None)
+            if hit is None:
+                break
+            merged.remove(hit)
+            box = _union(hit, box)
+        merged.append(box)
+    return merged
+
+
+def _clip(box, size):
+    x0, y0, x1, y1 = box
+    box = (max(0, math.floor(x0)), max(0, math.floor(y0)),
+           min(size[0], math.ceil(x1)), min(size[1], math.ceil(y1)))
+    return box if box[0] < box[2] and box[1] < box[3] else None
+
+
+class SceneRenderer:
+    """Dibuja escenas sucesivas sobre `background` repintando solo lo que
+    cambió. render() devuelve una imagen nueva si algo cambió o la misma del
+    frame anterior si no (no se deben modificar)."""
+
+    def __init__(self, background):
+        self.background = background
+        self.size = background.size
+        self.dirty_pixels = 0             # píxeles repintados (para comparar)
+        self._nodes = {}                  # clave -> (recuadro, estado)
+        self._image = None
+
+    def _draw(self, nodes, im):
+        d = ImageDraw.Draw(im)
+        for n in nodes:
+            n.draw(im, d)
+
+    def render(self, nodes):
+        nodes = list(nodes)
+        current = {n.key: (n.box, n.state) for n in nodes}
+        if len(current) != len(nodes):
+            raise ValueError("claves de nodo repetidas en la escena")
+        if self._image is None:
+            im = self.background.copy()
+            self._draw(nodes, im)
+            self.dirty_pixels += self.size[0] * self.size[1]
+        else:
+            dirty = []
+            for key, (box, state) in current.items():
+                old = self._nodes.get(key)
+                if old != (box, state):
+                    dirty.append(box)
+                    if old is not None and old[0] != box:
+                        dirty.append(old[0])
+            dirty += [box for key, (box, _) in self._nodes.items() if key not in current]
+            dirty = [b for b in (_clip(b, self.size) for b in _merge(dirty)) if b]
+            if not dirty:
+                self._nodes = current
+                return self._image
+            # Se redibujan, en orden, solo los nodos que tocan algún recuadro
+            # sucio, sobre el fondo limpio; después se pegan esos recuadros.
+            scratch = self.background.copy()
+            self._draw([n for n in nodes if any(_overlaps(n.box, r) for r in dirty)], scratch)
+            im = self._image.copy()
+            for r in dirty:
+                im.paste(scratch.crop(r), r[:2])
+                self.dirty_pixels += (r[2] - r[0]) * (r[3] - r[1])
+        self._nodes, self._image = current, im
+        return im
@@ -0,0 +1,105 @@
+# shard.py
+# Reparto del build en N máquinas (o procesos): `--shard i/N` genera solo
+# la parte i de las salidas registradas (tutoriales, atlas de emojis,
+# variantes de portadas) y escribe su propio manifiesto; `merge` junta los
+# manifiestos de los shards en el principal y rehace tutos/media.json.
+#
+#   python public/build_tutos.py --shard 1/3 &      # en paralelo, misma carpeta
+#   python public/build_tutos.py --shard 2/3 &
+#   python public/build_tutos.py --shard 3/3 &
+#   wait && python public/build_tutos.py merge
+#
+# El reparto es determinista: depende solo de las salidas seleccionadas y
+# de su costo registrado (segundos de la última generación en el
+# manifiesto, o `wall` de la línea base del benchmark; si no hay ninguno,
+# el promedio de los conocidos). Todos los shards tienen que usar los
+# mismos nombres y partir del mismo manifiesto principal, que no escriben.
+# Se balancea con LPT: de la salida más cara a la más barata, cada una al
+# shard con menos carga.
+
+import glob
+import os
+import re
+
+from .formats import save_media_index
+from .manifest import MANIFEST_PATH, load_manifest, save_manifest
+from .paths import DEFAULT_ROOT, asset_path
+
+# Misma ruta que bench.BASELINE_PATH (bench.py usa `resource`, solo POSIX).
+BENCH_BASELINE = os.path.join(DEFAULT_ROOT, "tutogen", "bench_baseline.json")
+
+_SHARD_RE = re.compile(r"\.shard-(\d+)-of-(\d+)\.json$")
+
+
+def parse_shard(text):
+    """"i/N" -> (i, N), con 1 <= i <= N."""
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", text)
+    if not m or not 1 <= int(m.group(1)) <= int(m.group(2)):
+        raise ValueError(f"shard no válido: {text!r} (se espera i/N con 1 <= i <= N)")
+    return int(m.group(1)), int(m.group(2))
+
+
+def shard_manifest_path(shard, manifest_path=None):
+    i, n = shard
+    base = os.path.splitext(manifest_path or asset_path(MANIFEST_PATH))[0]
+    return f"{base}.shard-{i}-of-{n}.json"
+
+
+def output_costs(outs, entries, baseline=None):
+    """Segundos estimados por salida (ver arriba)."""
+    if baseline is None:
+        baseline = load_manifest(BENCH_BASELINE)
+        baseline = baseline.get("outputs", baseline)
+    known = {}
+    for o in outs:
+        cost = (entries.get(o.name) or {}).get("seconds") or (baseline.get(o.name) or {}).get("wall")
+        if cost:
+            known[o.name] = cost
+    default = sum(known.values()) / len(known) if known else 1.0
+    return {o.name: known.get(o.name, default) for o in outs}
+
+
+def partition(outs, n, costs):
+    """`outs` en `n` partes de costo parecido; cada parte en el orden de
+    `outs`. Los empates se deciden por nombre, no por el orden de llegada."""
+    parts = [[] for _ in range(n)]
+    loads = [0.0] * n
+    for o in sorted(outs, key=lambda o: (-costs[o.name], o.name)):
+        k = min(range(n), key=lambda k: (loads[k], k))
+        parts[k].append(o)
+        loads[k] += costs[o.name]
+    order = {o.name: i for i, o in enumerate(outs)}
+    return [sorted(p, key=lambda o: order[o.name]) for p in parts]
+
+
+def select(outs, shard, entries):
+    """Las salidas del shard (i, N) y su costo estimado total."""
+    i, n = shard
+    costs = output_costs(outs, entries)
+    part = partition(outs, n, costs)[i - 1]
+    return part, sum(costs[o.name] for o in part)
+
+
+def merge(manifest_path=None):
+    """Junta los manifiestos de los shards en el principal, rehace el índice
+    de variantes y borra los de los shards. Devuelve cuántos juntó."""
+    main_path = manifest_path or asset_path(MANIFEST_PATH)
+    base = os.path.splitext(main_path)[0]
+    found = sorted(glob.glob(glob.escape(base) + ".shard-*-of-*.json"))
+    totals = {int(_SHARD_RE.search(p).group(2)) for p in found}
+    if len(totals) > 1:
+        raise ValueError(f"manifiestos de repartos distintos: {', '.join(map(os.path.basename, found))}")
+    if found:
+        n = totals.pop()
+        missing = set(range(1, n + 1)) - {int(_SHARD_RE.search(p).group(1)) for p in found}
+        if missing:
+            print(f"⚠️  faltan los shards {', '.join(map(str, sorted(missing)))} de {n}")
+    entries = load_manifest(main_path)
+    for p in found:
+        entries.update(load_manifest(p))
+    save_manifest(entries, main_path)
+    save_media_index(entries)
+    for p in found:
+        os.remove(p)
+    print(f"✅ {len(found)} manifiesto(s) de shard juntados en {main_path}")
+    return len(found)
@@ -0,0 +1,131 @@
+# spool.py
+# Frames de una animación guardados en un archivo temporal en vez de en
+# una lista: los generadores entregan los frames de a uno y en memoria
+# queda solo el que se está dibujando. Después se leen con np.memmap
+# (páginas del archivo, que el sistema puede descartar) para armar la
+# paleta del GIF y escribir cada formato. Con la caché de frames
+# (framecache.py) el archivo queda guardado y se vuelve a abrir con load().
+
+import hashlib
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from . import instrument
+from .timing import count, phase
+
+_ALPHA_MODES = ("RGBA", "LA", "PA")
+
+
+def _to_rgba(im):
+    """Frame -> (RGBA, tenía alpha). Los frames opacos quedan con alpha 255."""
+    alpha = im.mode in _ALPHA_MODES or "transparency" in im.info
+    return (im if im.mode == "RGBA" else im.convert("RGBA")), alpha
+
+
+class FrameSpool:
+    """Frames de igual tamaño, 4 bytes por píxel, con su duración en ms.
+
+    Con dedupe=True, un frame igual al anterior no se escribe: se suma su
+    duración al anterior (los generadores repiten frames para "alargar" el
+    tiempo). El archivo se borra solo al cerrar el spool, salvo que se
+    indique `path`."""
+
+    def __init__(self, dir=None, dedupe=True, path=None):
+        # Junto a la salida y no en /tmp, que en CI suele ser tmpfs (RAM).
+        self._file = open(path, "w+b") if path else tempfile.TemporaryFile(dir=dir)
+        self.dedupe = dedupe
+        self.size = None
+        self.durations = []
+        self.index = []              # por frame recibido, el frame guardado que le toca
+        self.alpha = False           # algún frame venía con canal alpha
+        self.transparent = False     # algún píxel tiene alpha 0
+        self._last = None            # (objeto, hash) del último frame escrito
+        self._map = None
+
+    @classmethod
+    def load(cls, path, size, durations, alpha=False, transparent=False):
+        """Spool ya completo sobre un archivo existente, solo para leer."""
+        spool = cls.__new__(cls)
+        spool._file = open(path, "rb")
+        spool.dedupe = False
+        spool.size = tuple(size)
+        spool.durations = list(durations)
+        spool.index = []
+        spool.alpha = alpha
+        spool.transparent = transparent
+        spool._last = None
+        spool._map = None
+        return spool
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map = None
+        self._file.close()
+
+    def append(self, im, duration):
+        count("frames")
+        with phase("encode"):
+            self._append(im, duration)
+        instrument.frame()
+
+    def _append(self, im, duration):
+        # Mismo objeto que el anterior ([img] * 30): ni se convierte.
+        if self.dedupe and self._last is not None and im is self._last[0]:
+            self.durations[-1] += duration
+            self.index.append(len(self.durations) - 1)
+            return
+        rgba, alpha = _to_rgba(im)
+        if self.size is None:
+            self.size = rgba.size
+        elif rgba.size != self.size:
+            raise ValueError(f"frame de {rgba.size}, se esperaba {self.size}")
+        data = rgba.tobytes()
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        if self.dedupe and self._last is not None and key == self._last[1]:
+            self._last = (im, key)
+            self.durations[-1] += duration
+            self.index.append(len(self.durations) - 1)
+            return
+        if alpha:
+            self.alpha = True
+            if not self.transparent:
+                self.transparent = not rgba.getchannel("A").getextrema()[0]
+        self._file.write(data)
+        self.durations.append(duration)
+        self.index.append(len(self.durations) - 1)
+        self._last = (im, key)
+        self._map = None
+
+    def extend(self, frames, duration):
+        """Agrega `frames` (cualquier iterable); `duration` en ms, fija o una por frame."""
+        durations = duration if isinstance(duration, (list, tuple)) else None
+        for i, im in enumerate(frames):
+            self.append(im, durations[i] if durations else duration)
+
+    def flush(self):
+        if self._file.writable():
+            self._file.flush()
+
+    def arrays(self):
+        """Vista (n, alto, ancho, 4) uint8 de solo lectura sobre el archivo."""
+        if self._map is None:
+            self.flush()
+            w, h = self.size
+            self._map = np.memmap(self._file, dtype=np.uint8, mode="r", shape=(len(self), h, w, 4))
+        return self._map
+
+    def images(self):
+        """Frames como imágenes RGBA (o RGBX si son opacos) que comparten la
+        memoria del archivo: no se copian al crearlas."""
+        mode = "RGBA" if self.alpha else "RGBX"
+        return [Image.frombuffer(mode, self.size, a, "raw", mode, 0, 1) for a in self.arrays()]
@@ -0,0 +1,68 @@
+# sprites.py
+# Halos y brillos precalculados: se dibujan una vez, recortados a su
+# bounding box, y se componen solo en esa zona del frame (no en todo el lienzo).
+#
+# Las imágenes devueltas están en caché: no se deben modificar.
+
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from .instrument import probe
+
+
+@lru_cache(maxsize=512)
+def rounded_halo(w, h, radius, color, max_expand, steps, alpha):
+    """Halo de rectángulos redondeados concéntricos alrededor de una caja w x h.
+
+    La caja queda en (max_expand, max_expand) dentro del sprite; cada anillo
+    crece max_expand/steps y pierde opacidad hacia afuera."""
+    me = max_expand
+    im = Image.new("RGBA", (w + 2 * me + 1, h + 2 * me + 1), (0, 0, 0, 0))
+    d = ImageDraw.Draw(im, "RGBA")
+    for i in range(steps):
+        expand = int(me * (i + 1) / steps)
+        a = int(alpha * (1 - i / steps))
+        d.rounded_rectangle([me - expand, me - expand, me + w + expand, me + h + expand],
+                            radius=radius + expand, fill=(*color[:3], a))
+    return im
+
+
+@lru_cache(maxsize=512)
+def ellipse_stack(rings):
+    """Círculos concéntricos dibujados en orden; rings = ((radio, rgba), ...).
+    El centro queda en (R, R), con R el radio mayor."""
+    R = max(r for r, _ in rings)
+    im = Image.new("RGBA", (2 * R + 1, 2 * R + 1), (0, 0, 0, 0))
+    d = ImageDraw.Draw(im, "RGBA")
+    for r, fill in rings:
+        d.ellipse([R - r, R - r, R + r, R + r], fill=fill)
+    return im
+
+
+@lru_cache(maxsize=512)
+def ring_glow(r, color, width, blur):
+    """Aro de radio r desenfocado (GaussianBlur), con margen para que el
+    desenfoque no se corte. El centro queda en (R, R)."""
+    R = r + width + 3 * int(blur + 1)
+    im = Image.new("RGBA", (2 * R + 1, 2 * R + 1), (0, 0, 0, 0))
+    ImageDraw.Draw(im).ellipse([R - r, R - r, R + r, R + r], outline=color, width=width)
+    return im.filter(ImageFilter.GaussianBlur(blur))
+
+
+@probe("composite_at", phase="composite", area=lambda im, sprite, *a: sprite.width * sprite.height)
+def composite_at(im, sprite, x, y):
+    """alpha_composite de `sprite` en (x, y), recortado a los bordes de `im`."""
+    sx, sy = max(0, -x), max(0, -y)
+    x, y = max(0, x), max(0, y)
+    w = min(sprite.width - sx, im.width - x)
+    h = min(sprite.height - sy, im.height - y)
+    if w <= 0 or h <= 0:
+        return
+    im.alpha_composite(sprite, (x, y), (sx, sy, sx + w, sy + h))
+
+
+def composite_centered(im, sprite, cx, cy):
+    """Compone un sprite cuadrado de centro (R, R) con ese centro en (cx, cy)."""
+    R = sprite.width // 2
+    composite_at(im, sprite, cx - R, cy - R)
@@ -0,0 +1,95 @@
+# spritestore.py
+# Caché LRU de imágenes de entrada ya decodificadas (emojis, PNG sueltos).
+# Cada archivo se abre y convierte a RGBA una vez por build, y cada tamaño
+# se remuestrea una sola vez; las animaciones con zoom piden una "escalera"
+# de tamaños precalculada en vez de hacer resize(LANCZOS) en cada frame.
+#
+# Si hay un atlas (atlas.py), las claves que tenga se recortan de su hoja
+# en vez de abrir un PNG por sprite.
+#
+# Las imágenes devueltas están en caché: no se deben modificar.
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from PIL import Image
+
+MAXSIZE = 512
+
+StoreInfo = namedtuple("StoreInfo", "hits misses currsize maxsize")
+
+
+class SpriteStore:
+    """Sprites por (clave, tamaño, resample), con desalojo LRU.
+
+    `resolve(clave)` devuelve la ruta del archivo (o None si no hay); por
+    defecto la clave ya es la ruta. `atlas.sprite(clave)`, si se pasa, se
+    prueba antes que el archivo."""
+
+    def __init__(self, resolve=None, maxsize=MAXSIZE, atlas=None):
+        self.resolve = resolve or (lambda key: key)
+        self.atlas = atlas
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _get(self, key, make):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        im = make()
+        with self._lock:
+            self._items[key] = im
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return im
+
+    def decoded(self, key):
+        """Imagen original en RGBA (o None)."""
+        def load():
+            im = self.atlas.sprite(key) if self.atlas is not None else None
+            if im is not None:
+                return im
+            path = self.resolve(key)
+            if not path:
+                return None
+            with Image.open(path) as im:
+                return im.convert("RGBA")
+        return self._get((key, None, None), load)
+
+    def thumb(self, key, size, resample=Image.LANCZOS):
+        """Reducida para caber en size x size (como Image.thumbnail: nunca agranda)."""
+        def make():
+            src = self.decoded(key)
+            if src is None:
+                return None
+            im = src.copy()
+            im.thumbnail((size, size), resample)
+            return im
+        return self._get((key, size, resample), make)
+
+    def scaled(self, key, size, wh, resample=Image.LANCZOS):
+        """thumb(key, size) llevada a wh = (ancho, alto)."""
+        def make():
+            base = self.thumb(key, size, resample)
+            if base is None:
+                return None
+            return base if base.size == tuple(wh) else base.resize(tuple(wh), resample)
+        return self._get((key, (size, tuple(wh)), resample), make)
+
+    def ladder(self, key, size, whs, resample=Image.LANCZOS):
+        """Escalera de tamaños para un zoom: [scaled(key, size, wh) for wh in whs]."""
+        return [self.scaled(key, size, wh, resample) for wh in whs]
+
+    def info(self):
+        return StoreInfo(self.hits, self.misses, len(self._items), self.maxsize)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
@@ -0,0 +1,102 @@
+# text.py
+# Medidas de texto y cortes de línea con caché LRU: un título que se
+# dibuja en cada frame se mide una sola vez por proceso.
+#
+#   text_bbox("3. Repite", font)               -> (x0, y0, x1, y1) como textbbox en (0, 0)
+#   layout(BODY, font, max_width=440).lines    -> líneas cortadas por palabras
+#
+# Las fuentes salen de load_font (siempre el mismo objeto por tamaño y
+# lista), así que sirven como clave de la caché.
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+MEASURE_CACHE = 4096
+LAYOUT_CACHE = 512
+
+
+@lru_cache(maxsize=None)
+def _scratch(fontmode):
+    # Un ImageDraw de 1x1 por modo de fuente ("L" con antialias, "1" sin):
+    # textbbox no depende del tamaño ni del contenido de la imagen.
+    return ImageDraw.Draw(Image.new("1" if fontmode == "1" else "L", (1, 1)))
+
+
+@lru_cache(maxsize=MEASURE_CACHE)
+def text_bbox(text, font, fontmode="L"):
+    """Lo mismo que ImageDraw.textbbox((0, 0), text, font=font)."""
+    return _scratch(fontmode).textbbox((0, 0), text, font=font)
+
+
+def text_size(text, font, fontmode="L"):
+    x0, y0, x1, y1 = text_bbox(text, font, fontmode)
+    return x1 - x0, y1 - y0
+
+
+@lru_cache(maxsize=MEASURE_CACHE)
+def _advance(text, font):
+    return font.getlength(text)
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    lines: tuple             # texto de cada línea
+    bboxes: tuple            # textbbox de cada línea en (0, 0)
+
+    @property
+    def sizes(self):
+        return [(b[2] - b[0], b[3] - b[1]) for b in self.bboxes]
+
+    @property
+    def width(self):
+        return max((w for w, _ in self.sizes), default=0)
+
+    @property
+    def height(self):
+        return sum(h for _, h in self.sizes)
+
+
+def _wrap(words, font, max_width, fontmode):
+    """Corte voraz por palabras: cada línea suma palabras mientras su ancho
+    (textbbox) no pase de `max_width`; una palabra sola nunca se corta.
+    El ancho de cada prefijo se estima sumando avances de palabras ya
+    medidas y solo se mide de verdad cerca del límite: lineal en la
+    cantidad de palabras, no cuadrático."""
+    # Margen de la estimación: bordes de los glifos y kerning entre palabras.
+    margin = getattr(font, "size", 16)
+    space = _advance(" ", font)
+    lines, line, est = [], "", 0.0
+    for w in words:
+        if not line:
+            line, est = w, _advance(w, font)
+            continue
+        guess = est + space + _advance(w, font)
+        if guess + margin < max_width:
+            fits = True
+        elif guess - margin > max_width:
+            fits = False
+        else:
+            test = line + " " + w
+            x0, _, x1, _ = text_bbox(test, font, fontmode)
+            fits = x1 - x0 <= max_width
+        if fits:
+            line, est = line + " " + w, guess
+        else:
+            lines.append(line)
+            line, est = w, _advance(w, font)
+    if line:
+        lines.append(line)
+    return lines
+
+
+@lru_cache(maxsize=LAYOUT_CACHE)
+def layout(text, font, max_width=None, fontmode="L"):
+    """Líneas de `text` (cortadas por palabras si hay `max_width`) con sus
+    medidas. Cacheado por (texto, fuente, ancho)."""
+    if max_width is None:
+        lines = text.split("\n")
+    else:
+        lines = [ln for par in text.split("\n") for ln in _wrap(par.split(), font, max_width, fontmode)]
+    return TextLayout(tuple(lines), tuple(text_bbox(ln, font, fontmode) for ln in lines))
@@ -0,0 +1,162 @@
+# timeline.py
+# Línea de tiempo declarativa para los tutoriales: en vez de armar los
+# frames con bucles (`for k in range(per_click)`, `hold`, `fade_frames`...),
+# cada paso describe sus pistas (tracks) con keyframes y curvas de easing,
+# y un intérprete dibuja los frames.
+#
+#   tl = Timeline()
+#   tl.hold(5, cell=None)                               # 5 frames quietos
+#   tl.tween(12, pointer=((70, 90), (250, 160)), ease=ease)   # de A a B
+#   tl.tween(6, alpha=(None, 0))                        # del valor actual a 0
+#   frames = render_timeline(tl, Layer(board, ("title",)), Layer(draw_pointer, ("pointer",)))
+#
+# El intérprete solo vuelve a dibujar las capas cuyas pistas cambiaron:
+# las de abajo se reutilizan y, si no cambió nada, el frame es el mismo
+# objeto que el anterior (el spool lo junta con el previo sin convertirlo).
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+
+# ---------- easing ----------
+
+def linear(t):
+    return t
+
+
+def ease(t):
+    """Entrada y salida suaves (coseno)."""
+    return 0.5 - 0.5 * math.cos(math.pi * t)
+
+
+def lerp(a, b, t):
+    """Interpola números o tuplas de números (posiciones, colores)."""
+    if isinstance(a, tuple):
+        return tuple(lerp(x, y, t) for x, y in zip(a, b))
+    return a + (b - a) * t
+
+
+# ---------- pistas ----------
+
+@dataclass
+class Key:
+    frame: int
+    value: object
+    ease: object = None       # curva hasta el próximo keyframe (None = salto)
+
+
+@dataclass
+class Track:
+    """Valor que cambia en el tiempo. Entre dos keyframes se mantiene el
+    valor del primero o, si tiene `ease`, se interpola hasta el segundo."""
+    keys: list = field(default_factory=list)
+
+    def set(self, frame, value, ease=None):
+        i = bisect_right([k.frame for k in self.keys], frame)
+        if i and self.keys[i - 1].frame == frame:
+            self.keys[i - 1] = Key(frame, value, ease)
+        else:
+            self.keys.insert(i, Key(frame, value, ease))
+
+    def at(self, frame):
+        i = bisect_right([k.frame for k in self.keys], frame) - 1
+        if i < 0:
+            return None
+        key = self.keys[i]
+        if key.ease is None or i + 1 == len(self.keys) or key.frame == frame:
+            return key.value
+        nxt = self.keys[i + 1]
+        return lerp(key.value, nxt.value, key.ease((frame - key.frame) / (nxt.frame - key.frame)))
+
+
+class Timeline:
+    """Pistas con nombre sobre frames numerados desde 0. Los segmentos se
+    agregan en orden; una pista que un segmento no menciona conserva su valor."""
+
+    def __init__(self, **initial):
+        self.tracks = {}
+        self.length = 0
+        for name, value in initial.items():
+            self.track(name).set(0, value)
+
+    def track(self, name):
+        return self.tracks.setdefault(name, Track())
+
+    def hold(self, n, **values):
+        """`n` frames con las pistas indicadas fijas en esos valores."""
+        for name, value in values.items():
+            self.track(name).set(self.length, value)
+        self.length += n
+        return self
+
+    def tween(self, n, ease=linear, **values):
+        """`n` frames interpolando cada pista con la curva `ease`.
+        pista=(desde, hasta) va de `desde` (primer frame) a `hasta` (último);
+        pista=(None, hasta) sale del valor que tenía la pista en el frame
+        anterior y ya se mueve en el primero (como un fundido de salida); si
+        la pista no tiene valor ahí es un error (ValueError)."""
+        if n <= 0:
+            return self
+        start, end = self.length, self.length + n - 1
+        for name, (a, b) in values.items():
+            track = self.track(name)
+            if a is None:
+                prev = track.at(start - 1)
+                if prev is None:
+                    raise ValueError(f"tween: la pista {name!r} no tiene valor en el frame "
+                                     f"{start - 1} para salir de él; usa {name}=(desde, hasta)")
+                track.set(start - 1, prev, ease)
+            elif n > 1:
+                track.set(start, a, ease)
+            track.set(end, b)
+        self.length += n
+        return self
+
+    def state(self, frame):
+        return {name: t.at(frame) for name, t in self.tracks.items()}
+
+    def states(self):
+        for f in range(self.length):
+            yield self.state(f)
+
+    def __len__(self):
+        return self.length
+
+
+
+# ---------- intérprete ----------
+
+@dataclass(frozen=True)
+class Layer:
+    """Capa de un frame: draw(im, **pistas) dibuja sobre `im` usando solo
+    las pistas de `deps`. La primera capa del render no recibe imagen:
+    draw(**pistas) devuelve el fondo (p. ej. una función @static_layer)."""
+    draw: object
+    deps: tuple = ()
+
+
+def render_timeline(timeline, base, *layers):
+    """Genera un frame por paso de `timeline`. Cada capa se vuelve a dibujar
+    solo si cambió alguna de sus pistas o de las capas de abajo; lo demás se
+    reutiliza. Los frames no se deben modificar: pueden ser el mismo objeto
+    que el anterior o una imagen guardada para el próximo."""
+    stack = (base, *layers)
+    cache = [None] * len(stack)        # por nivel: (valores de las pistas, imagen)
+    for state in timeline.states():
+        keys = []
+        for layer in stack:
+            keys.append((*(keys[-1] if keys else ()), *(state[d] for d in layer.deps)))
+        level = 0
+        while level < len(stack) and cache[level] is not None and cache[level][0] == keys[level]:
+            level += 1
+        for i in range(level, len(stack)):
+            layer = stack[i]
+            args = {d: state[d] for d in layer.deps}
+            if i == 0:
+                im = layer.draw(**args)
+            else:
+                im = cache[i - 1][1].copy()
+                layer.draw(im, **args)
+            cache[i] = (keys[i], im)
+        yield cache[-1][1]
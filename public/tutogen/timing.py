@@ -0,0 +1,99 @@
+# timing.py
+# Tiempos por fase del render (dibujo, composición, cuantización, codificación)
+# para el benchmark. Sin un PhaseTimer activo, phase() y count() no hacen
+# nada, así que pueden quedar en el código de los generadores y de tutogen.
+#
+#   with PhaseTimer() as t:
+#       make_step1()
+#   t.totals   -> {"draw": 0.41, "composite": 0.12, "quantize": 0.30, "encode": 0.22}
+#
+# Los tiempos son exclusivos: una fase anidada descuenta su tiempo de la
+# que la contiene. Lo que no está marcado cuenta como "draw".
+# Cada hilo lleva su propia pila de fases (pipeline.py): con el pipeline
+# las fases se solapan y su suma puede pasar del tiempo total.
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+PHASES = ("draw", "composite", "quantize", "encode")
+DEFAULT_PHASE = "draw"
+
+_active = None          # PhaseTimer en curso (uno por proceso)
+_NULL = nullcontext()
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._local = threading.local()     # por hilo: stack y mark
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        local = self._local
+        if not hasattr(local, "stack"):
+            local.stack, local.mark = [], None
+        return local.stack
+
+    def _switch(self, name):
+        now = time.perf_counter()
+        stack = self._stack
+        if stack:
+            with self._lock:
+                self.totals[stack[-1]] += now - self._local.mark
+        self._local.mark = now
+        if name is not None:
+            stack.append(name)
+
+    @contextmanager
+    def phase(self, name):
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(None)
+            self._stack.pop()
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("ya hay un PhaseTimer activo")
+        _active = self
+        self._switch(DEFAULT_PHASE)
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self._switch(None)
+        self._stack.clear()
+        _active = None
+
+    def result(self):
+        return {p: self.totals.get(p, 0.0) for p in (*PHASES, *sorted(set(self.totals) - set(PHASES)))}
+
+
+def phase(name):
+    """Contexto que cuenta su tiempo en la fase `name` (si hay un timer activo)."""
+    return _active.phase(name) if _active is not None else _NULL
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.counts[name] += n
+
+
+def timed(name):
+    """Decorador: todo el tiempo de la función cuenta en la fase `name`."""
+    def deco(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return deco
@@ -0,0 +1,219 @@
+# watch.py
+# Modo watch para iterar el diseño: mira los generadores, tutogen/, los
+# archivos que declara cada salida (`inputs`) y las fuentes que usa, y
+# ante un cambio regenera solo las salidas afectadas. Vite recarga el
+# GIF solo (los archivos se escriben con tmp + os.replace).
+#
+#   python public/build_tutos.py watch            # todo
+#   python public/build_tutos.py watch matriz     # solo un juego
+#
+# Qué salidas dependen de qué se decide con el mismo hash de entradas del
+# manifiesto (manifest.output_hash): después de recargar un generador se
+# recalculan los hashes y se regeneran las salidas cuyo hash cambió.
+#
+# Las salidas se generan en un pool de procesos que queda abierto (Pillow,
+# NumPy, fuentes y emojis ya cargados); cada worker recarga los módulos
+# generadores que cambiaron antes de generar. Si cambia un archivo de
+# entrada, el worker recarga el módulo de las salidas afectadas (sus capas
+# y emojis en memoria) y, si es una fuente, vacía la caché de fuentes; el
+# pool solo se reinicia si cambia tutogen/ (y con él todo el proceso).
+
+import importlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from . import fonts
+from .formats import save_media_index, variant_paths
+from .manifest import is_fresh, load_manifest, make_entry, output_fonts, output_hash, save_manifest
+from .parallel import _run_output, _worker_init, default_jobs
+from .registry import GENERATORS, load_generators, outputs
+
+POLL = 0.25               # segundos entre revisiones
+SETTLE = 0.05             # espera a que el editor termine de escribir
+_TUTOGEN = os.path.dirname(os.path.abspath(__file__))
+
+# En cada worker: versión con la que se importó cada módulo generador, y
+# de las fuentes.
+_loaded = {}
+_fonts_version = [0]
+
+
+def _module_file(name):
+    return os.path.abspath(sys.modules[name].__file__)
+
+
+def _stat(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _inputs(selected):
+    """Archivos de entrada declarados por las salidas."""
+    files = set()
+    for o in selected:
+        files |= set(map(os.path.abspath, o.inputs() if o.inputs else ()))
+    return files
+
+
+def _code():
+    gens = {_module_file(m): m for m in GENERATORS}
+    lib = {os.path.join(_TUTOGEN, f) for f in os.listdir(_TUTOGEN) if f.endswith(".py")}
+    return gens, lib
+
+
+def _snapshot(paths):
+    return {p: _stat(p) for p in paths}
+
+
+def _changed(old, new):
+    return {p for p in old.keys() | new.keys() if old.get(p) != new.get(p)}
+
+
+def _worker_start(stamps):
+    # Los módulos del worker son los del proceso principal al crear el pool.
+    _worker_init()
+    _loaded.update(stamps)
+    load_generators()
+
+
+def _worker_render(name, stamps, fonts_version):
+    """En el worker: recarga los generadores con otra versión y genera `name`."""
+    if _fonts_version[0] != fonts_version:
+        fonts.clear_cache()
+        _fonts_version[0] = fonts_version
+    for m, stamp in stamps.items():
+        if _loaded.get(m) != stamp:
+            importlib.reload(sys.modules[m])
+            _loaded[m] = stamp
+    _run_output(name)
+    return name
+
+
+class Watcher:
+    def __init__(self, names=None, jobs=None, poll=POLL):
+        self.names = names
+        self.jobs = jobs or default_jobs()
+        self.poll = poll
+        self.pool = None
+        load_generators()
+        self.gens, self.lib = _code()
+        # Versión de cada módulo generador: (mtime, cambios de entradas).
+        self.stamps = {m: (_stat(f), 0) for f, m in self.gens.items()}
+        self.fonts_version = 0
+        self.selected = outputs(names)
+        self.fonts = self._fonts()
+        self.digests = {o.name: output_hash(o) for o in self.selected}
+        self.entries = load_manifest()
+
+    def _fonts(self):
+        return set().union(*(output_fonts(o) for o in self.selected))
+
+    def _files(self):
+        return set(self.gens) | self.lib | _inputs(self.selected) | self.fonts
+
+    def _start_pool(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_worker_start,
+                                        initargs=(dict(self.stamps),))
+        # Arranca los workers ya: el initializer importa y carga todo.
+        for _ in range(self.jobs):
+            self.pool.submit(int)
+
+    def render(self, outs):
+        """Genera `outs` en el pool; las que fallan se informan y quedan
+        marcadas para reintentar en el próximo cambio."""
+        if not outs:
+            return
+        t0 = time.perf_counter()
+        futures = [(o, self.pool.submit(_worker_render, o.name, self.stamps, self.fonts_version))
+                   for o in outs]
+        ok = 0
+        for o, fut in futures:
+            try:
+                fut.result()
+            except Exception:
+                print(f"❌ {o.name}:", file=sys.stderr)
+                traceback.print_exc()
+                self.digests[o.name] = None
+                continue
+            self.entries[o.name] = make_entry(o, self.digests[o.name], variant_paths(o.path))
+            ok += 1
+        save_manifest(self.entries)
+        save_media_index(self.entries)
+        print(f"🔁 {ok}/{len(outs)} generadas en {time.perf_counter() - t0:.2f}s")
+
+    def _reload(self, modules):
+        for m in modules:
+            importlib.reload(sys.modules[m])
+            self.stamps[m] = (_stat(_module_file(m)), self.stamps[m][1])
+        self.selected = outputs(self.names)
+        self.fonts = self._fonts()
+
+    def step(self, changed):
+        """Atiende un lote de archivos cambiados."""
+        if changed & self.lib:
+            print("↻ cambió tutogen/, reiniciando…")
+            self.pool.shutdown(cancel_futures=True)
+            os.execv(sys.executable, [sys.executable, *sys.argv])
+        modules = [self.gens[p] for p in changed if p in self.gens]
+        try:
+            self._reload(modules)
+        except Exception:
+            traceback.print_exc()
+            return
+        if changed & self.fonts:
+            fonts.clear_cache()
+            self.fonts_version += 1
+        old = self.digests
+        self.digests = {o.name: output_hash(o) for o in self.selected}
+        stale = [o for o in self.selected if self.digests[o.name] != old.get(o.name)]
+        if changed - set(self.gens):
+            # Cambió una entrada: los workers recargan el módulo de las
+            # salidas afectadas para no usar capas o emojis viejos.
+            for m in {o.func.__module__ for o in stale} & set(self.stamps):
+                mtime, n = self.stamps[m]
+                self.stamps[m] = (mtime, n + 1)
+        self.render(stale)
+
+    def run(self):
+        self._start_pool()
+        stale = [o for o in self.selected
+                 if not is_fresh(o, self.digests[o.name], self.entries, variant_paths(o.path))]
+        self.render(stale)
+        snap = _snapshot(self._files())
+        print(f"👀 mirando {len(self.selected)} salidas ({len(snap)} archivos); Ctrl+C para salir")
+        try:
+            while True:
+                time.sleep(self.poll)
+                new = _snapshot(self._files())
+                changed = _changed(snap, new)
+                if not changed:
+                    continue
+                # Que termine de escribirse (algunos editores guardan en dos pasos).
+                while True:
+                    time.sleep(SETTLE)
+                    settled = _snapshot(new)
+                    if settled == new:
+                        break
+                    changed |= _changed(new, settled)
+                    new = settled
+                names = sorted(os.path.basename(p) for p in changed)
+                print("✏️ ", ", ".join(names[:5]), "…" if len(names) > 5 else "")
+                self.step(changed)
+                # Los archivos nuevos (p. ej. otro emoji en `inputs`) entran
+                # con su mtime actual; lo que cambió durante el render, no.
+                snap = {**_snapshot(self._files()), **new}
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def watch(names=None, jobs=None, poll=POLL):
+    Watcher(names, jobs, poll).run()
@@ -0,0 +1,19 @@
+// src/components/EmojiSprite/EmojiSprite.jsx
+import React from "react";
+import { useEmojiAtlas, emojiSpriteStyle } from "../../utils/emojiAtlas";
+
+/**
+ * Emoji dibujado desde un atlas (public/emoji/atlas/<atlas>.json).
+ * Mide 1em x 1em: se ajusta con el font-size del contenedor, como el texto.
+ * Mientras el atlas carga, o si el emoji no está, se muestra como texto.
+ *
+ * Props:
+ * - emoji: string
+ * - atlas: nombre del atlas (p. ej. "recuerda", "safari")
+ */
+export default function EmojiSprite({ emoji, atlas, className }) {
+  const data = useEmojiAtlas(atlas);
+  const style = emojiSpriteStyle(data, emoji);
+  if (!style) return <span className={className}>{emoji}</span>;
+  return <span className={className} style={style} role="img" aria-label={emoji} />;
+}
@@ -1,6 +1,43 @@
 // src/components/Instrucciones/Instrucciones.jsx
 import React, { useEffect, useMemo, useState, useCallback } from "react";
 import styles from "./Instrucciones.module.css";
+import { useTutoSources } from "../../utils/tutoMedia";
+import { useResponsiveImage, pickVariant } from "../../utils/responsiveImages";
+
+// GIF del tutorial con sus variantes WebP/AVIF (ver public/build_tutos.py):
+// el navegador toma el primer <source> que soporte y si no, el GIF.
+function TutoImage({ media }) {
+  const sources = useTutoSources(media.src);
+  const images = sources.filter((s) => s.kind === "image");
+  const videos = sources.filter((s) => s.kind === "video");
+
+  if (!images.length && videos.length) {
+    return (
+      <video className={styles.tutoVideo} autoPlay loop muted playsInline aria-label={media.alt || undefined}>
+        {videos.map((s) => (
+          <source key={s.src} src={s.src} type={s.type} />
+        ))}
+        <img className={styles.tutoImg} src={media.src} alt={media.alt || ""} />
+      </video>
+    );
+  }
+
+  return (
+    <picture>
+      {images.map((s) => (
+        <source key={s.src} srcSet={s.src} type={s.type} />
+      ))}
+      <img className={styles.tutoImg} src={media.src} alt={media.alt || ""} />
+    </picture>
+  );
+}
+
+// Ancho en px con que se dibuja la imagen del hero (--hero-image-size, 850px por defecto).
+function heroWidth(size) {
+  const px = parseInt(size, 10);
+  const dpr = typeof window !== "undefined" ? window.devicePixelRatio || 1 : 1;
+  return (Number.isFinite(px) && String(size).trim().endsWith("px") ? px : 850) * dpr;
+}
 
 /**
  * Props esperadas:
@@ -30,6 +67,13 @@ export default function Instrucciones({
 
   tutorial, 
 }) {
+  // Variante WebP del tamaño justo (public/build_images.py); mientras carga
+  // el índice no se pone fondo, así no se baja también el PNG original.
+  const heroEntry = useResponsiveImage(heroImage);
+  const heroUrl = heroEntry === undefined
+    ? null
+    : pickVariant(heroEntry, heroWidth(heroImageSize)) ?? heroImage;
+
   // ===== Mini-tutorial (por juego) =====
   const tutorialKey = useMemo(() => {
     if (!tutorial?.gameId) return null;
@@ -114,7 +158,7 @@ export default function Instrucciones({
         className={styles.hero}
         style={{
           "--hero-bg": background,
-          "--hero-image": `url(${heroImage})`,
+          "--hero-image": heroUrl === null ? "none" : `url(${heroUrl})`,
           "--hero-image-size": heroImageSize,
         }}
       >
@@ -183,7 +227,7 @@ export default function Instrucciones({
                         </div>
                       ) : step.media?.src ? (
                         <div className={styles.tutorialMedia}>
-                          <img className={styles.tutoImg} src={step.media.src} alt={step.media.alt || ""} />
+                          <TutoImage media={step.media} />
                         </div>
                       ) : null}
                     </>
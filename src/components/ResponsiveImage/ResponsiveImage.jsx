@@ -0,0 +1,27 @@
+// src/components/ResponsiveImage/ResponsiveImage.jsx
+import React from "react";
+import { useResponsiveImage } from "../../utils/responsiveImages";
+
+/**
+ * <img> con las variantes de public/build_images.py: el navegador elige
+ * formato (AVIF/WebP) y ancho según `sizes`. Sin variantes, es un <img> común.
+ *
+ * Props: src, alt, sizes, className, loading, ...resto para el <img>
+ */
+export default function ResponsiveImage({ src, alt = "", sizes = "100vw", ...imgProps }) {
+  const entry = useResponsiveImage(src);
+
+  // Sin src mientras carga el índice: así no se baja también el PNG grande.
+  if (entry === undefined) return <img alt={alt} {...imgProps} />;
+  if (!entry) return <img src={src} alt={alt} {...imgProps} />;
+
+  // display: contents -> el <img> sigue siendo hijo directo del contenedor (flex/grid).
+  return (
+    <picture style={{ display: "contents" }}>
+      {entry.sources.map((s) => (
+        <source key={s.type} type={s.type} srcSet={s.srcset} sizes={sizes} />
+      ))}
+      <img src={src} alt={alt} width={entry.width} height={entry.height} {...imgProps} />
+    </picture>
+  );
+}
@@ -3,6 +3,7 @@ import React, { useEffect, useRef, useState, useCallback } from 'react';
 
 import styles from './RecuerdaLosObjetos.module.css';
 import PauseMenu from '../../components/MenuJuego/PauseMenu';
+import EmojiSprite from '../../components/EmojiSprite/EmojiSprite';
 import { playSound, sounds } from '../../utils/sounds';
 
 // --- Importa Banco de Objetos ---
@@ -415,7 +416,7 @@ useEffect(() => {
                 {gameState === GAME_STATE.SHOWING && (
                   <div className={styles.sequenceViewer}>
                     {currentObject
-                      ? <span className={styles.emoji}>{currentObject}</span>
+                      ? <span className={styles.emoji}><EmojiSprite emoji={currentObject} atlas="recuerda" /></span>
                       : <span className={styles.placeholder}>+</span>}
                   </div>
 
@@ -442,7 +443,7 @@ useEffect(() => {
                             disabled={paused || gameState !== GAME_STATE.WAITING || isClicked}
                             type="button"
                           >
-                            <span className={styles.emoji}>{obj}</span>
+                            <span className={styles.emoji}><EmojiSprite emoji={obj} atlas="recuerda" /></span>
                           </button>
                         );
                       })}
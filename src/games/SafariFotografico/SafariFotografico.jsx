@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback, useRef } from 'react';
 import styles from './SafariFotografico.module.css';
 import PauseMenu from '../../components/MenuJuego/PauseMenu'; 
+import EmojiSprite from '../../components/EmojiSprite/EmojiSprite';
 import { playSound, sounds } from '../../utils/sounds';
 import { SAFARI_TARGETS, SAFARI_DISTRACTORS } from '../../data/objects';
 
@@ -177,7 +178,7 @@ export default function SafariFotografico({ onGameOver }) {
             className={`${styles.animal} ${styles[currentAnimal.type]}`}
             style={{ left: `${currentAnimal.pos.x}%`, top: `${currentAnimal.pos.y}%` }}
           >
-            {currentAnimal.emoji}
+            <EmojiSprite emoji={currentAnimal.emoji} atlas="safari" />
           </div>
         )}
       </div>
@@ -4,6 +4,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { api } from '../api';
 import styles from './GameList.module.css';
+import ResponsiveImage from '../components/ResponsiveImage/ResponsiveImage';
 
 // Función helper para convertir texto a un formato de URL amigable
 const slugify = (text = '') => {
@@ -174,6 +175,10 @@ function GameListPage() {
   // Esta será la imagen si un juego NO está en el mapa de arriba
   const FALLBACK_IMAGE = '/portada/default-cover.png'; //
 
+  // Ancho aprox. de la portada en la tarjeta (68% de una columna de ~300-420px),
+  // para que el navegador elija la variante justa (ver public/build_images.py).
+  const CARD_IMAGE_SIZES = '(max-width: 640px) 68vw, 290px';
+
   /* ============================
    *  Render de Sección
    * ============================ */
@@ -217,10 +222,11 @@ function GameListPage() {
 
                 {/* 3. IMAGEN (MOVIDA AQUÍ) */}
                 <div className={styles.cardImageContainer}>
-                  <img
+                  <ResponsiveImage
                     src={IMAGE_MAP[gameCode] || FALLBACK_IMAGE}
                     alt={`Portada de ${game.name}`}
                     className={styles.cardImage}
+                    sizes={CARD_IMAGE_SIZES}
                     loading="lazy" 
                   />
                 </div>
@@ -0,0 +1,86 @@
+// src/utils/emojiAtlas.js
+// Atlas de emojis: los Twemoji de cada juego en pocas hojas + un índice JSON
+// (ver public/build_emoji_atlas.py):
+//   /emoji/atlas/<nombre>.json -> { cell, sheets: [{ src, webp, width, height }],
+//                                   sprites: { "🍎": [hoja, x, y, ancho, alto] } }
+// Una descarga por atlas en vez de un PNG por emoji. Si el índice no existe
+// o falla, se muestra el emoji como texto.
+
+import { useEffect, useState } from "react";
+
+const ATLAS_BASE = "/emoji/atlas/";
+const FE0F = /\uFE0F/g;
+
+let _webp = null;       // el navegador decodifica WebP (se mira una vez)
+
+const _atlases = {};    // nombre -> atlas ya cargado (o null si falló)
+const _pending = {};    // nombre -> promesa de carga (una sola vez por página)
+
+function _supportsWebp() {
+  if (_webp === null) {
+    try {
+      const canvas = document.createElement("canvas");
+      _webp = canvas.toDataURL("image/webp").startsWith("data:image/webp");
+    } catch {
+      _webp = false;
+    }
+  }
+  return _webp;
+}
+
+function _prepare(json) {
+  if (!json?.sprites) return null;
+  // Mismo emoji con o sin selector de variación (🌶️ / 🌶)
+  const plain = {};
+  for (const [key, rect] of Object.entries(json.sprites)) plain[key.replace(FE0F, "")] = rect;
+  return { ...json, plain };
+}
+
+export function loadEmojiAtlas(name) {
+  if (name in _atlases) return Promise.resolve(_atlases[name]);
+  if (!_pending[name]) {
+    _pending[name] = fetch(`${ATLAS_BASE}${name}.json`)
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null)
+      .then((json) => (_atlases[name] = _prepare(json)));
+  }
+  return _pending[name];
+}
+
+// Atlas `name` o null mientras carga (o si no existe).
+export function useEmojiAtlas(name) {
+  const [atlas, setAtlas] = useState(() => _atlases[name] ?? null);
+
+  useEffect(() => {
+    let alive = true;
+    loadEmojiAtlas(name).then((a) => {
+      if (alive) setAtlas(a);
+    });
+    return () => {
+      alive = false;
+    };
+  }, [name]);
+
+  return atlas;
+}
+
+// Estilo CSS para dibujar `emoji` desde el atlas en una caja de 1em x 1em
+// (escala con el font-size del contenedor), o null si no está.
+export function emojiSpriteStyle(atlas, emoji) {
+  if (!atlas || !emoji) return null;
+  const rect = atlas.sprites[emoji] ?? atlas.plain[emoji.replace(FE0F, "")];
+  if (!rect) return null;
+  const [i, x, y, w, h] = rect;
+  const sheet = atlas.sheets[i];
+  const src = sheet.webp && _supportsWebp() ? sheet.webp : sheet.src;
+  return {
+    display: "inline-block",
+    width: "1em",
+    height: "1em",
+    verticalAlign: "-0.1em",
+    backgroundImage: `url("${src}")`,
+    backgroundRepeat: "no-repeat",
+    backgroundSize: `${sheet.width / w}em ${sheet.height / h}em`,
+    backgroundPosition: `${-x / w}em ${-y / h}em`,
+  };
+}
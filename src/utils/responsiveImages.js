@@ -0,0 +1,67 @@
+// src/utils/responsiveImages.js
+// Variantes redimensionadas (AVIF/WebP en varios anchos) de portadas,
+// presentaciones y arte de personajes. El índice lo genera
+// public/build_images.py en /img/images.json:
+//   { "/Portada/AFin.png": { width, height, sources: [{ type, srcset }, ...] } }
+// Si no existe o falla, se usa el PNG original.
+
+import { useEffect, useState } from "react";
+
+const IMAGES_INDEX_URL = "/img/images.json";
+
+let _index = null;      // índice ya cargado (claves en minúsculas)
+let _pending = null;    // promesa de carga (una sola vez por página)
+
+// Las rutas del código no siempre respetan mayúsculas ("/portada/Afin.png"
+// vs. public/Portada/AFin.png): se buscan sin distinguirlas.
+const _key = (src) => (src ? decodeURI(src).toLowerCase() : "");
+
+function _loadIndex() {
+  if (_index) return Promise.resolve(_index);
+  if (!_pending) {
+    _pending = fetch(IMAGES_INDEX_URL)
+      .then((res) => (res.ok ? res.json() : {}))
+      .catch(() => ({}))
+      .then((json) => {
+        _index = {};
+        for (const [src, entry] of Object.entries(json || {})) _index[_key(src)] = entry;
+        return _index;
+      });
+  }
+  return _pending;
+}
+
+// Entrada del índice para `src` ({ width, height, sources }), null si no
+// tiene variantes, o undefined mientras el índice carga.
+export function useResponsiveImage(src) {
+  const [entry, setEntry] = useState(() => (!src ? null : _index ? _index[_key(src)] ?? null : undefined));
+
+  useEffect(() => {
+    if (!src) {
+      setEntry(null);
+      return;
+    }
+    let alive = true;
+    _loadIndex().then((index) => {
+      if (alive) setEntry(index[_key(src)] ?? null);
+    });
+    return () => {
+      alive = false;
+    };
+  }, [src]);
+
+  return entry;
+}
+
+// URL de la variante `type` más chica que cubra `width` px (o la más grande),
+// para usos sin srcset (p. ej. background-image). null si no hay.
+export function pickVariant(entry, width, type = "image/webp") {
+  const source = entry?.sources?.find((s) => s.type === type);
+  if (!source) return null;
+  const candidates = source.srcset.split(",").map((c) => {
+    const [url, w] = c.trim().split(/\s+/);
+    return { url, w: parseInt(w, 10) };
+  });
+  const fit = candidates.find((c) => c.w >= width);
+  return (fit ?? candidates[candidates.length - 1]).url;
+}
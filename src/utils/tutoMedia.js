@@ -0,0 +1,44 @@
+// src/utils/tutoMedia.js
+// Variantes livianas (WebP/AVIF/video) de los GIF de tutoriales.
+// El índice lo genera public/build_tutos.py en /tutos/media.json:
+//   { "/tutos/matriz/step1.gif": [{ src, type, kind: 'image'|'video' }, ...] }
+// Si no existe o falla, se usa el GIF original.
+
+import { useEffect, useState } from "react";
+
+const MEDIA_INDEX_URL = "/tutos/media.json";
+
+let _index = null;      // índice ya cargado
+let _pending = null;    // promesa de carga (una sola vez por página)
+
+function _loadIndex() {
+  if (_index) return Promise.resolve(_index);
+  if (!_pending) {
+    _pending = fetch(MEDIA_INDEX_URL)
+      .then((res) => (res.ok ? res.json() : {}))
+      .catch(() => ({}))
+      .then((json) => (_index = json || {}));
+  }
+  return _pending;
+}
+
+// Devuelve las variantes de `src` (en orden de preferencia) o [] mientras carga.
+export function useTutoSources(src) {
+  const [sources, setSources] = useState(() => (_index && src ? _index[src] ?? [] : []));
+
+  useEffect(() => {
+    if (!src) {
+      setSources([]);
+      return;
+    }
+    let alive = true;
+    _loadIndex().then((index) => {
+      if (alive) setSources(index[src] ?? []);
+    });
+    return () => {
+      alive = false;
+    };
+  }, [src]);
+
+  return sources;
+}